@@ -10,6 +10,13 @@ This module handles character creation, loading, and saving.
 """
 
 import os
+import threading
+import time
+import zlib
+from collections import deque
+from itertools import islice
+import metrics
+import symbols
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
@@ -18,6 +25,319 @@ from custom_exceptions import (
     CharacterDeadError
 )
 
+# ============================================================================
+# CHARACTER CLASS
+# ============================================================================
+
+# Save/dict key -> attribute name ('class' is a keyword)
+CHARACTER_FIELDS = {
+    'name': 'name',
+    'class': 'character_class',
+    'level': 'level',
+    'health': 'health',
+    'max_health': 'max_health',
+    'strength': 'strength',
+    'magic': 'magic',
+    'experience': 'experience',
+    'gold': 'gold',
+    'inventory': 'inventory',
+    'active_quests': 'active_quests',
+    'completed_quests': 'completed_quests',
+}
+
+NUMERIC_CHARACTER_FIELDS = ('level', 'health', 'max_health', 'strength',
+                            'magic', 'experience', 'gold')
+LIST_CHARACTER_FIELDS = ('inventory', 'active_quests', 'completed_quests')
+
+# Keys that only "exist" once something sets them
+# (equipment is {slot: item_id}, see game_data.EQUIPMENT_SLOTS)
+OPTIONAL_CHARACTER_FIELDS = {
+    'equipment': 'equipment',
+}
+
+# Older single-slot keys, still readable: key -> equipment slot
+EQUIPMENT_ALIASES = {
+    'equipped_weapon': 'main_hand',
+    'equipped_armor': 'body',
+}
+
+# Stats that equipment and timed effects add bonuses to
+MODIFIABLE_STATS = ('max_health', 'strength', 'magic')
+
+
+class ModifierStack:
+    """
+    Stat bonuses a character gets from equipment and effects, by source
+    
+    Each source ('weapon', 'armor', 'effects', ...) holds {stat: bonus}.
+    The per-stat totals in bonus are kept up to date as sources change,
+    so reading an effective stat is one dictionary lookup.
+    """
+
+    __slots__ = ('sources', 'bonus')
+
+    def __init__(self):
+        self.sources = {}
+        self.bonus = dict.fromkeys(MODIFIABLE_STATS, 0)
+
+    def get(self, source):
+        """Returns: {stat: bonus} for one source (empty if none)"""
+        return dict(self.sources.get(source, {}))
+
+    def set(self, source, effects):
+        """
+        Replace a source's bonuses
+        
+        Args:
+            source: Source name
+            effects: Iterable of (stat, value, ...) such as effects.Effect
+        
+        Returns: {stat: change in total bonus}
+        Raises: ValueError for a stat that can't be modified
+        """
+        new = {}
+        for effect in effects:
+            stat, value = effect[0], effect[1]
+            if stat not in self.bonus:
+                raise ValueError(f"stat cannot be modified: {stat}")
+            new[stat] = new.get(stat, 0) + value
+
+        changes = {}
+        for stat, value in self.sources.pop(source, {}).items():
+            changes[stat] = changes.get(stat, 0) - value
+        for stat, value in new.items():
+            changes[stat] = changes.get(stat, 0) + value
+        if new:
+            self.sources[source] = new
+
+        for stat, change in changes.items():
+            self.bonus[stat] += change
+        return changes
+
+    def adjust(self, source, stat, delta):
+        """
+        Add delta to one stat of a source
+        
+        Returns: {stat: delta}
+        Raises: ValueError for a stat that can't be modified
+        """
+        if stat not in self.bonus:
+            raise ValueError(f"stat cannot be modified: {stat}")
+        values = self.sources.setdefault(source, {})
+        values[stat] = values.get(stat, 0) + delta
+        if not values[stat]:
+            del values[stat]
+            if not values:
+                del self.sources[source]
+        self.bonus[stat] += delta
+        return {stat: delta}
+
+
+class Character:
+    """
+    A player character
+    
+    Stats live in __slots__ instead of a per-character dict, which keeps
+    memory and attribute access cheap when many characters are resident.
+    Dictionary style access (character['health']) still works so the rest
+    of the game and the save format are unchanged. Keys that aren't known
+    fields are kept in a small overflow dict.
+    
+    The slots hold base stats. character['strength'] is the effective
+    value: base plus the cached bonus from modifiers (a ModifierStack,
+    once equipment or an effect adds one). Assigning an effective value
+    stores value - bonus as the base, so `character['strength'] += 2`
+    raises the base. base() reads the base value; saves store base values.
+    
+    journal is the character's SaveJournal while journaling is enabled.
+    effects is its effects.ActiveEffects once a timed effect is applied.
+    
+    Item and quest IDs in the list fields are interned (see symbols), so
+    characters loaded from many saves share one string per distinct ID.
+    """
+
+    __slots__ = (tuple(CHARACTER_FIELDS.values()) + tuple(OPTIONAL_CHARACTER_FIELDS.values())
+                 + ('_extra', 'journal', 'effects', 'modifiers'))
+
+    def __init__(self, name, character_class, level=1, health=0, max_health=0,
+                 strength=0, magic=0, experience=0, gold=0,
+                 inventory=None, active_quests=None, completed_quests=None):
+        """Initialize character with its typed fields"""
+        self.name = str(name)
+        self.character_class = str(character_class)
+        self.level = int(level)
+        self.health = int(health)
+        self.max_health = int(max_health)
+        self.strength = int(strength)
+        self.magic = int(magic)
+        self.experience = int(experience)
+        self.gold = int(gold)
+        self.inventory = symbols.intern_all(inventory) if inventory else []
+        self.active_quests = symbols.intern_all(active_quests) if active_quests else []
+        self.completed_quests = symbols.intern_all(completed_quests) if completed_quests else []
+        self.equipment = None
+        self._extra = None
+        self.journal = None
+        self.effects = None
+        self.modifiers = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a Character from a character dictionary
+        
+        Returns: Character
+        Raises: KeyError if a required field is missing
+        """
+        character = cls(data['name'], data['class'],
+                        **{field: data[field] for field in NUMERIC_CHARACTER_FIELDS + LIST_CHARACTER_FIELDS})
+        for key, value in data.items():
+            if key not in CHARACTER_FIELDS:
+                character[key] = value
+        return character
+
+    def to_dict(self):
+        """Return a plain dictionary copy of this character"""
+        return dict(self.items())
+
+    def base(self, key):
+        """Returns: Value of key without modifier bonuses (None if unset)"""
+        attr = CHARACTER_FIELDS.get(key)
+        if attr is not None:
+            return getattr(self, attr)
+        return self.get(key)
+
+    # ------------------------------------------------------------------
+    # Mapping-style access
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key):
+        attr = CHARACTER_FIELDS.get(key)
+        if attr is not None:
+            if self.modifiers is not None:
+                bonus = self.modifiers.bonus.get(key)
+                if bonus:
+                    return getattr(self, attr) + bonus
+            return getattr(self, attr)
+
+        attr = OPTIONAL_CHARACTER_FIELDS.get(key)
+        if attr is not None:
+            value = getattr(self, attr)
+            if value is not None:
+                return value
+        elif key in EQUIPMENT_ALIASES:
+            if self.equipment and EQUIPMENT_ALIASES[key] in self.equipment:
+                return self.equipment[EQUIPMENT_ALIASES[key]]
+        elif self._extra and key in self._extra:
+            return self._extra[key]
+
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        attr = CHARACTER_FIELDS.get(key) or OPTIONAL_CHARACTER_FIELDS.get(key)
+        if attr is not None:
+            if self.modifiers is not None:
+                bonus = self.modifiers.bonus.get(key)
+                if bonus:
+                    value -= bonus
+            setattr(self, attr, value)
+            return
+
+        slot = EQUIPMENT_ALIASES.get(key)
+        if slot is not None:
+            if value is None:
+                self.pop(key, None)
+            else:
+                if self.equipment is None:
+                    self.equipment = {}
+                self.equipment[slot] = value
+            return
+
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key):
+        self.pop(key)
+
+    def __contains__(self, key):
+        if key in CHARACTER_FIELDS:
+            return True
+        attr = OPTIONAL_CHARACTER_FIELDS.get(key)
+        if attr is not None:
+            return getattr(self, attr) is not None
+        if key in EQUIPMENT_ALIASES:
+            return bool(self.equipment) and EQUIPMENT_ALIASES[key] in self.equipment
+        return bool(self._extra) and key in self._extra
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key, *default):
+        """
+        Remove an optional or extra key and return its value
+        
+        Raises: KeyError if key is a required field, or is missing and no
+                default was given
+        """
+        if key in CHARACTER_FIELDS:
+            raise KeyError(f'cannot remove required field: {key}')
+
+        attr = OPTIONAL_CHARACTER_FIELDS.get(key)
+        if attr is not None:
+            value = getattr(self, attr)
+            if value is not None:
+                setattr(self, attr, None)
+                return value
+        elif key in EQUIPMENT_ALIASES:
+            if self.equipment and EQUIPMENT_ALIASES[key] in self.equipment:
+                return self.equipment.pop(EQUIPMENT_ALIASES[key])
+        elif self._extra and key in self._extra:
+            return self._extra.pop(key)
+
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def keys(self):
+        return [key for key, _ in self.items()]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def items(self):
+        if self.modifiers is not None:
+            pairs = [(key, self[key]) for key in CHARACTER_FIELDS]
+        else:
+            pairs = [(key, getattr(self, attr)) for key, attr in CHARACTER_FIELDS.items()]
+        for key, attr in OPTIONAL_CHARACTER_FIELDS.items():
+            value = getattr(self, attr)
+            if value is not None:
+                pairs.append((key, value))
+        if self._extra:
+            pairs.extend(self._extra.items())
+        return pairs
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, (Character, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Character({self.name!r}, {self.character_class!r}, level={self.level})"
+
+
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
 # ============================================================================
@@ -28,7 +348,7 @@ def create_character(name, character_class):
     
     Valid classes: Warrior, Mage, Rogue, Cleric
     
-    Returns: Dictionary with character data including:
+    Returns: Character with data including:
             - name, class, level, health, max_health, strength, magic
             - experience, gold, inventory, active_quests, completed_quests
     
@@ -48,20 +368,17 @@ def create_character(name, character_class):
     
     base = valid_classes[character_class]
 
-    character = {
-        'name': name,
-        'class': character_class,
-        'level': 1,
-        'health': base['health'],
-        'max_health': base['health'], 
-        'strength': base['strength'],
-        'magic': base['magic'],
-        'experience': 0,
-        'gold': 100,
-        'inventory': [],
-        'active_quests': [],
-        'completed_quests': []
-    }
+    character = Character(
+        name,
+        character_class,
+        level=1,
+        health=base['health'],
+        max_health=base['health'],
+        strength=base['strength'],
+        magic=base['magic'],
+        experience=0,
+        gold=100,
+    )
 
     return character
 
@@ -85,10 +402,21 @@ def save_character(character, save_directory="data/save_games"):
     INVENTORY: item1,item2,item3
     ACTIVE_QUESTS: quest1,quest2
     COMPLETED_QUESTS: quest1,quest2
+    EQUIPMENT: main_hand=iron_sword,body=leather_armor   (only if equipped)
+    CHECKSUM: crc32 of the lines above, in hex
     
     Returns: True if successful
     Raises: PermissionError, IOError (let them propagate or handle)
     """
+    start = time.perf_counter()
+
+    # A journaled character is saved by compacting its journal
+    journal = getattr(character, 'journal', None)
+    if journal is not None and journal.save_directory == save_directory:
+        journal.compact(character, wait=True)
+        metrics.SAVE_SECONDS.observe(time.perf_counter() - start)
+        return True
+
     # Create directory if it doesn't exist already
     if not os.path.exists(save_directory):
         os.makedirs(save_directory)
@@ -97,22 +425,15 @@ def save_character(character, save_directory="data/save_games"):
 
     try:
         with open(filename, 'w') as file:
-             file.write(f"NAME: {character['name']}\n")
-            file.write(f"CLASS: {character['class']}\n")
-            file.write(f"LEVEL: {character['level']}\n")
-            file.write(f"HEALTH: {character['health']}\n")
-            file.write(f"MAX_HEALTH: {character['max_health']}\n")
-            file.write(f"STRENGTH: {character['strength']}\n")
-            file.write(f"MAGIC: {character['magic']}\n")
-            file.write(f"EXPERIENCE: {character['experience']}\n")
-            file.write(f"GOLD: {character['gold']}\n")
-            file.write(f"INVENTORY: {','.join(character['inventory']) if character['inventory'] else ''}\n")
-            file.write(f"ACTIVE_QUESTS: {','.join(character['active_quests']) if character['active_quests'] else ''}\n")
-            file.write(f"COMPLETED_QUESTS: {','.join(character['completed_quests']) if character['completed_quests'] else ''}\n")
+            file.write(format_save_data(character))
 
     except Exception as e:
         raise e  
 
+    # Old journal records would otherwise be replayed over this save
+    remove_journal_files(character['name'], save_directory)
+
+    metrics.SAVE_SECONDS.observe(time.perf_counter() - start)
     return True
 
  
@@ -124,12 +445,13 @@ def load_character(character_name, save_directory="data/save_games"):
         character_name: Name of character to load
         save_directory: Directory containing save files
     
-    Returns: Character dictionary
+    Returns: Character
     Raises: 
         CharacterNotFoundError if save file doesn't exist
         SaveFileCorruptedError if file exists but can't be read
         InvalidSaveDataError if data format is wrong
     """
+    start = time.perf_counter()
     filename = os.path.join(save_directory, f'{character_name}_save.txt')
 
     if not os.path.exists(filename):
@@ -139,42 +461,141 @@ def load_character(character_name, save_directory="data/save_games"):
     try:
         with open(filename, 'r') as file:
             lines = file.readlines()
+        journal_lines = read_journal_lines(character_name, save_directory)
     except:
         raise SaveFileCorruptedError('Could not read save file')
 
-    character = {}
+    character = parse_save_data(verify_save_lines(lines, journal_lines))
+    metrics.CHARACTER_LOAD_SECONDS.observe(time.perf_counter() - start)
+    return character
 
-    try:
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue  # Skip empty lines
 
-             if ":" not in line:
-                raise InvalidSaveDataError("Missing ':' in save data")
-            
-            if ": " in line:
-                key, value = line.split(": ", 1)
-            else:
-                key, value = line.split(":", 1)
-                value = value.lstrip()
+def thread_pool(max_workers):
+    """
+    Create a ThreadPoolExecutor for batch operations
+    
+    concurrent.futures is imported here rather than at module level because
+    it costs more to import than the rest of this module and only the batch
+    functions need it.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=max_workers)
 
-            # Handling list fields
-            if key in ['INVENTORY', 'ACTIVE_QUESTS', 'COMPLETED_QUESTS']:
-                character[key.lower()] = value.split(',') if value else []
-             # Convert from str to int
-            elif key in ("LEVEL", "HEALTH", "MAX_HEALTH", "STRENGTH", "MAGIC", "EXPERIENCE", "GOLD"):
-                character[key.lower()] = int(value)
-            else:
-                character[key.lower()] = value
 
-        
+def load_characters(names=None, save_directory="data/save_games", errors=None, max_workers=8):
+    """
+    Load many characters at once (leaderboards, audits, migrations)
+    
+    Save files are read on a thread pool while parsing happens here, one
+    character at a time, so only a handful of saves are in memory at once.
+    
+    Args:
+        names: Iterable of character names, or None to load every save
+        save_directory: Directory containing save files
+        errors: Optional dictionary; failed loads are recorded as
+                {character_name: exception} instead of stopping the batch
+        max_workers: Number of reader threads
+    
+    Yields: Characters, in the same order as names
+    Raises: The first load error if errors is None
+    """
+    if names is None:
+        names = list_saved_characters(save_directory)
 
-        validate_character_data(character)
-        return character
+    def read(name):
+        filename = os.path.join(save_directory, f'{name}_save.txt')
+        try:
+            with open(filename, 'r') as file:
+                lines = file.readlines()
+            journal_lines = read_journal_lines(name, save_directory)
+        except FileNotFoundError:
+            raise CharacterNotFoundError(f'No save file found for {name}')
+        except Exception:
+            raise SaveFileCorruptedError('Could not read save file')
+        return verify_save_lines(lines, journal_lines)
 
-    except Exception as e:
-        raise InvalidSaveDataError(f'Invalid save file data: {e}')
+    with thread_pool(max_workers) as pool:
+        # Only keep a small window of reads in flight so memory stays flat
+        pending = deque()
+        names = iter(names)
+
+        for name in islice(names, max_workers * 2):
+            pending.append((name, pool.submit(read, name)))
+
+        while pending:
+            name, future = pending.popleft()
+            next_name = next(names, None)
+            if next_name is not None:
+                pending.append((next_name, pool.submit(read, next_name)))
+
+            try:
+                character = parse_save_data(future.result())
+            except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError) as e:
+                if errors is None:
+                    raise
+                errors[name] = e
+                continue
+
+            yield character
+
+
+def save_characters(characters, save_directory="data/save_games", errors=None, max_workers=8):
+    """
+    Save many characters at once
+    
+    Args:
+        characters: Iterable of character dictionaries
+        save_directory: Directory to write save files to
+        errors: Optional dictionary; failed saves are recorded as
+                {character_name: exception} instead of stopping the batch
+        max_workers: Number of writer threads
+    
+    Returns: Number of characters saved
+    Raises: The first save error if errors is None
+    """
+    if not os.path.exists(save_directory):
+        os.makedirs(save_directory)
+
+    def write(name, text):
+        filename = os.path.join(save_directory, f"{name}_save.txt")
+        with open(filename, 'w') as file:
+            file.write(text)
+        remove_journal_files(name, save_directory)
+
+    saved = 0
+
+    with thread_pool(max_workers) as pool:
+        pending = deque()
+
+        def collect(name, future):
+            try:
+                future.result()
+            except OSError as e:
+                if errors is None:
+                    raise
+                errors[name] = e
+                return 0
+            return 1
+
+        for character in characters:
+            name = character['name']
+
+            journal = getattr(character, 'journal', None)
+            if journal is not None and journal.save_directory == save_directory:
+                journal.compact(character, wait=True)
+                saved += 1
+                continue
+
+            pending.append((name, pool.submit(write, name, format_save_data(character))))
+
+            # Don't let formatted saves pile up faster than they're written
+            if len(pending) >= max_workers * 2:
+                saved += collect(*pending.popleft())
+
+        while pending:
+            saved += collect(*pending.popleft())
+
+    return saved
 
 
 def list_saved_characters(save_directory="data/save_games"):
@@ -190,7 +611,7 @@ def list_saved_characters(save_directory="data/save_games"):
 
     for filename in os.listdir(save_directory):
         if filename.endswith('_save.txt'): 
-            characters.append(filename.replace('_save.txt', ''))
+            names.append(filename.replace('_save.txt', ''))
 
     return names
 
@@ -209,6 +630,7 @@ def delete_character(character_name, save_directory="data/save_games"):
         raise CharacterNotFoundError(f'Save file for {character_name} not found')
 
     os.remove(filename)
+    remove_journal_files(character_name, save_directory)
     return True
 
 # ============================================================================
@@ -248,6 +670,11 @@ def gain_experience(character, xp_amount):
         character['health'] = character['max_health']
         leveled_up = True
 
+    if leveled_up:
+        record_changes(character, 'level', 'health', 'max_health', 'strength', 'magic', 'experience')
+    else:
+        record_changes(character, 'experience')
+
     return leveled_up
 
 
@@ -268,7 +695,8 @@ def add_gold(character, amount):
         raise ValueError('Not enough gold')
 
     character['gold'] = new_total
-    return character['gold]
+    record_changes(character, 'gold')
+    return character['gold']
 
 
 def heal_character(character, amount):
@@ -285,6 +713,7 @@ def heal_character(character, amount):
     
     before = character['health']
     character['health'] = min(character['health'] + amount, character['max_health'])
+    record_changes(character, 'health')
     return character['health'] - before
 
 
@@ -307,6 +736,7 @@ def revive_character(character):
         return False
         
     character['health'] = character['max_health'] // 2
+    record_changes(character, 'health')
     return True
 
 # ============================================================================
@@ -315,7 +745,7 @@ def revive_character(character):
 
 def validate_character_data(character):
     """
-    Validate that character dictionary has all required fields
+    Validate that a character (or character dictionary) has all required fields
     
     Required fields: name, class, level, health, max_health, 
                     strength, magic, experience, gold, inventory,
@@ -324,31 +754,531 @@ def validate_character_data(character):
     Returns: True if valid
     Raises: InvalidSaveDataError if missing fields or invalid types
     """
-    required = [
-        'name', 'class', 'level', 'health', 
-        'max_health', 'strength', 'magic', 'experience', 
-        'gold', 'inventory', 'active_quests', 'completed_quests'
-    ]
-
-    # Check required keys
-    for key in required:
-        if key not in character:
-            raise InvalidSaveDataError(f'Missing key: {key}')
+    # Characters always carry every field, only dicts need the key check
+    if not isinstance(character, Character):
+        for key in CHARACTER_FIELDS:
+            if key not in character:
+                raise InvalidSaveDataError(f'Missing key: {key}')
 
     # Check numeric fields
-    numeric_fields = ['level', 'health', 'max_health', 'strength', 
-                      'magic', 'experience', 'gold']
-    for field in numeric_fields:
+    for field in NUMERIC_CHARACTER_FIELDS:
         if not isinstance(character[field], int):
             raise InvalidSaveDataError(f'Invalid type for {field}: expected int')
 
     # Check list fields
-    list_fields = ['inventory', 'active_quests', 'completed_quests']
-    for field in list_fields:
+    for field in LIST_CHARACTER_FIELDS:
         if not isinstance(character[field], list):
             raise InvalidSaveDataError(f'{field} must be a list')
 
+    if not isinstance(character.get('equipment') or {}, dict):
+        raise InvalidSaveDataError('equipment must be a dictionary')
+
+    return True
+# ============================================================================
+# SAVE FILE FORMAT
+# ============================================================================
+
+def format_save_line(key, value):
+    """
+    Format one save file line, e.g. ("gold", 100) -> "GOLD: 100\n"
+    
+    List fields are written comma separated, equipment as slot=item_id
+    pairs, and None as an empty value
+    """
+    if isinstance(value, list):
+        value = ','.join(value)
+    elif isinstance(value, dict):
+        value = ','.join(f"{slot}={item_id}" for slot, item_id in value.items())
+    elif value is None:
+        value = ''
+    return f"{key.upper()}: {value}\n"
+
+
+def base_value(character, key):
+    """Returns: The value of key to save (without modifier bonuses)"""
+    if isinstance(character, Character):
+        return character.base(key)
+    # Plain dictionaries have the bonuses added into their stats
+    value = character[key]
+    modifiers = character.get('_modifiers')
+    if modifiers is not None and key in modifiers.bonus:
+        value -= modifiers.bonus[key]
+    return value
+
+
+def format_save_data(character):
+    """
+    Build the save file text for a character, ending in its checksum line
+    
+    Returns: String in the format described in save_character
+    """
+    body = ''.join([format_save_line(key, base_value(character, key)) for key in CHARACTER_FIELDS])
+    if character.get('equipment'):
+        body += format_save_line('equipment', character['equipment'])
+    return body + f"CHECKSUM: {save_checksum(body.encode('utf-8'))}\n"
+
+
+def save_checksum(data):
+    """
+    Checksum for the body of a save file
+    
+    Args:
+        data: Bytes of every line before the CHECKSUM line
+    
+    Returns: 8 character hex string
+    """
+    return f"{zlib.crc32(data) & 0xffffffff:08x}"
+
+
+def checksum_position(lines):
+    """Returns: Index of a save's CHECKSUM line, or None for a legacy save without one"""
+    end = len(lines)
+    while end and not lines[end - 1].strip():
+        end -= 1
+    if end and lines[end - 1].startswith('CHECKSUM:'):
+        return end - 1
+    return None
+
+
+def verify_save_checksum(lines):
+    """
+    Check and strip the CHECKSUM line of a save file
+    
+    Saves written before checksums existed (legacy saves) have no
+    CHECKSUM line and are passed through unchanged.
+    
+    Returns: The save lines without the CHECKSUM line
+    Raises: SaveFileCorruptedError if the checksum doesn't match
+    """
+    position = checksum_position(lines)
+    if position is None:
+        return lines
+
+    expected = lines[position].split(':', 1)[1].strip()
+    body = lines[:position]
+    if save_checksum(''.join(body).encode('utf-8')) != expected:
+        raise SaveFileCorruptedError('Save file checksum does not match its contents')
+
+    return body
+
+
+def verify_journal_lines(lines):
+    """
+    Check and strip the CRC line that ends every journal record
+    
+    Returns: The field lines of every record
+    Raises: SaveFileCorruptedError if a record's CRC doesn't match, or
+            lines follow the last CRC line
+    """
+    verified = []
+    record = []
+    for line in lines:
+        if line.startswith('CRC:'):
+            if save_checksum(''.join(record).encode('utf-8')) != line.split(':', 1)[1].strip():
+                raise SaveFileCorruptedError('Journal record checksum does not match its contents')
+            verified += record
+            record = []
+        else:
+            record.append(line)
+    if record:
+        raise SaveFileCorruptedError('Journal record has no checksum')
+    return verified
+
+
+def verify_save_lines(lines, journal_lines):
+    """
+    Check a save file and its journal and join them for parsing
+    
+    Journaled saves are always written with a checksum, so a save without
+    one that has journal records was cut short.
+    
+    Returns: Save lines followed by the journaled field lines
+    Raises: SaveFileCorruptedError if either fails its checks
+    """
+    if journal_lines and checksum_position(lines) is None:
+        raise SaveFileCorruptedError('Save file has journal records but no checksum (truncated?)')
+    return verify_save_checksum(lines) + verify_journal_lines(journal_lines)
+
+
+def parse_save_data(lines):
+    """
+    Parse and validate the lines of a save file in one pass
+    
+    Args:
+        lines: List of strings read from a save file
+    
+    Returns: Character
+    Raises: InvalidSaveDataError if data format is wrong
+    """
+    character = {}
+
+    try:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue  # Skip empty lines
+
+            if ":" not in line:
+                raise InvalidSaveDataError("Missing ':' in save data")
+            
+            if ": " in line:
+                key, value = line.split(": ", 1)
+            else:
+                key, value = line.split(":", 1)
+                value = value.lstrip()
+
+            # Handling list fields
+            if key in ['INVENTORY', 'ACTIVE_QUESTS', 'COMPLETED_QUESTS']:
+                character[key.lower()] = value.split(',') if value else []
+            # slot=item_id pairs
+            elif key == 'EQUIPMENT':
+                character['equipment'] = {slot: symbols.intern(item_id) for slot, item_id in
+                                          (pair.split('=', 1) for pair in value.split(',') if pair)}
+            # Convert from str to int
+            elif key in ("LEVEL", "HEALTH", "MAX_HEALTH", "STRENGTH", "MAGIC", "EXPERIENCE", "GOLD"):
+                character[key.lower()] = int(value)
+            else:
+                character[key.lower()] = value
+
+        validate_character_data(character)
+        return Character.from_dict(character)
+
+    except Exception as e:
+        raise InvalidSaveDataError(f'Invalid save file data: {e}')
+
+# ============================================================================
+# SAVE INTEGRITY
+# ============================================================================
+
+def check_save_file(filename):
+    """
+    Check a single save file's checksum without parsing it
+    
+    Returns: 'ok', 'legacy' (no CHECKSUM line), or 'corrupted'
+    Raises: OSError if the file can't be read
+    """
+    with open(filename, 'rb') as file:
+        data = file.read()
+
+    data = data.replace(b'\r\n', b'\n').rstrip(b'\n')
+    split = data.rfind(b'\n') + 1
+    last_line = data[split:]
+
+    if not last_line.startswith(b'CHECKSUM:'):
+        return 'legacy'
+
+    expected = last_line[len(b'CHECKSUM:'):].strip().decode('ascii', 'replace')
+    if save_checksum(data[:split]) != expected:
+        return 'corrupted'
+    return 'ok'
+
+
+def check_character_files(character_name, save_directory="data/save_games"):
+    """
+    Check a character's save file and journal without parsing them
+    
+    Returns: (status, reason): status is 'ok', 'legacy' (a save without a
+             checksum and no journal) or 'corrupted', reason says why
+             for 'corrupted' (None otherwise)
+    """
+    try:
+        status = check_save_file(os.path.join(save_directory, f'{character_name}_save.txt'))
+        journal_lines = read_journal_lines(character_name, save_directory)
+    except OSError as e:
+        return 'corrupted', f'unreadable: {e}'
+
+    if status == 'corrupted':
+        return status, 'checksum mismatch'
+    if journal_lines and status == 'legacy':
+        return 'corrupted', 'journal records but no save checksum (truncated?)'
+    try:
+        verify_journal_lines(journal_lines)
+    except SaveFileCorruptedError as e:
+        return 'corrupted', str(e)
+    return status, None
+
+
+def scan_saves(save_directory="data/save_games", max_workers=16):
+    """
+    Check every save file and journal in a directory, in parallel
+    
+    Only checksums are compared; valid saves are never parsed.
+    
+    Returns: Dictionary with:
+            - 'ok': names whose save and journal checksums match
+            - 'legacy': names of older saves without a checksum
+            - 'corrupted': {name: reason} for mismatched or unreadable saves
+    """
+    report = {'ok': [], 'legacy': [], 'corrupted': {}}
+    names = list_saved_characters(save_directory)
+
+    def check(name):
+        return check_character_files(name, save_directory)
+
+    with thread_pool(max_workers) as pool:
+        for name, (status, reason) in zip(names, pool.map(check, names)):
+            if status == 'corrupted':
+                report['corrupted'][name] = reason
+            else:
+                report[status].append(name)
+
+    return report
+
+# ============================================================================
+# SAVE JOURNAL
+# ============================================================================
+
+# Number of journal records before the journal is folded into the save file
+JOURNAL_COMPACT_EVERY = 100
+
+
+def journal_filenames(character_name, save_directory="data/save_games"):
+    """
+    Get the journal file paths for a character
+    
+    Returns: Tuple of (active_journal, journal_being_compacted)
+    """
+    journal = os.path.join(save_directory, f'{character_name}_journal.txt')
+    return journal, journal + '.compacting'
+
+
+def read_journal_lines(character_name, save_directory="data/save_games"):
+    """
+    Read any journal records for a character, oldest first
+    
+    Journal records use the save file line format and only hold fields that
+    changed, each record followed by a "CRC: <checksum>" line (see
+    verify_journal_lines). Lines after a file's last CRC line are a record
+    whose write never finished and are left out.
+    
+    Returns: List of lines (empty if the character isn't journaled)
+    """
+    lines = []
+    for filename in reversed(journal_filenames(character_name, save_directory)):
+        try:
+            with open(filename, 'r') as file:
+                file_lines = file.readlines()
+        except FileNotFoundError:
+            continue
+        end = len(file_lines)
+        while end and not file_lines[end - 1].startswith('CRC:'):
+            end -= 1
+        lines += file_lines[:end]
+    return lines
+
+
+def count_journal_records(character_name, save_directory="data/save_games"):
+    """Returns: Number of complete journal records for a character"""
+    return sum(line.startswith('CRC:') for line in read_journal_lines(character_name, save_directory))
+
+
+def remove_journal_files(character_name, save_directory="data/save_games"):
+    """Delete a character's journal files, if any"""
+    for filename in journal_filenames(character_name, save_directory):
+        try:
+            os.remove(filename)
+        except FileNotFoundError:
+            pass
+
+
+class SaveJournal:
+    """
+    Append-only log of character changes
+    
+    Each mutation appends the new value of just the fields it changed,
+    then a CRC line over them. After compact_every records the journal is rotated and a full save is
+    written on a background thread. Records are "field = value", so
+    replaying a journal that was already folded into the save is harmless.
+    """
+
+    def __init__(self, character_name, save_directory="data/save_games", compact_every=JOURNAL_COMPACT_EVERY):
+        """Open (or continue) the journal for a character"""
+        self.character_name = character_name
+        self.save_directory = save_directory
+        self.compact_every = compact_every
+        self.filename, self.compacting_filename = journal_filenames(character_name, save_directory)
+        self.records = 0
+
+        self._lock = threading.Lock()
+        self._compactor = None
+
+        # A crash can leave records mid-compaction (they must stay ahead of
+        # ours) or half a record at the end; rewrite just the complete ones
+        lines = read_journal_lines(character_name, save_directory)
+        if lines or os.path.exists(self.filename):
+            with open(self.filename, 'w') as file:
+                file.writelines(lines)
+        if os.path.exists(self.compacting_filename):
+            os.remove(self.compacting_filename)
+
+        self._file = open(self.filename, 'a')
+
+    def record(self, character, fields):
+        """Append the current values of fields to the journal"""
+        with self._lock:
+            # Read the values under the lock so a record can't be older than a snapshot
+            text = ''.join([format_save_line(field, base_value(character, field)) for field in fields])
+            self._file.write(f"{text}CRC: {save_checksum(text.encode('utf-8'))}\n")
+            self._file.flush()
+            self.records += 1
+            due = self.records >= self.compact_every
+
+        if due:
+            self.compact(character)
+
+    def compact(self, character, wait=False):
+        """
+        Fold the journal into a full save file
+        
+        The active journal is renamed aside and a fresh one opened, so new
+        records can keep arriving while the snapshot is written.
+        
+        Args:
+            character: Character being journaled
+            wait: If True, write the snapshot before returning
+        """
+        with self._lock:
+            # Only one compaction at a time owns the .compacting file
+            if self._compactor is not None:
+                self._compactor.join()
+                self._compactor = None
+
+            # Snapshot and rotate together: every record is either in the
+            # snapshot or in the fresh journal
+            snapshot = format_save_data(character)
+
+            self._file.close()
+            os.replace(self.filename, self.compacting_filename)
+            self._file = open(self.filename, 'a')
+            self.records = 0
+
+            if wait:
+                self._write_snapshot(snapshot)
+            else:
+                self._compactor = threading.Thread(target=self._write_snapshot, args=(snapshot,), daemon=True)
+                self._compactor.start()
+
+    def _write_snapshot(self, snapshot):
+        """Atomically replace the save file, then drop the folded journal"""
+        filename = os.path.join(self.save_directory, f'{self.character_name}_save.txt')
+        temp = filename + '.tmp'
+        with open(temp, 'w') as file:
+            file.write(snapshot)
+        os.replace(temp, filename)
+        os.remove(self.compacting_filename)
+
+    def close(self):
+        """Wait for any background compaction and close the journal file"""
+        with self._lock:
+            if self._compactor is not None:
+                self._compactor.join()
+                self._compactor = None
+            self._file.close()
+
+
+def enable_journal(character, save_directory="data/save_games", compact_every=JOURNAL_COMPACT_EVERY):
+    """
+    Start journaling a character's changes instead of rewriting its save
+    
+    Writes a full save first if the character has never been saved.
+    
+    Returns: The character's SaveJournal
+    """
+    if getattr(character, 'journal', None) is not None:
+        return character.journal
+
+    filename = os.path.join(save_directory, f"{character['name']}_save.txt")
+    if not os.path.exists(filename):
+        save_character(character, save_directory)
+
+    character.journal = SaveJournal(character['name'], save_directory, compact_every)
+    return character.journal
+
+
+def disable_journal(character):
+    """
+    Fold the journal into the save file and stop journaling
+    
+    Returns: True if the character was being journaled
+    """
+    journal = getattr(character, 'journal', None)
+    if journal is None:
+        return False
+
+    journal.compact(character, wait=True)
+    journal.close()
+    character.journal = None
     return True
+
+
+def record_changes(character, *fields):
+    """
+    Journal the current value of fields if the character is journaled
+    
+    Called by every function that mutates saved character fields. Costs
+    a single attribute lookup when journaling is off.
+    """
+    journal = getattr(character, 'journal', None)
+    if journal is not None:
+        journal.record(character, fields)
+
+# ============================================================================
+# STAT MODIFIERS
+# ============================================================================
+
+def get_modifiers(character):
+    """
+    Get (creating if needed) a character's ModifierStack
+    
+    Plain character dictionaries keep theirs under '_modifiers'.
+    """
+    if isinstance(character, Character):
+        if character.modifiers is None:
+            character.modifiers = ModifierStack()
+        return character.modifiers
+
+    if '_modifiers' not in character:
+        character['_modifiers'] = ModifierStack()
+    return character['_modifiers']
+
+
+def _modifiers_changed(character, changes):
+    """Apply bonus changes to a plain dictionary, then keep health <= max"""
+    if not isinstance(character, Character):
+        # No effective view on a dictionary: change the stats themselves
+        for stat, change in changes.items():
+            character[stat] = character.get(stat, 0) + change
+
+    if 'max_health' in changes and character.get('health', 0) > character.get('max_health', 0):
+        character['health'] = character['max_health']
+        record_changes(character, 'health')
+
+
+def set_modifier(character, source, effects):
+    """
+    Replace the stat bonuses from one source (an equipment slot, say)
+    
+    Only the cached totals are updated; base stats are untouched.
+    
+    Args:
+        character: Character
+        source: Source name, e.g. 'weapon'
+        effects: Iterable of effects.Effect (durations are ignored)
+    
+    Raises: ValueError for a stat that can't be modified
+    """
+    _modifiers_changed(character, get_modifiers(character).set(source, effects))
+
+
+def remove_modifier(character, source):
+    """Remove every bonus from one source"""
+    set_modifier(character, source, ())
+
+
+def adjust_modifier(character, source, stat, delta):
+    """Add delta to one stat bonus from a source (timed effects use this)"""
+    _modifiers_changed(character, get_modifiers(character).adjust(source, stat, delta))
+
 # ============================================================================
 # TESTING
 # ============================================================================
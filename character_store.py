@@ -0,0 +1,302 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Store Module
+
+Column-oriented view of every saved character for balance and economy
+dashboards. Each numeric stat is kept in its own typed array instead of
+one dictionary per character, so population-wide questions (level spread,
+gold percentiles, class balance) don't need every character in memory.
+"""
+
+import json
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+import character_manager
+from character_manager import NUMERIC_CHARACTER_FIELDS
+from custom_exceptions import CorruptedDataError, MissingDataFileError
+
+# File layout: MAGIC, header length, JSON header, then one raw array per
+# column; every number is little-endian
+STORE_MAGIC = b'QCCS'
+STORE_VERSION = 2
+
+
+def write_array(file, values):
+    """Write an array to a file in little-endian byte order"""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    values.tofile(file)
+
+
+def read_array(file, typecode, count):
+    """
+    Read count little-endian values written by write_array
+
+    Returns: array of typecode
+    Raises: EOFError if the file ends first
+    """
+    values = array(typecode)
+    values.fromfile(file, count)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+# ============================================================================
+# CHARACTER STORE
+# ============================================================================
+
+class CharacterStore:
+    """
+    Columnar store of character stats
+
+    One array('q') per field in NUMERIC_CHARACTER_FIELDS, plus the names
+    and a class code column. Sorted copies of columns are cached for
+    percentile and histogram queries and dropped whenever rows are added.
+    """
+
+    def __init__(self):
+        """Initialize an empty store"""
+        self.names = []
+        self.classes = []
+        self.class_codes = array('B')
+        self.columns = {field: array('q') for field in NUMERIC_CHARACTER_FIELDS}
+        self._sorted = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def append(self, character):
+        """Add one character (Character or dictionary) as a row"""
+        char_class = character['class']
+        if char_class not in self.classes:
+            self.classes.append(char_class)
+
+        self.names.append(character['name'])
+        self.class_codes.append(self.classes.index(char_class))
+        for field, column in self.columns.items():
+            column.append(character[field])
+
+        self._sorted.clear()
+
+    @classmethod
+    def from_save_directory(cls, save_directory="data/save_games", errors=None):
+        """
+        Build a store from every save file in a directory
+
+        Args:
+            save_directory: Directory containing save files
+            errors: Optional dictionary collecting {name: exception} for
+                    saves that could not be loaded
+
+        Returns: CharacterStore
+        """
+        store = cls()
+        if errors is None:
+            errors = {}
+        for character in character_manager.load_characters(save_directory=save_directory, errors=errors):
+            store.append(character)
+        return store
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def column(self, field):
+        """
+        Get the array for a numeric field
+
+        Raises: ValueError if field is not a numeric character field
+        """
+        if field not in self.columns:
+            raise ValueError(f'unknown stat column: {field}')
+        return self.columns[field]
+
+    def sorted_column(self, field):
+        """Get a cached, sorted copy of a numeric column"""
+        if field not in self._sorted:
+            self._sorted[field] = array('q', sorted(self.column(field)))
+        return self._sorted[field]
+
+    def percentile(self, field, pct):
+        """
+        Get the pct-th percentile (0-100) of a field, linearly interpolated
+
+        Returns: Float, or None if the store is empty
+        """
+        return self.percentiles(field, [pct])[0]
+
+    def percentiles(self, field, pcts):
+        """
+        Get several percentiles of a field with a single sort
+
+        Returns: List of floats (None for each if the store is empty)
+        """
+        values = self.sorted_column(field)
+        if not values:
+            return [None] * len(pcts)
+
+        results = []
+        last = len(values) - 1
+        for pct in pcts:
+            if not 0 <= pct <= 100:
+                raise ValueError('percentile must be between 0 and 100')
+            position = last * pct / 100
+            low = int(position)
+            high = min(low + 1, last)
+            results.append(values[low] + (values[high] - values[low]) * (position - low))
+        return results
+
+    def histogram(self, field, bins=10):
+        """
+        Count values of a field in equal-width bins
+
+        Bin edges are found by binary search on the sorted column, so the
+        cost is O(bins * log n) after the first sort.
+
+        Returns: List of (low, high, count) tuples; the last bin includes high
+        """
+        if bins < 1:
+            raise ValueError('bins must be at least 1')
+
+        values = self.sorted_column(field)
+        if not values:
+            return []
+
+        low, high = values[0], values[-1]
+        width = (high - low) / bins or 1
+
+        result = []
+        start = 0
+        for i in range(bins):
+            edge_low = low + i * width
+            edge_high = low + (i + 1) * width
+            if i == bins - 1:
+                end = len(values)
+            else:
+                end = bisect_left(values, edge_high, start)
+            result.append((edge_low, edge_high, end - start))
+            start = end
+        return result
+
+    def count_between(self, field, low, high):
+        """Count rows with low <= field <= high"""
+        values = self.sorted_column(field)
+        return bisect_right(values, high) - bisect_left(values, low)
+
+    def group_by_class(self, field):
+        """
+        Summarize a field per character class
+
+        Returns: Dictionary {class_name: {'count', 'total', 'mean', 'min', 'max'}}
+        """
+        column = self.column(field)
+        groups = {}
+
+        for code, value in zip(self.class_codes, column):
+            group = groups.get(code)
+            if group is None:
+                groups[code] = [1, value, value, value]
+            else:
+                group[0] += 1
+                group[1] += value
+                if value < group[2]:
+                    group[2] = value
+                if value > group[3]:
+                    group[3] = value
+
+        return {
+            self.classes[code]: {
+                'count': count,
+                'total': total,
+                'mean': total / count,
+                'min': minimum,
+                'max': maximum,
+            }
+            for code, (count, total, minimum, maximum) in groups.items()
+        }
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, filename):
+        """
+        Write the whole store to a single binary file
+
+        Returns: True if successful
+        """
+        header = json.dumps({
+            'version': STORE_VERSION,
+            'rows': len(self),
+            'fields': list(self.columns),
+            'classes': self.classes,
+            'names': self.names,
+        }).encode('utf-8')
+
+        directory = os.path.dirname(filename)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        with open(filename, 'wb') as file:
+            file.write(STORE_MAGIC)
+            file.write(struct.pack('<I', len(header)))
+            file.write(header)
+            write_array(file, self.class_codes)
+            for column in self.columns.values():
+                write_array(file, column)
+
+        return True
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Read a store written by save()
+
+        Returns: CharacterStore
+        Raises:
+            MissingDataFileError if the file doesn't exist
+            CorruptedDataError if the file can't be decoded
+        """
+        if not os.path.exists(filename):
+            raise MissingDataFileError(f'character store not found: {filename}')
+
+        store = cls()
+        try:
+            with open(filename, 'rb') as file:
+                if file.read(4) != STORE_MAGIC:
+                    raise CorruptedDataError('not a character store file')
+                (header_length,) = struct.unpack('<I', file.read(4))
+                header = json.loads(file.read(header_length).decode('utf-8'))
+
+                if header['version'] != STORE_VERSION:
+                    raise CorruptedDataError(f"unsupported store version: {header['version']}")
+
+                rows = header['rows']
+                store.names = header['names']
+                store.classes = header['classes']
+                store.class_codes = read_array(file, 'B', rows)
+                store.columns = {field: read_array(file, 'q', rows) for field in header['fields']}
+        except CorruptedDataError:
+            raise
+        except (EOFError, OSError, ValueError, KeyError, struct.error) as e:
+            raise CorruptedDataError(f'could not read character store: {e}')
+
+        return store
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    print("=== CHARACTER STORE TEST ===")
+
+    # store = CharacterStore.from_save_directory()
+    # print(f"{len(store)} characters")
+    # print(f"Median gold: {store.percentile('gold', 50)}")
+    # print(store.group_by_class('level'))
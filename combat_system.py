@@ -9,6 +9,10 @@ AI Usage: [ChatGPT helped me format the special abilities classes]
 Handles combat mechanics
 """
 
+import random
+import metrics
+from character_manager import record_changes
+from effects import Clock, get_active_effects, tick_effects
 from custom_exceptions import (
     InvalidTargetError,
     CombatNotActiveError,
@@ -52,6 +56,8 @@ def create_enemy(enemy_type, level=1):
     health = stats['health'] + (level - 1) * 10
     return {
         'name': enemy_type.capitalize(),
+        'type': enemy_type,
+        'level': level,
         'health': stats['health'],
         'max_health': stats['health'],
         'strength': stats['strength'],
@@ -89,19 +95,29 @@ class SimpleBattle:
     Manages combat between character and enemy
     """
     
-    def __init__(self, character, enemy):
-        """Initialize battle with character and enemy"""
+    def __init__(self, character, enemy, io=None, rng=None):
+        """
+        Initialize battle with character and enemy
+        
+        io is an optional game_io adapter; without one the battle uses
+        print() and input() directly. rng is an optional random.Random for
+        escapes and critical strikes (seed it for replays).
+        """
         
         self.character = character
         self.enemy = enemy
         self.combat_active = True  # We'll know when battles are occurring
         self.turn = 0 # Track whose turn it is fighting
+        self.output = io.write if io is not None else print
+        self.input = io.read if io is not None else input
+        self.rng = rng if rng is not None else random
     
     def fight(self):
         """
         Simplified fight method that auto-completes battle
         
-        Returns: 'player' if player wins, 'enemy' if player loses
+        Returns: 'player' if player wins, 'enemy' if player loses,
+                 None if the player escaped
         """
         return self.start_battle()['winner']
     
@@ -110,50 +126,99 @@ class SimpleBattle:
         Start the combat loop
         
         Returns: Dictionary with battle results:
-                {'winner': 'player'|'enemy', 'xp_gained': int, 'gold_gained': int}
+                {'winner': 'player'|'enemy'|None, 'xp': int, 'gold': int}
+                (winner is None if the player escaped)
         
         Raises: CharacterDeadError if character is already dead
         """
         if self.character['health'] <= 0:
             raise CharacterDeadError('Cannot battle while dead!')
 
-        print(f"\n=== BATTLE START ===")
-        print(f"{self.character['name']} vs {self.enemy['name']}")
+        self.output(f"\n=== BATTLE START ===")
+        self.output(f"{self.character['name']} vs {self.enemy['name']}")
 
         # Combat will loop until someone dies or succeeds
         while self.combat_active:
             
-            display_combat_stats(self.character, self.enemy)
+            display_combat_stats(self.character, self.enemy, self.output)
 
             # Player takes a turn
             self.player_turn()
+            if not self.combat_active:
+                break
+            self.tick_effects(Clock.ACTIONS, (self.character,))
 
             # Check if player won
             winner = self.check_battle_end()
             if winner:
-                return self._finish_battle(winner)
+                return self.finish_battle(winner)
             
             # Enemy takes a turn
             self.enemy_turn()
 
+            # End of the round: timed effects tick (poison can finish a fight)
+            self.tick_effects(Clock.TURNS, (self.character, self.enemy))
+
             # Check if enemy won
             winner = self.check_battle_end()
             if winner:
-                return self._finish_battle(winner) 
+                return self.finish_battle(winner) 
+
+        # Player escaped
+        self.end_turn_effects()
+        metrics.BATTLES.inc(label='escaped')
+        return {"winner": None, "xp": 0, "gold": 0}
+
+    def tick_effects(self, clock, combatants):
+        """Advance timed effects on combatants and log the ones that wear off"""
+        for combatant in combatants:
+            for effect in tick_effects(combatant, clock):
+                display_battle_log(f"{combatant['name']}'s {effect.stat.value} effect wore off.", self.output)
+
+    def end_turn_effects(self):
+        """Turn-timed effects only last for the battle; end them"""
+        for combatant in (self.character, self.enemy):
+            tracker = get_active_effects(combatant, create=False)
+            if tracker:
+                tracker.clear(Clock.TURNS)
 
     
-    def _finish_battle(self, winner):
-        """Finish battle and return results"""
-            
+    def auto_round(self):
+        """
+        Play one round of basic attacks on both sides (auto-battles)
+        
+        Timed effects tick as in start_battle: player actions after the
+        player's attack, turns at the end of the round.
+        
+        Returns: 'player', 'enemy' or None if the battle goes on
+        """
+        self.apply_damage(self.enemy, self.calculate_damage(self.character, self.enemy))
+        self.tick_effects(Clock.ACTIONS, (self.character,))
+        winner = self.check_battle_end()
+        if winner:
+            return winner
+
+        self.apply_damage(self.character, self.calculate_damage(self.enemy, self.character))
+        self.tick_effects(Clock.TURNS, (self.character, self.enemy))
+        return self.check_battle_end()
+
+    def finish_battle(self, winner):
+        """
+        End the battle: clear turn-timed effects and count it
+        
+        Returns: Dictionary with battle results (see start_battle)
+        """
         self.combat_active = False
+        self.end_turn_effects()
+        metrics.BATTLES.inc(label=winner)
         
         if winner == 'player':
             rewards = get_victory_rewards(self.enemy)
-            display_battle_log(f"You defeated the {self.enemy['name']}!")
-            display_battle_log(f"Gained {rewards['xp']} XP and {rewards['gold']} gold!")
+            display_battle_log(f"You defeated the {self.enemy['name']}!", self.output)
+            display_battle_log(f"Gained {rewards['xp']} XP and {rewards['gold']} gold!", self.output)
             return {"winner": "player", **rewards}
         else:
-            print(f"\n*** DEFEAT ***")
+            self.output(f"\n*** DEFEAT ***")
             return  {"winner": "enemy", "xp": 0, "gold": 0}
 
     
@@ -171,33 +236,33 @@ class SimpleBattle:
         if not self.combat_active:
             raise CombatNotActiveError('Cannot act because combat is not active')
         
-        print('\nYour turn:')
-        print('1. Basic Attack')
-        print('2. Special Ability')
-        print('3. Try to Run')
+        self.output('\nYour turn:')
+        self.output('1. Basic Attack')
+        self.output('2. Special Ability')
+        self.output('3. Try to Run')
 
-        choice = input('> ').strip()
+        choice = self.input('> ').strip()
 
         if choice == '1':
             damage = self.calculate_damage(self.character, self.enemy)
             self.apply_damage(self.enemy, damage)
-            display_battle_log(f"You hit the {self.enemy['name']} for {damage} damage!")
+            display_battle_log(f"You hit the {self.enemy['name']} for {damage} damage!", self.output)
 
         elif choice == '2':
-            result = use_special_ability(self.character, self.enemy)
-            display_battle_log(result)
+            result = use_special_ability(self.character, self.enemy, self.rng)
+            display_battle_log(result, self.output)
 
         elif choice == '3':
             escaped = self.attempt_escape()
             if escaped:
-                display_battle_log('You escaped the battle!')
+                display_battle_log('You escaped the battle!', self.output)
                 self.combat_active = False
                 return
             else:
-                display_battle_log('Escape failed!')
+                display_battle_log('Escape failed!', self.output)
 
         else:
-            display_battle_log('Invalid choice. You lose your turn.')
+            display_battle_log('Invalid choice. You lose your turn.', self.output)
 
 
     def enemy_turn(self):
@@ -213,7 +278,7 @@ class SimpleBattle:
 
         damage = self.calculate_damage(self.enemy, self.character)
         self.apply_damage(self.character, damage)
-        display_battle_log(f"The {self.enemy['name']} hits you for {damage} damage!")  # FIXED: 'your' -> 'you'
+        display_battle_log(f"The {self.enemy['name']} hits you for {damage} damage!", self.output)  # FIXED: 'your' -> 'you'
 
     
     def calculate_damage(self, attacker, defender):
@@ -223,6 +288,9 @@ class SimpleBattle:
         Damage formula: attacker['strength'] - (defender['strength'] // 4)
         Minimum damage: 1
         
+        Strength is the effective value (base plus the cached equipment and
+        effect bonus), a single lookup per read.
+        
         Returns: Integer damage amount
         """
         base = attacker['strength']
@@ -239,6 +307,7 @@ class SimpleBattle:
         Reduces health, prevents negative health
         """
         target['health'] = max(0, target['health'] - damage)
+        record_changes(target, 'health')
 
     
     def check_battle_end(self):
@@ -264,14 +333,14 @@ class SimpleBattle:
         
         Returns: True if escaped, False if failed
         """
-        return random.random() < 0.5
+        return self.rng.random() < 0.5
     
 
 # ============================================================================
 # SPECIAL ABILITIES
 # ============================================================================
 
-def use_special_ability(character, enemy):
+def use_special_ability(character, enemy, rng=random):
     """
     Use character's class-specific special ability
     
@@ -286,16 +355,16 @@ def use_special_ability(character, enemy):
     """
     char_class = character['class'].lower()
 
-    if char_class == 'Warrior':
+    if char_class == 'warrior':
         return warrior_power_strike(character, enemy)
 
-    elif char_class == 'Mage':
+    elif char_class == 'mage':
         return mage_fireball(character, enemy)
 
-    elif char_class == 'Rogue':
-        return rogue_critical_strike(character, enemy)
+    elif char_class == 'rogue':
+        return rogue_critical_strike(character, enemy, rng)
 
-    elif char_class == 'Cleric':
+    elif char_class == 'cleric':
         return cleric_heal(character)
     
     else:
@@ -321,9 +390,9 @@ def mage_fireball(character, enemy):
     return f'Fireball burns for {damage} damage!'
 
 
-def rogue_critical_strike(character, enemy):
+def rogue_critical_strike(character, enemy, rng=random):
     """Rogue special ability"""
-    if random.random() < 0.5:
+    if rng.random() < 0.5:
         damage = character['strength'] * 3
         enemy['health'] -= damage
         if enemy['health'] < 0:
@@ -342,6 +411,7 @@ def cleric_heal(character):
     # Cap health at max_health
     if character['health'] > character['max_health']:
         character['health'] = character['max_health']
+    record_changes(character, 'health')
     return 'You cast heal and restore 30 health!'
 
 # ============================================================================
@@ -369,23 +439,23 @@ def get_victory_rewards(enemy):
     }
 
 
-def display_combat_stats(character, enemy):
+def display_combat_stats(character, enemy, output=print):
     """
     Display current combat status
     
     Shows both character and enemy health/stats
     """
-    print('\n=== Battle Status ===')
-    print(f"{character['name']}: HP={character['health']}/{character['max_health']}")
-    print(f"{enemy['name']}: HP={enemy['health']}/{enemy['max_health']}")
-    print('=====================')
+    output('\n=== Battle Status ===')
+    output(f"{character['name']}: HP={character['health']}/{character['max_health']}")
+    output(f"{enemy['name']}: HP={enemy['health']}/{enemy['max_health']}")
+    output('=====================')
 
 
-def display_battle_log(message):
+def display_battle_log(message, output=print):
     """
     Display a formatted battle message
     """
-    print(f">>> {message}")
+    output(f">>> {message}")
 
 # ============================================================================
 # TESTING
@@ -0,0 +1,269 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Content Generator Module
+
+Writes synthetic quest and item files, in the format load_quests() and
+load_items() read, at any size (tested into the tens of millions of
+records) for scale testing.
+
+Output is streamed record by record; memory use depends only on the
+prerequisite window, never on the record count.
+
+Quests form a prerequisite forest (each quest has at most one
+PREREQUISITE, so the DAG is a set of trees):
+- deep: with chain_probability a quest requires the quest just before it,
+  growing long chains up to max_depth
+- wide: otherwise it requires a random quest from the last `window`
+  quests, so popular quests unlock many others
+- roots: with root_probability (or when the chain is already max_depth
+  deep) a quest has no prerequisite
+
+Usage:
+    python content_generator.py quests data/big_quests.txt --count 1000000
+    python content_generator.py items data/big_items.txt --count 100000 --mix weapon=1,armor=1,consumable=3
+"""
+
+import argparse
+import random
+from collections import deque
+
+from custom_exceptions import InvalidDataFormatError
+
+# Default item type mix (relative weights)
+DEFAULT_TYPE_MIX = {'weapon': 0.3, 'armor': 0.2, 'consumable': 0.5}
+
+# Stats each item type can affect, with (min, max) effect value
+ITEM_EFFECTS = {
+    'weapon': [('strength', 2, 15), ('magic', 2, 15)],
+    'armor': [('max_health', 5, 40)],
+    'accessory': [('strength', 1, 8), ('magic', 1, 8), ('max_health', 2, 15)],
+    'consumable': [('health', 10, 80), ('strength', 1, 3), ('magic', 1, 3)],
+}
+
+MAX_QUEST_LEVEL = 50
+
+# Write buffer size for generated files
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# ============================================================================
+# RECORD FORMATTING
+# ============================================================================
+
+def format_quest_block(quest):
+    """Returns: One quest as file text, including the trailing blank line"""
+    return (
+        f"QUEST_ID: {quest['quest_id']}\n"
+        f"TITLE: {quest['title']}\n"
+        f"DESCRIPTION: {quest['description']}\n"
+        f"REWARD_XP: {quest['reward_xp']}\n"
+        f"REWARD_GOLD: {quest['reward_gold']}\n"
+        f"REQUIRED_LEVEL: {quest['required_level']}\n"
+        f"PREREQUISITE: {quest['prerequisite']}\n\n"
+    )
+
+
+def format_item_block(item):
+    """Returns: One item as file text, including the trailing blank line"""
+    return (
+        f"ITEM_ID: {item['item_id']}\n"
+        f"NAME: {item['name']}\n"
+        f"TYPE: {item['type']}\n"
+        f"EFFECT: {item['effect']}\n"
+        f"COST: {item['cost']}\n"
+        f"DESCRIPTION: {item['description']}\n\n"
+    )
+
+# ============================================================================
+# GENERATORS
+# ============================================================================
+
+def generate_quests(count, seed=0, chain_probability=0.5, root_probability=0.05,
+                    max_depth=100, window=1000):
+    """
+    Yield count synthetic quest dictionaries
+
+    Args:
+        count: Number of quests
+        seed: Random seed (same seed, same quests)
+        chain_probability: Chance a quest extends the previous quest's chain
+        root_probability: Chance a quest has no prerequisite
+        max_depth: Longest prerequisite chain allowed
+        window: How many recent quests a quest may pick its prerequisite from
+
+    Every prerequisite is a quest yielded earlier, and a quest's
+    required_level is never below its prerequisite's.
+
+    Raises: ValueError for invalid probabilities, depth or window
+    """
+    if not 0 <= chain_probability <= 1 or not 0 <= root_probability <= 1:
+        raise ValueError("probabilities must be between 0 and 1")
+    if max_depth < 1 or window < 1:
+        raise ValueError("max_depth and window must be at least 1")
+
+    rng = random.Random(seed)
+    recent = deque(maxlen=window)  # (quest_id, depth, required_level)
+
+    for i in range(count):
+        parent = None
+        roll = rng.random()
+        if recent and roll >= root_probability:
+            if roll < root_probability + chain_probability:
+                parent = recent[-1]
+            else:
+                parent = recent[rng.randrange(len(recent))]
+            if parent[1] + 1 >= max_depth:
+                parent = None
+
+        if parent is None:
+            depth = 0
+            level = rng.randint(1, 5)
+            prerequisite = 'NONE'
+        else:
+            depth = parent[1] + 1
+            level = min(MAX_QUEST_LEVEL, parent[2] + rng.randint(0, 1))
+            prerequisite = parent[0]
+
+        quest_id = f"quest_{i}"
+        recent.append((quest_id, depth, level))
+        yield {
+            'quest_id': quest_id,
+            'title': f"Quest {i}",
+            'description': f"Generated quest {i} (chain depth {depth})",
+            'reward_xp': 25 * level + rng.randint(0, 50),
+            'reward_gold': 10 * level + rng.randint(0, 25),
+            'required_level': level,
+            'prerequisite': prerequisite,
+        }
+
+
+def parse_type_mix(text):
+    """
+    Parse a type mix like "weapon=3,armor=1,consumable=6"
+
+    Returns: Dictionary {item_type: weight}
+    Raises: InvalidDataFormatError for unknown types or bad weights
+    """
+    mix = {}
+    for part in text.split(','):
+        if '=' not in part:
+            raise InvalidDataFormatError(f"type mix entry must be type=weight: {part!r}")
+        item_type, weight = part.split('=', 1)
+        item_type = item_type.strip()
+        if item_type not in ITEM_EFFECTS:
+            raise InvalidDataFormatError(f"unknown item type: {item_type}")
+        try:
+            mix[item_type] = float(weight)
+        except ValueError:
+            raise InvalidDataFormatError(f"invalid weight for {item_type}: {weight!r}")
+    return mix
+
+
+def generate_items(count, seed=0, type_mix=None):
+    """
+    Yield count synthetic item dictionaries
+
+    Args:
+        count: Number of items
+        seed: Random seed (same seed, same items)
+        type_mix: {item_type: weight}, default DEFAULT_TYPE_MIX
+
+    Raises: InvalidDataFormatError if the mix has unknown types or no weight
+    """
+    type_mix = DEFAULT_TYPE_MIX if type_mix is None else type_mix
+    unknown = set(type_mix) - set(ITEM_EFFECTS)
+    if unknown:
+        raise InvalidDataFormatError(f"unknown item types: {', '.join(sorted(unknown))}")
+    if sum(type_mix.values()) <= 0:
+        raise InvalidDataFormatError("type mix weights must add up to more than 0")
+
+    rng = random.Random(seed)
+    types = list(type_mix)
+    weights = [type_mix[t] for t in types]
+
+    for i in range(count):
+        item_type = rng.choices(types, weights)[0]
+        stat, low, high = rng.choice(ITEM_EFFECTS[item_type])
+        amount = rng.randint(low, high)
+        yield {
+            'item_id': f"item_{i}",
+            'name': f"{stat.replace('_', ' ').title()} {item_type.title()} {i}",
+            'type': item_type,
+            'effect': f"{stat}:{amount}",
+            'cost': amount * 10 + rng.randint(0, 20),
+            'description': f"Generated {item_type} that changes {stat} by {amount}",
+        }
+
+# ============================================================================
+# FILE WRITERS
+# ============================================================================
+
+def write_records(filename, records, formatter):
+    """
+    Stream records to a file
+
+    Returns: Number of records written
+    """
+    written = 0
+    with open(filename, 'w', buffering=WRITE_BUFFER_SIZE) as file:
+        for record in records:
+            file.write(formatter(record))
+            written += 1
+    return written
+
+
+def write_quest_file(filename, count, seed=0, **options):
+    """
+    Write count generated quests to filename
+
+    options are passed to generate_quests().
+    Returns: Number of quests written
+    """
+    return write_records(filename, generate_quests(count, seed, **options), format_quest_block)
+
+
+def write_item_file(filename, count, seed=0, type_mix=None):
+    """
+    Write count generated items to filename
+
+    Returns: Number of items written
+    """
+    return write_records(filename, generate_items(count, seed, type_mix), format_item_block)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Generate Quest Chronicles content packs")
+    sub = parser.add_subparsers(dest="kind", required=True)
+
+    quests = sub.add_parser("quests", help="write a quest file")
+    quests.add_argument("filename")
+    quests.add_argument("--count", type=int, default=10_000)
+    quests.add_argument("--seed", type=int, default=0)
+    quests.add_argument("--chain", type=float, default=0.5, help="chance to extend the previous chain")
+    quests.add_argument("--roots", type=float, default=0.05, help="chance of a quest with no prerequisite")
+    quests.add_argument("--max-depth", type=int, default=100)
+    quests.add_argument("--window", type=int, default=1000)
+
+    items = sub.add_parser("items", help="write an item file")
+    items.add_argument("filename")
+    items.add_argument("--count", type=int, default=10_000)
+    items.add_argument("--seed", type=int, default=0)
+    items.add_argument("--mix", default=None, help="type weights, e.g. weapon=3,armor=1,consumable=6")
+
+    args = parser.parse_args(argv)
+
+    if args.kind == "quests":
+        written = write_quest_file(
+            args.filename, args.count, args.seed,
+            chain_probability=args.chain, root_probability=args.roots,
+            max_depth=args.max_depth, window=args.window,
+        )
+    else:
+        type_mix = parse_type_mix(args.mix) if args.mix else None
+        written = write_item_file(args.filename, args.count, args.seed, type_mix)
+
+    print(f"wrote {written} {args.kind} to {args.filename}")
+
+
+if __name__ == "__main__":
+    main()
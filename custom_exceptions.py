@@ -10,7 +10,13 @@ This module defines all custom exceptions used throughout the game.
 # ============================================================================
 
 class GameError(Exception):
-    """Base exception for all game-related errors"""
+    """
+    Base exception for all game-related errors
+
+    Errors are counted in metrics.EXCEPTIONS where they're reported to a
+    player or caller (metrics.count_exception), not where they're raised,
+    so an error wrapped and re-raised is still counted once.
+    """
 
 
 class DataError(GameError):
@@ -114,6 +120,10 @@ class InvalidItemTypeError(InventoryError):
     """Raised when item type is not recognized"""
     pass
 
+class OutOfStockError(InventoryError):
+    """Raised when a shop has none of an item left"""
+    pass
+
 # Save/Load Exceptions
 class SaveFileCorruptedError(GameError):
     """Raised when save file cannot be loaded due to corruption"""
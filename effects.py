@@ -0,0 +1,342 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Effects Module
+
+Compiled item effects. An item's EFFECT text ("health:20", or several
+comma separated modifiers like "strength:5,magic:2") is parsed once when
+the item catalog is loaded into a tuple of Effect objects, stored on the
+item as item['effects']. Using or equipping an item then only dispatches
+on the compiled effects; no strings are split or int()'d.
+
+A modifier can also last a while: "strength:5:3" is +5 strength for 3
+battle turns and "magic:-2:4a" is -2 magic for 4 actions (battle actions
+and item uses). Timed health is applied every turn/action instead, so
+"health:5:3" heals 5 a turn for 3 turns and "health:-4:2" is poison.
+
+ActiveEffects tracks a character's timed effects. Each is kept in a
+min-heap keyed on the next clock value it needs attention at (expiry, or
+the next heal/damage tick), so a tick only touches effects that are due.
+"""
+
+import heapq
+import itertools
+from collections import namedtuple
+from enum import Enum
+
+from character_manager import adjust_modifier
+
+
+class Stat(str, Enum):
+    """
+    Character stats an effect can change
+
+    Members are also plain strings (Stat.HEALTH == 'health'), so they save,
+    print and serialize as their names and can be looked up by them.
+    """
+
+    HEALTH = 'health'
+    MAX_HEALTH = 'max_health'
+    STRENGTH = 'strength'
+    MAGIC = 'magic'
+
+
+class Clock(str, Enum):
+    """What a timed effect's duration counts"""
+
+    TURNS = 'turns'      # battle rounds
+    ACTIONS = 'actions'  # player battle actions and item uses
+
+
+# One stat modifier, e.g. Effect(Stat.HEALTH, 20) or, for 3 turns,
+# Effect(Stat.STRENGTH, 5, 3, Clock.TURNS). duration 0 means instant/permanent.
+Effect = namedtuple('Effect', ['stat', 'value', 'duration', 'clock'], defaults=(0, Clock.TURNS))
+
+# What adding an effect does when the same source already has one active on
+# the same stat: replace it (restarting the duration), add another copy (up
+# to MAX_STACKS), or keep the existing one
+STACKING_RULES = ('refresh', 'stack', 'ignore')
+DEFAULT_STACKING = 'refresh'
+MAX_STACKS = 5
+
+DURATION_SUFFIXES = {'': Clock.TURNS, 't': Clock.TURNS, 'a': Clock.ACTIONS}
+
+# Modifier stack source that timed stat effects add their bonuses under
+TIMED_EFFECTS_SOURCE = 'effects'
+
+# ============================================================================
+# COMPILING
+# ============================================================================
+
+def compile_effect(text):
+    """
+    Compile one "stat:value" or "stat:value:duration" modifier
+
+    duration is a count of turns, optionally suffixed t (turns) or
+    a (actions): "strength:5:3", "strength:5:3t", "magic:2:4a".
+
+    Returns: Effect
+    Raises: ValueError for a missing ':', unknown stat, non-integer value
+            or bad duration
+    """
+    parts = text.split(':')
+    if len(parts) not in (2, 3):
+        raise ValueError(f"effect must use format 'stat:value[:duration]': {text!r}")
+    stat = parts[0].strip()
+    try:
+        stat = Stat(stat)
+    except ValueError:
+        raise ValueError(f"unknown stat: {stat}")
+    try:
+        value = int(parts[1].strip())
+    except ValueError:
+        raise ValueError(f"effect value must be an integer: {parts[1].strip()!r}")
+    if len(parts) == 2:
+        return Effect(stat, value)
+
+    digits = parts[2].strip().lower()
+    suffix = digits[-1:] if digits[-1:].isalpha() else ''
+    clock = DURATION_SUFFIXES.get(suffix)
+    digits = digits[:len(digits) - len(suffix)]
+    if clock is None or not digits.isdigit() or int(digits) < 1:
+        raise ValueError(f"effect duration must be a positive count like 3, 3t or 3a: {parts[2].strip()!r}")
+    return Effect(stat, value, int(digits), clock)
+
+
+def format_effect_text(effect):
+    """Returns: Effect as EFFECT text, e.g. 'strength:5' or 'magic:2:4a'"""
+    text = f"{effect.stat.value}:{effect.value}"
+    if effect.duration:
+        text += f":{effect.duration}{'a' if effect.clock is Clock.ACTIONS else ''}"
+    return text
+
+
+def compile_effects(effect_string):
+    """
+    Compile an item's EFFECT text
+
+    Args:
+        effect_string: "stat:value", or several joined with commas
+
+    Returns: Tuple of Effect
+    Raises: ValueError if any modifier is invalid
+    """
+    if not isinstance(effect_string, str) or not effect_string.strip():
+        raise ValueError('effect must be a non-empty string')
+    return tuple(compile_effect(part) for part in effect_string.split(','))
+
+
+def item_effects(item_data):
+    """
+    Get an item's compiled effects
+
+    Items loaded by game_data already carry item['effects']; item
+    dictionaries built by hand are compiled from their 'effect' text.
+
+    Returns: Tuple of Effect
+    Raises: ValueError if the effect text is invalid
+    """
+    effects = item_data.get('effects')
+    if effects is None:
+        effects = compile_effects(item_data.get('effect'))
+    return effects
+
+
+def format_effects(effects):
+    """Returns: Text like '+5 strength, -2 magic for 3 turns'"""
+    return ', '.join(
+        f"{effect.value:+d} {effect.stat.value}"
+        + (f" for {effect.duration} {effect.clock.value}" if effect.duration else '')
+        for effect in effects
+    )
+
+# ============================================================================
+# TIMED EFFECTS
+# ============================================================================
+
+class _Active:
+    """One timed effect on a character"""
+
+    __slots__ = ('effect', 'source', 'remaining', 'cancelled')
+
+    def __init__(self, effect, source):
+        self.effect = effect
+        self.source = source
+        self.remaining = effect.duration  # ticks left (health effects)
+        self.cancelled = False
+
+
+class ActiveEffects:
+    """
+    A character's timed effects
+
+    Stat buffs/debuffs are added to the character's modifier stack (source
+    'effects') and taken back off when they expire, so base stats never
+    change. Timed health effects apply their value on every tick instead.
+
+    Entries live in one min-heap per clock, keyed on the clock value they
+    are next due at. Replaced effects are only marked cancelled and are
+    skipped when they reach the top of the heap.
+
+    Args:
+        character: Character (or plain character dictionary)
+        apply: Function(character, stat, value) that changes a stat
+               (default apply_timed_effect)
+    """
+
+    def __init__(self, character, apply=None):
+        if apply is None:
+            apply = apply_timed_effect
+        self.character = character
+        self.apply = apply
+        self.now = {clock: 0 for clock in Clock}
+        self.heaps = {clock: [] for clock in Clock}
+        self.by_key = {}  # (source, stat) -> list of live _Active
+        self._order = itertools.count()  # ties break by insertion order
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.by_key.values())
+
+    def active(self):
+        """Returns: List of (source, Effect, ticks left) for live effects"""
+        result = []
+        for clock in Clock:
+            for due, _, entry in sorted(self.heaps[clock]):
+                if not entry.cancelled:
+                    left = entry.remaining if entry.effect.stat is Stat.HEALTH else due - self.now[clock]
+                    result.append((entry.source, entry.effect, left))
+        return result
+
+    def add(self, effect, source=None, stacking=DEFAULT_STACKING):
+        """
+        Start a timed effect (an untimed one is just applied)
+
+        Args:
+            effect: Effect
+            source: What caused it, usually an item ID (used for stacking)
+            stacking: One of STACKING_RULES
+
+        Returns: True if the effect was added, False if stacking rules
+                 kept the existing one
+        Raises: ValueError for an unknown stacking rule
+        """
+        if stacking not in STACKING_RULES:
+            raise ValueError(f"stacking must be one of {', '.join(STACKING_RULES)}")
+
+        if not effect.duration:
+            self.apply(self.character, effect.stat, effect.value)
+            return True
+
+        key = (source, effect.stat)
+        existing = self.by_key.get(key)
+        if existing:
+            if stacking == 'ignore' or (stacking == 'stack' and len(existing) >= MAX_STACKS):
+                return False
+            if stacking == 'refresh':
+                for entry in list(existing):
+                    self._end(entry, revert=True)
+
+        entry = _Active(effect, source)
+        self.by_key.setdefault(key, []).append(entry)
+        if effect.stat is Stat.HEALTH:
+            due = self.now[effect.clock] + 1
+        else:
+            self.apply(self.character, effect.stat, effect.value)
+            due = self.now[effect.clock] + effect.duration
+        heapq.heappush(self.heaps[effect.clock], (due, next(self._order), entry))
+        return True
+
+    def tick(self, clock=Clock.TURNS, steps=1):
+        """
+        Advance a clock and handle the effects that are due
+
+        Returns: List of Effects that expired
+        """
+        clock = Clock(clock)
+        now = self.now[clock] = self.now[clock] + steps
+        heap = self.heaps[clock]
+        expired = []
+
+        while heap and heap[0][0] <= now:
+            due, order, entry = heapq.heappop(heap)
+            if entry.cancelled:
+                continue
+            if entry.effect.stat is Stat.HEALTH:
+                self.apply(self.character, Stat.HEALTH, entry.effect.value)
+                entry.remaining -= 1
+                if entry.remaining > 0:
+                    heapq.heappush(heap, (due + 1, order, entry))
+                    continue
+                self._end(entry, revert=False)
+            else:
+                self._end(entry, revert=True)
+            expired.append(entry.effect)
+
+        return expired
+
+    def clear(self, clock=None):
+        """
+        End every effect (or every effect on one clock) right away
+
+        Returns: List of Effects that were ended
+        """
+        ended = []
+        for entries in list(self.by_key.values()):
+            for entry in list(entries):
+                if clock is None or entry.effect.clock == clock:
+                    self._end(entry, revert=True)
+                    ended.append(entry.effect)
+        for heap_clock, heap in self.heaps.items():
+            if clock is None or heap_clock == clock:
+                heap.clear()
+        return ended
+
+    def _end(self, entry, revert):
+        """Remove entry from the index and undo its stat change if needed"""
+        entry.cancelled = True
+        key = (entry.source, entry.effect.stat)
+        entries = self.by_key[key]
+        entries.remove(entry)
+        if not entries:
+            del self.by_key[key]
+        if revert and entry.effect.stat is not Stat.HEALTH:
+            self.apply(self.character, entry.effect.stat, -entry.effect.value)
+
+
+def apply_timed_effect(character, stat, value):
+    """Heal/damage for health, otherwise change the 'effects' stat bonus"""
+    if stat is Stat.HEALTH:
+        from inventory_system import apply_stat_effect  # imports this module
+        apply_stat_effect(character, stat, value)
+    else:
+        adjust_modifier(character, TIMED_EFFECTS_SOURCE, stat, value)
+
+
+def get_active_effects(character, create=True):
+    """
+    Get a character's ActiveEffects
+
+    Characters keep it in their effects slot; plain dictionaries (enemies)
+    keep it under '_active_effects'.
+
+    Returns: ActiveEffects, or None if there is none and create is False
+    """
+    if isinstance(character, dict):
+        tracker = character.get('_active_effects')
+        if tracker is None and create:
+            tracker = character['_active_effects'] = ActiveEffects(character)
+        return tracker
+
+    tracker = getattr(character, 'effects', None)
+    if tracker is None and create:
+        tracker = character.effects = ActiveEffects(character)
+    return tracker
+
+
+def tick_effects(character, clock=Clock.TURNS, steps=1):
+    """
+    Advance a character's timed effects, if it has any
+
+    Returns: List of Effects that expired
+    """
+    tracker = get_active_effects(character, create=False)
+    return tracker.tick(clock, steps) if tracker else []
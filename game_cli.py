@@ -0,0 +1,361 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game CLI Module
+
+Non-interactive subcommands for operations tooling. Each command calls
+straight into game_data, character_manager and combat_system and writes
+one JSON object per line (JSON Lines) to stdout as results come in.
+
+    python main.py validate-data [--quests FILE]... [--items FILE]...
+    python main.py list-saves [--save-dir DIR]
+    python main.py show-character NAME... (or - to read names from stdin)
+    python main.py simulate [--class C]... [--enemy E]... [--battles N]
+    python main.py benchmark [--players N] [--workers N]
+    python main.py migrate-saves [NAME... | -] [--dry-run]
+    python main.py search WORD... [--kind quest|item] [--limit N]
+    python main.py loot [--enemy E]... [--level N] [--kills N]
+
+Exit code is 0 if every target succeeded and 1 otherwise.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import character_manager
+import combat_system
+import game_data
+import metrics
+import quest_handler
+from game_io import ScriptedIO
+from custom_exceptions import GameError, SaveFileCorruptedError
+
+DEFAULT_SAVE_DIRECTORY = "data/save_games"
+
+# Longest battle simulate will run before calling it a draw
+MAX_SIMULATED_ROUNDS = 1000
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def emit(record, out=None):
+    """Write one JSON Lines record"""
+    out = out or sys.stdout
+    out.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+def read_targets(names, stream=None):
+    """
+    Expand a name list where "-" means "one name per line from stdin"
+
+    Yields: Names, in order
+    """
+    for name in names:
+        if name == "-":
+            for line in (stream or sys.stdin):
+                line = line.strip()
+                if line:
+                    yield line
+        else:
+            yield name
+
+# ============================================================================
+# COMMANDS
+# ============================================================================
+
+def cmd_validate_data(args):
+    """Validate quest and item files, one record per file"""
+    quest_files = args.quests or ([] if args.items else ["data/quests.txt"])
+    item_files = args.items or ([] if args.quests else ["data/items.txt"])
+    targets = [("quests", f) for f in quest_files] + [("items", f) for f in item_files]
+
+    failures = 0
+    for kind, filename in targets:
+        record = {'kind': kind, 'file': filename}
+        try:
+            if kind == "quests":
+                data = game_data.load_quests(filename)
+                for quest in data.values():
+                    game_data.validate_quest_data(quest)
+                quest_handler.validate_quest_prerequisites(data)
+            else:
+                data = game_data.load_items(filename)
+                for item in data.values():
+                    game_data.validate_item_data(item)
+            record.update(ok=True, records=len(data))
+        except GameError as e:
+            failures += 1
+            metrics.count_exception(e)
+            record.update(ok=False, error=type(e).__name__, message=str(e))
+        emit(record)
+    return 1 if failures else 0
+
+
+def cmd_list_saves(args):
+    """List saves with their integrity status and pending journal records"""
+    failures = 0
+    for name in sorted(character_manager.list_saved_characters(args.save_dir)):
+        filename = os.path.join(args.save_dir, f"{name}_save.txt")
+        record = {'name': name}
+        try:
+            record['status'], reason = character_manager.check_character_files(name, args.save_dir)
+            if reason:
+                record['message'] = reason
+            record['bytes'] = os.path.getsize(filename)
+            record['journal_records'] = character_manager.count_journal_records(name, args.save_dir)
+        except OSError as e:
+            metrics.count_exception(e)
+            record.update(status='unreadable', message=str(e))
+        if record['status'] in ('corrupted', 'unreadable'):
+            failures += 1
+        emit(record)
+    return 1 if failures else 0
+
+
+def cmd_show_character(args):
+    """Print each named character's full save data"""
+    errors = {}
+    failures = 0
+
+    def emit_errors():
+        # Report failed loads as soon as they're recorded, in order
+        nonlocal failures
+        for name in list(errors):
+            error = errors.pop(name)
+            failures += 1
+            metrics.count_exception(error)
+            emit({'name': name, 'ok': False, 'error': type(error).__name__, 'message': str(error)})
+
+    for character in character_manager.load_characters(read_targets(args.names), args.save_dir, errors=errors):
+        emit_errors()
+        emit({'name': character['name'], 'ok': True, 'character': character.to_dict()})
+    emit_errors()
+    return 1 if failures else 0
+
+
+def simulate_battles(character_class, enemy_type, battles, level=1, seed=0):
+    """
+    Auto-battle a fresh character against an enemy type many times
+
+    Both sides use basic attacks, as in the server's EXPLORE command.
+
+    Returns: Summary dictionary (wins, losses, draws, mean rounds,
+             mean health left after a win)
+    """
+    import random
+    rng = random.Random(seed)
+    wins = losses = draws = rounds_total = health_left = 0
+
+    for _ in range(battles):
+        character = character_manager.create_character("Simulated", character_class)
+        for _ in range(level - 1):
+            character_manager.gain_experience(character, character['level'] * 100)
+        enemy = combat_system.create_enemy(enemy_type, level)
+        battle = combat_system.SimpleBattle(character, enemy, io=ScriptedIO(keep_output=False), rng=rng)
+
+        winner = None
+        rounds = 0
+        while winner is None and rounds < MAX_SIMULATED_ROUNDS:
+            rounds += 1
+            winner = battle.auto_round()
+        battle.end_turn_effects()  # not finish_battle: simulations stay out of the game's metrics
+
+        rounds_total += rounds
+        if winner == 'player':
+            wins += 1
+            health_left += character['health']
+        elif winner == 'enemy':
+            losses += 1
+        else:
+            draws += 1
+
+    return {
+        'class': character_class,
+        'enemy': enemy_type,
+        'level': level,
+        'battles': battles,
+        'wins': wins,
+        'losses': losses,
+        'draws': draws,
+        'mean_rounds': rounds_total / battles if battles else 0,
+        'mean_health_after_win': health_left / wins if wins else 0,
+    }
+
+
+def cmd_simulate(args):
+    """Simulate battles for every class/enemy pair"""
+    failures = 0
+    classes = args.character_class or ["Warrior", "Mage", "Rogue", "Cleric"]
+    enemies = args.enemy or ["goblin", "orc", "dragon"]
+    for character_class in classes:
+        for enemy_type in enemies:
+            try:
+                emit(simulate_battles(character_class, enemy_type, args.battles, args.level, args.seed))
+            except GameError as e:
+                failures += 1
+                metrics.count_exception(e)
+                emit({'class': character_class, 'enemy': enemy_type,
+                      'error': type(e).__name__, 'message': str(e)})
+    return 1 if failures else 0
+
+
+def cmd_benchmark(args):
+    """Run the scripted load test and print its report"""
+    import load_test
+    report = load_test.run_load_test(args.players, args.workers, args.seed, processes=args.processes)
+    emit(report)
+    return 0
+
+
+def cmd_migrate_saves(args):
+    """Rewrite saves in the current format (checksummed, journal folded in)"""
+    names = list(read_targets(args.names)) or character_manager.list_saved_characters(args.save_dir)
+    failures = 0
+    for name in names:
+        record = {'name': name}
+        try:
+            status, reason = character_manager.check_character_files(name, args.save_dir)
+            pending = character_manager.count_journal_records(name, args.save_dir)
+            if status == 'ok' and not pending:
+                record['status'] = 'current'
+            elif status == 'corrupted':
+                raise SaveFileCorruptedError(reason)
+            else:
+                if not args.dry_run:
+                    character = character_manager.load_character(name, args.save_dir)
+                    character_manager.save_character(character, args.save_dir)
+                record['status'] = 'would_migrate' if args.dry_run else 'migrated'
+                record['from'] = status
+                record['journal_records'] = pending
+        except (GameError, OSError) as e:
+            failures += 1
+            metrics.count_exception(e)
+            record.update(status='error', error=type(e).__name__, message=str(e))
+        emit(record)
+    return 1 if failures else 0
+
+
+def cmd_search(args):
+    """Search quest and item text, one record per hit"""
+    import search_index
+    try:
+        index = search_index.load_search_index(args.quests, args.items, args.index)
+    except GameError as e:
+        metrics.count_exception(e)
+        emit({'ok': False, 'error': type(e).__name__, 'message': str(e)})
+        return 1
+    for result in index.search(' '.join(args.words), args.limit, args.kind):
+        emit({'kind': result.kind, 'id': result.key, 'score': result.score})
+    return 0
+
+
+def cmd_loot(args):
+    """Simulate loot drops, one record per enemy and item"""
+    import random
+    import loot_system
+    rng = random.Random(args.seed)
+    try:
+        tables = loot_system.LootTables(game_data.load_items(args.items))
+    except GameError as e:
+        metrics.count_exception(e)
+        emit({'ok': False, 'error': type(e).__name__, 'message': str(e)})
+        return 1
+    failures = 0
+    for enemy_type in args.enemy or list(loot_system.DEFAULT_LOOT_TABLES):
+        try:
+            drops = tables.simulate(enemy_type, args.level, args.kills, rng)
+        except GameError as e:
+            failures += 1
+            metrics.count_exception(e)
+            emit({'enemy': enemy_type, 'ok': False, 'error': type(e).__name__, 'message': str(e)})
+            continue
+        for item_id, count in sorted(drops.items(), key=lambda drop: (-drop[1], drop[0])):
+            emit({'enemy': enemy_type, 'level': args.level, 'item': item_id,
+                  'drops': count, 'per_kill': round(count / args.kills, 4)})
+    return 1 if failures else 0
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+COMMANDS = {
+    'validate-data': cmd_validate_data,
+    'list-saves': cmd_list_saves,
+    'show-character': cmd_show_character,
+    'simulate': cmd_simulate,
+    'benchmark': cmd_benchmark,
+    'migrate-saves': cmd_migrate_saves,
+    'search': cmd_search,
+    'loot': cmd_loot,
+}
+
+
+def build_parser():
+    """Returns: argparse parser for every subcommand"""
+    parser = argparse.ArgumentParser(prog="main.py", description="Quest Chronicles operations commands")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    validate = sub.add_parser("validate-data", help="check quest and item files")
+    validate.add_argument("--quests", action="append", metavar="FILE")
+    validate.add_argument("--items", action="append", metavar="FILE")
+
+    list_saves = sub.add_parser("list-saves", help="list saves with integrity status")
+    list_saves.add_argument("--save-dir", default=DEFAULT_SAVE_DIRECTORY)
+
+    show = sub.add_parser("show-character", help="print characters as JSON")
+    show.add_argument("names", nargs="+", metavar="NAME", help="names, or - to read them from stdin")
+    show.add_argument("--save-dir", default=DEFAULT_SAVE_DIRECTORY)
+
+    simulate = sub.add_parser("simulate", help="simulate auto-battles")
+    simulate.add_argument("--class", dest="character_class", action="append", metavar="CLASS")
+    simulate.add_argument("--enemy", action="append", metavar="TYPE")
+    simulate.add_argument("--battles", type=int, default=100)
+    simulate.add_argument("--level", type=int, default=1)
+    simulate.add_argument("--seed", type=int, default=0)
+
+    benchmark = sub.add_parser("benchmark", help="run the scripted load test")
+    benchmark.add_argument("--players", type=int, default=20)
+    benchmark.add_argument("--workers", type=int, default=8)
+    benchmark.add_argument("--seed", type=int, default=0)
+    benchmark.add_argument("--processes", action="store_true")
+
+    migrate = sub.add_parser("migrate-saves", help="rewrite saves in the current format")
+    migrate.add_argument("names", nargs="*", metavar="NAME", help="names, or - for stdin (default: all)")
+    migrate.add_argument("--save-dir", default=DEFAULT_SAVE_DIRECTORY)
+    migrate.add_argument("--dry-run", action="store_true")
+
+    search = sub.add_parser("search", help="full-text search of quests and items")
+    search.add_argument("words", nargs="+", metavar="WORD", help="words to find; end one with * to match a prefix")
+    search.add_argument("--kind", choices=["quest", "item"])
+    search.add_argument("--limit", type=int, default=10)
+    search.add_argument("--quests", default="data/quests.txt", metavar="FILE")
+    search.add_argument("--items", default="data/items.txt", metavar="FILE")
+    search.add_argument("--index", default="data/search_index.bin", metavar="FILE")
+
+    loot = sub.add_parser("loot", help="simulate loot drops")
+    loot.add_argument("--enemy", action="append", metavar="TYPE")
+    loot.add_argument("--level", type=int, default=1)
+    loot.add_argument("--kills", type=int, default=10000)
+    loot.add_argument("--seed", type=int, default=0)
+    loot.add_argument("--items", default="data/items.txt", metavar="FILE")
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Run one subcommand
+
+    Returns: Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        return COMMANDS[args.command](args)
+    finally:
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,12 +10,51 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import time
+from bisect import bisect_left, bisect_right
+
+import metrics
+import symbols
+from character_manager import MODIFIABLE_STATS
+from effects import DEFAULT_STACKING, STACKING_RULES, compile_effects, format_effect_text
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+ITEM_TYPES = ("weapon", "armor", "accessory", "consumable")
+
+# Equipment slot -> item types it accepts
+EQUIPMENT_SLOTS = {
+    'head': ('armor',),
+    'body': ('armor',),
+    'hands': ('armor',),
+    'feet': ('armor',),
+    'neck': ('accessory',),
+    'ring_1': ('accessory',),
+    'ring_2': ('accessory',),
+    'main_hand': ('weapon',),
+    'off_hand': ('weapon', 'armor'),
+}
+
+# An item's SLOT value -> the slots it may go in, first free one preferred
+SLOT_GROUPS = {slot: (slot,) for slot in EQUIPMENT_SLOTS}
+SLOT_GROUPS['ring'] = ('ring_1', 'ring_2')
+
+# Slot used when an equippable item has no SLOT line
+DEFAULT_SLOTS = {'weapon': 'main_hand', 'armor': 'body', 'accessory': 'ring'}
+
+
+def item_slot_choices(item_dict):
+    """
+    Slots an item can be equipped in
+    
+    Returns: Tuple of slot names (empty for items that can't be equipped)
+    """
+    group = item_dict.get('slot') or DEFAULT_SLOTS.get(item_dict.get('type'))
+    return SLOT_GROUPS.get(group, ())
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
@@ -33,9 +72,12 @@ def load_quests(filename="data/quests.txt"):
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
     
+    Quest IDs (keys, QUEST_ID and PREREQUISITE) are interned (see symbols).
+    
     Returns: Dictionary of quests {quest_id: quest_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
+    start = time.perf_counter()
     if not os.path.exists(filename):
         raise MissingDataFileError(f'quest file not found: {filename}')
 
@@ -58,11 +100,14 @@ def load_quests(filename="data/quests.txt"):
             # for debugging
             raise InvalidDataFormatError(f"Invalid quest block: {e}")
 
-        quest_id = q["quest_id"]
-        if quest_id in quests:
+        quest_id = q["quest_id"] = symbols.intern(q["quest_id"])
+        if q.get('prerequisite', 'NONE') != 'NONE':
+            q['prerequisite'] = symbols.intern(q['prerequisite'])
+        if quest_id in quest_dict:
             raise InvalidDataFormatError(f"Duplicate quest id '{quest_id}' in file.")
-        quests[quest_id] = q
+        quest_dict[quest_id] = q
 
+    metrics.DATA_LOAD_SECONDS.observe(time.perf_counter() - start)
     return quest_dict 
     
 
@@ -74,13 +119,22 @@ def load_items(filename="data/items.txt"):
     ITEM_ID: unique_item_name
     NAME: Item Display Name
     TYPE: weapon|armor|consumable
-    EFFECT: stat_name:value (e.g., strength:5 or health:20)
+    EFFECT: stat_name:value (e.g., strength:5 or health:20; several
+            comma separated modifiers are allowed: strength:5,magic:2)
     COST: 100
     DESCRIPTION: Item description
+    STACKING: refresh|stack|ignore (optional, for timed effects)
+    SLOT: equipment slot (optional; see EQUIPMENT_SLOTS and SLOT_GROUPS,
+          default from DEFAULT_SLOTS)
+    
+    Each item also gets 'effects', its EFFECT compiled to a tuple of
+    effects.Effect, so using or equipping it never re-parses the text.
     
-    Returns: Dictionary of items {item_id: item_data_dict}
+    Returns: ItemCatalog of items {item_id: item_data_dict} (a dictionary
+             with secondary indexes for queries by type, stat and cost)
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
+    start = time.perf_counter()
     if not os.path.exists(filename):
         raise MissingDataFileError(f'Item file not found: {filename}')
 
@@ -94,19 +148,20 @@ def load_items(filename="data/items.txt"):
     item_dict = {}
 
     for block in blocks:
-        for block in blocks:
         lines = [line.strip() for line in block.splitlines() if line.strip()]
         try:
             itm = parse_item_block(lines)
         except InvalidDataFormatError as e:
             raise InvalidDataFormatError(f"Invalid item block: {e}")
 
-        item_id = itm["item_id"]
-        if item_id in items:
+        item_id = itm["item_id"] = symbols.intern(itm["item_id"])
+        if item_id in item_dict:
             raise InvalidDataFormatError(f"Duplicate item id '{item_id}' in file.")
-        items[item_id] = itm
+        item_dict[item_id] = itm
 
-    return items
+    catalog = ItemCatalog(item_dict)
+    metrics.DATA_LOAD_SECONDS.observe(time.perf_counter() - start)
+    return catalog
 
 
 def validate_quest_data(quest_dict):
@@ -145,38 +200,50 @@ def validate_item_data(item_dict):
     Validate that item dictionary has all required fields
     
     Required fields: item_id, name, type, effect, cost, description
-    Valid types: weapon, armor, consumable
+    Valid types: weapon, armor, accessory, consumable
+    Optional: slot (must accept the item's type), stacking
+    Equipment effects may only change stats equipment can give a bonus
+    to (character_manager.MODIFIABLE_STATS; not health)
     
     Returns: True if valid
     Raises: InvalidDataFormatError if missing required fields or invalid type
     """
     required = ['item_id', 'name', 'type', 'effect', 'cost', 'description']
 
-    missing = required - set(item_dict.keys())
+    missing = set(required) - set(item_dict.keys())
     if missing:
         raise InvalidDataFormatError(f"Missing item fields: {', '.join(sorted(missing))}")
 
-    if item_dict["type"] not in ("weapon", "armor", "consumable"):
+    if item_dict["type"] not in ITEM_TYPES:
         raise InvalidDataFormatError(f"Invalid item type: {item_dict['type']}")
 
+    if 'slot' in item_dict:
+        slots = SLOT_GROUPS.get(item_dict['slot'])
+        if not slots or item_dict['type'] not in EQUIPMENT_SLOTS[slots[0]]:
+            raise InvalidDataFormatError(
+                f"Invalid slot for {item_dict['type']}: {item_dict['slot']}")
+
     # cost must be int
     if not isinstance(item_dict.get("cost"), int):
         raise InvalidDataFormatError("Item field 'cost' must be an integer.")
 
-    # value should be int
-    eff = item_dict["effect"]
-    if ":" not in eff:
-        raise InvalidDataFormatError("Item 'effect' must use format 'stat:value'.")
+    # effect must compile (items from load_items() already did)
+    effects = item_dict.get('effects')
+    if effects is None:
+        try:
+            effects = compile_effects(item_dict["effect"])
+        except ValueError as e:
+            raise InvalidDataFormatError(f"Invalid item effect: {e}")
 
-    stat, val = eff.split(":", 1)
-    stat = stat.strip()
-    val = val.strip()
-    if not stat or not val:
-        raise InvalidDataFormatError("Item 'effect' must contain both stat and value.")
-    try:
-        int(val)
-    except ValueError:
-        raise InvalidDataFormatError("Item effect value must be an integer.")
+    if item_dict["type"] != "consumable":
+        for effect in effects:
+            if effect.stat not in MODIFIABLE_STATS:
+                raise InvalidDataFormatError(
+                    f"Invalid effect for {item_dict['type']}: equipment cannot change {effect.stat.value}")
+
+    # optional stacking rule for timed effects
+    if item_dict.get("stacking", DEFAULT_STACKING) not in STACKING_RULES:
+        raise InvalidDataFormatError(f"Invalid item stacking rule: {item_dict['stacking']}")
 
     return True
 
@@ -251,6 +318,125 @@ DESCRIPTION: Basic armor that increases maximum health.
     return True
 
 
+# ============================================================================
+# ITEM CATALOG
+# ============================================================================
+
+class ItemIndex:
+    """
+    Secondary indexes over an item catalog
+
+    Built once from {item_id: item_data}: item IDs by TYPE, by the stats
+    their EFFECT changes, and sorted by COST. A query starts from the
+    smallest index list its filters select and checks the other filters
+    on just those items, so it never scans the whole catalog.
+    """
+
+    def __init__(self, items):
+        """Index items (O(n log n))"""
+        self.items = items
+        by_type = {}
+        by_stat = {}
+        for item_id, item in items.items():
+            by_type.setdefault(item.get('type'), []).append(item_id)
+            effects = item['effects'] if 'effects' in item else compile_effects(item['effect']) if item.get('effect') else ()
+            for stat in dict.fromkeys(effect.stat for effect in effects):
+                by_stat.setdefault(stat, []).append(item_id)
+
+        self.types = {item_type: tuple(ids) for item_type, ids in by_type.items()}
+        self.stats = {stat: tuple(ids) for stat, ids in by_stat.items()}
+        self._stat_sets = {stat: frozenset(ids) for stat, ids in by_stat.items()}
+
+        # Cheapest first; sorted() is stable so ties keep catalog order
+        self.by_cost = sorted(items, key=lambda item_id: int(items[item_id].get('cost', 0)))
+        self.costs = [int(items[item_id].get('cost', 0)) for item_id in self.by_cost]
+
+    def of_type(self, item_type):
+        """Returns: Tuple of item IDs of a type, in catalog order"""
+        return self.types.get(item_type, ())
+
+    def affecting(self, stat):
+        """Returns: Tuple of item IDs whose effect changes stat ('strength' or Stat.STRENGTH)"""
+        return self.stats.get(stat, ())
+
+    def cost_range(self, min_cost=None, max_cost=None):
+        """Returns: List of item IDs costing min_cost..max_cost (inclusive), cheapest first"""
+        low, high = self._cost_bounds(min_cost, max_cost)
+        return self.by_cost[low:high]
+
+    def query(self, item_type=None, stat=None, min_cost=None, max_cost=None):
+        """
+        Find items matching every given filter
+
+        Args:
+            item_type: TYPE to match
+            stat: Stat the item's effect must change
+            min_cost, max_cost: Inclusive COST bounds
+
+        Returns: List of item IDs, in the order of the most selective
+                 index (catalog order for type/stat, cheapest first for cost)
+        """
+        low, high = self._cost_bounds(min_cost, max_cost)
+        ids = self.by_cost[low:high] if min_cost is not None or max_cost is not None else None
+        for selected in (self.of_type(item_type) if item_type is not None else None,
+                         self.affecting(stat) if stat is not None else None):
+            if selected is not None and (ids is None or len(selected) < len(ids)):
+                ids = selected
+        if ids is None:
+            return list(self.items)
+
+        stat_ids = self._stat_sets.get(stat, frozenset()) if stat is not None else None
+        result = []
+        for item_id in ids:
+            item = self.items[item_id]
+            cost = int(item.get('cost', 0))
+            if ((item_type is None or item.get('type') == item_type)
+                    and (stat_ids is None or item_id in stat_ids)
+                    and (min_cost is None or cost >= min_cost)
+                    and (max_cost is None or cost <= max_cost)):
+                result.append(item_id)
+        return result
+
+    def _cost_bounds(self, min_cost, max_cost):
+        """Returns: (low, high) positions in by_cost for a cost range"""
+        low = 0 if min_cost is None else bisect_left(self.costs, min_cost)
+        high = len(self.costs) if max_cost is None else bisect_right(self.costs, max_cost)
+        return low, max(low, high)
+
+
+class ItemCatalog(dict):
+    """
+    Item dictionary {item_id: item_data} returned by load_items
+
+    Works like the plain dictionary, plus .index, an ItemIndex built when
+    the catalog loads. Catalogs are read-only once loaded; the index is
+    not updated if items are added or removed afterwards.
+
+    Item IDs are interned, so the catalog's keys are the same string
+    objects as the IDs in every character's inventory.
+    """
+
+    def __init__(self, items=()):
+        super().__init__((symbols.intern(item_id), item) for item_id, item in dict(items).items())
+        self.index = ItemIndex(self)
+
+    def __reduce__(self):
+        # Rebuilt on unpickling, so a worker process interns the IDs itself
+        return (ItemCatalog, (dict(self),))
+
+
+def item_index(items):
+    """
+    Get the ItemIndex for an item catalog
+
+    Catalogs from load_items carry one; a plain dictionary is indexed
+    on the spot.
+
+    Returns: ItemIndex
+    """
+    index = getattr(items, 'index', None)
+    return index if isinstance(index, ItemIndex) else ItemIndex(items)
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -323,15 +509,10 @@ def parse_item_block(lines):
             if key == 'cost':
                 value = int(value)
 
-            # Parse effect (format: stat:amount)
+            # Compile effect once here so using/equipping never re-parses it
             if key == 'effect':
-                if ':' in value:
-                    stat, amount = value.split(':', 1)
-                    stat = stat.strip()
-                    amount = amount.strip()
-                    # Store as string for compatibility
-                    value = f"{stat}:{amount}"
-                # Keep the original string format for now
+                item['effects'] = compile_effects(value)
+                value = ','.join(format_effect_text(effect) for effect in item['effects'])
 
             item[key] = value
 
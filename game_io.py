@@ -0,0 +1,171 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game I/O Module
+
+Input/output adapters for the menus in main.py and the battle prompts in
+combat_system. Menus call write() for each line and read() for each
+prompt; output is buffered and sent as one block per screen (whenever the
+player is asked for input, or on flush()).
+
+Adapters:
+- ConsoleIO: terminal via sys.stdin / sys.stdout
+- ScriptedIO: answers from a list, output collected in memory (tests, load tests)
+- SocketIO: a connected socket, one line per answer
+"""
+
+import sys
+from collections import deque
+
+# ============================================================================
+# BASE ADAPTER
+# ============================================================================
+
+class GameIO:
+    """
+    Base class for game input/output
+
+    Subclasses implement _send(text) and _receive(prompt).
+    """
+
+    def __init__(self):
+        """Initialize an empty screen buffer"""
+        self._buffer = []
+
+    def write(self, text=''):
+        """Queue a line of output for the current screen"""
+        self._buffer.append(str(text))
+
+    def flush(self):
+        """Send everything queued since the last flush as one block"""
+        if self._buffer:
+            text = '\n'.join(self._buffer) + '\n'
+            self._buffer.clear()
+            self._send(text)
+
+    def read(self, prompt=''):
+        """
+        Finish the current screen and ask the player for input
+
+        Returns: The player's answer without the trailing newline
+        Raises: EOFError if no more input is available
+        """
+        self.flush()
+        return self._receive(prompt)
+
+    def close(self):
+        """Flush remaining output"""
+        self.flush()
+
+    def _send(self, text):
+        raise NotImplementedError
+
+    def _receive(self, prompt):
+        raise NotImplementedError
+
+
+# ============================================================================
+# ADAPTERS
+# ============================================================================
+
+class ConsoleIO(GameIO):
+    """Terminal input/output"""
+
+    def __init__(self, stdin=None, stdout=None):
+        """Initialize with optional streams (default sys.stdin/sys.stdout)"""
+        super().__init__()
+        self.stdin = stdin
+        self.stdout = stdout
+
+    def _send(self, text):
+        stdout = self.stdout or sys.stdout
+        stdout.write(text)
+        stdout.flush()
+
+    def _receive(self, prompt):
+        stdout = self.stdout or sys.stdout
+        stdin = self.stdin or sys.stdin
+        if stdin is sys.stdin and stdout is sys.stdout:
+            return input(prompt)
+
+        stdout.write(prompt)
+        stdout.flush()
+        line = stdin.readline()
+        if not line:
+            raise EOFError('no more input')
+        return line.rstrip('\n')
+
+
+class ScriptedIO(GameIO):
+    """
+    Answers come from a queue, output is kept in memory
+
+    Lets the full menu flow run at CPU speed with no terminal.
+    """
+
+    def __init__(self, answers=(), keep_output=True):
+        """
+        Args:
+            answers: Iterable of answers, one per prompt
+            keep_output: If False, output is counted but not stored
+        """
+        super().__init__()
+        self.answers = deque(answers)
+        self.keep_output = keep_output
+        self.screens = []
+        self.prompts = []
+        self.bytes_written = 0
+
+    def feed(self, *answers):
+        """Queue more answers"""
+        self.answers.extend(answers)
+
+    @property
+    def output(self):
+        """All output so far as a single string"""
+        self.flush()
+        return ''.join(self.screens)
+
+    def _send(self, text):
+        self.bytes_written += len(text)
+        if self.keep_output:
+            self.screens.append(text)
+
+    def _receive(self, prompt):
+        if self.keep_output:
+            self.prompts.append(prompt)
+        if not self.answers:
+            raise EOFError('scripted input exhausted')
+        return str(self.answers.popleft())
+
+
+class SocketIO(GameIO):
+    """
+    Input/output over a connected (blocking) socket
+
+    Each screen is one sendall; each answer is one line from the client.
+    """
+
+    def __init__(self, sock, encoding='utf-8'):
+        """Initialize with a connected socket"""
+        super().__init__()
+        self.sock = sock
+        self.encoding = encoding
+        self._reader = sock.makefile('rb')
+
+    def _send(self, text):
+        self.sock.sendall(text.encode(self.encoding))
+
+    def _receive(self, prompt):
+        if prompt:
+            self.sock.sendall(prompt.encode(self.encoding))
+        line = self._reader.readline()
+        if not line:
+            raise EOFError('client disconnected')
+        return line.decode(self.encoding, 'replace').rstrip('\r\n')
+
+    def close(self):
+        """Flush output and close the reader (the socket is left to its owner)"""
+        try:
+            self.flush()
+        finally:
+            self._reader.close()
@@ -0,0 +1,488 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game Server Module
+
+Hosts many players in one process over a line-based TCP or Unix socket
+protocol. Every connection gets its own session and character; the quest
+and item catalogs are loaded once and shared read-only by all sessions.
+
+Protocol: the client sends one command per line, the server answers with
+zero or more text lines followed by a final "OK" or "ERR <message>" line.
+
+    NEW <name> <class>      create a character
+    LOAD <name>             load a saved character
+    STATS                   show character stats
+    INVENTORY               list inventory
+    QUESTS [available|active|completed]
+    ACCEPT <quest_id>       accept a quest
+    COMPLETE <quest_id>     complete an active quest
+    ABANDON <quest_id>      abandon an active quest
+    SHOP [page]             list a page of the shop's prices and stock
+    BUY <item_id> ...       buy one or more items (all or none)
+    SELL <item_id>          sell an item
+    USE <item_id>           use a consumable
+    EQUIP <item_id> [slot]  equip an item (in its first free slot by default)
+    UNEQUIP <slot>          put a slot's item back in the inventory
+    SEARCH <word> ...       search quests and items (word* matches a prefix)
+    EXPLORE                 fight a random enemy (auto-battle)
+    SAVE                    save the character
+    QUIT                    save and disconnect
+    METRICS [json]          metrics snapshot (Prometheus text by default)
+    HELP                    list commands
+
+With --metrics-file the server also writes a snapshot every
+--metrics-interval seconds (JSON if the file name ends in .json).
+"""
+
+import argparse
+import asyncio
+import inspect
+import os
+import re
+
+import character_manager
+import inventory_system
+import quest_handler
+import combat_system
+import game_data
+import metrics
+import shop_system
+import search_index
+import loot_system
+from game_io import ScriptedIO
+from custom_exceptions import GameError
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+
+# Maximum combat rounds before the server yields to other sessions
+ROUNDS_PER_YIELD = 5
+
+# Character names come from the network and become save file names
+NAME_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+HELP_LINES = [
+    "NEW <name> <class>",
+    "LOAD <name>",
+    "STATS",
+    "INVENTORY",
+    "QUESTS [available|active|completed]",
+    "ACCEPT <quest_id>",
+    "COMPLETE <quest_id>",
+    "ABANDON <quest_id>",
+    "SHOP [page]",
+    "BUY <item_id> ...",
+    "SELL <item_id>",
+    "USE <item_id>",
+    "EQUIP <item_id> [slot]",
+    "UNEQUIP <slot>",
+    "SEARCH <word> ...",
+    "EXPLORE",
+    "SAVE",
+    "QUIT",
+    "METRICS [json]",
+]
+
+# ============================================================================
+# SHARED STATE
+# ============================================================================
+
+class GameCatalog:
+    """
+    Quest and item data shared by every session
+
+    Loaded once at server start and never modified afterwards.
+    """
+
+    def __init__(self, quests, items):
+        """Initialize catalog with loaded quest and item dictionaries"""
+        self.quests = quests
+        self.items = items
+
+    @classmethod
+    def load(cls, quest_file="data/quests.txt", item_file="data/items.txt"):
+        """Load the catalog from the data files"""
+        return cls(game_data.load_quests(quest_file), game_data.load_items(item_file))
+
+
+class SessionError(GameError):
+    """Raised when a command can't run in the session's current state"""
+
+
+# ============================================================================
+# SESSIONS
+# ============================================================================
+
+class ServerSession:
+    """
+    One connected player
+
+    Holds the player's character; command handlers return the lines to send
+    back. Blocking file I/O (load/save) runs in a worker thread so other
+    sessions keep going.
+    """
+
+    def __init__(self, server):
+        """Initialize session for a server"""
+        self.server = server
+        self.catalog = server.catalog
+        self.character = None
+        self.connected = True
+
+    async def handle(self, line):
+        """
+        Run one protocol command
+
+        Returns: List of response lines ending in "OK" or "ERR <message>"
+        """
+        parts = line.split()
+        if not parts:
+            return []
+
+        command, args = parts[0].upper(), parts[1:]
+        handler = getattr(self, f"cmd_{command.lower()}", None)
+        if handler is None:
+            return [f"ERR unknown command: {command}"]
+
+        try:
+            inspect.signature(handler).bind(*args)
+        except TypeError:
+            return [f"ERR wrong arguments for {command}"]
+
+        try:
+            result = handler(*args)
+            if asyncio.iscoroutine(result):
+                result = await result
+        except (GameError, ValueError) as e:
+            metrics.count_exception(e)
+            return [f"ERR {e}"]
+        except OSError as e:
+            metrics.count_exception(e)
+            return [f"ERR could not access save file: {e.strerror or e}"]
+
+        return list(result or []) + ["OK"]
+
+    def require_character(self):
+        """Raises: SessionError if no character is loaded"""
+        if self.character is None:
+            raise SessionError("no character loaded (use NEW or LOAD)")
+        return self.character
+
+    async def release(self):
+        """
+        Save and release this session's character
+
+        The character is released even if saving fails.
+
+        Raises: OSError if the save can't be written
+        """
+        character, self.character = self.character, None
+        if character is not None:
+            try:
+                await asyncio.to_thread(character_manager.save_character, character, self.server.save_directory)
+            finally:
+                self.server.active_names.discard(character['name'])
+
+    def claim(self, name):
+        """Raises: SessionError if another session is playing this character"""
+        if name in self.server.active_names:
+            raise SessionError(f"{name} is already playing")
+        self.server.active_names.add(name)
+
+    def save_filename(self, name):
+        """
+        Path of a character's save file
+
+        Raises: SessionError unless name is letters, digits, '_' and '-'
+        """
+        if not NAME_PATTERN.fullmatch(name):
+            raise SessionError("names may only use letters, digits, '_' and '-'")
+        return os.path.join(self.server.save_directory, f"{name}_save.txt")
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+
+    def cmd_help(self):
+        return list(HELP_LINES)
+
+    def cmd_metrics(self, fmt="prometheus"):
+        if fmt not in ("prometheus", "json"):
+            raise SessionError("METRICS takes prometheus or json")
+        return metrics.REGISTRY.render(fmt).splitlines()
+
+    async def cmd_new(self, name, character_class):
+        filename = self.save_filename(name)
+        character = character_manager.create_character(name, character_class.capitalize())
+        if name in self.server.active_names or await asyncio.to_thread(os.path.exists, filename):
+            raise SessionError(f"{name} already exists (use LOAD)")
+        await self.release()
+        self.claim(name)
+        try:
+            await asyncio.to_thread(character_manager.save_character, character, self.server.save_directory)
+        except OSError:
+            self.server.active_names.discard(name)
+            raise
+        self.character = character
+        return [f"created {name} the {character['class']}"]
+
+    async def cmd_load(self, name):
+        self.save_filename(name)
+        await self.release()
+        self.claim(name)
+        try:
+            self.character = await asyncio.to_thread(character_manager.load_character, name, self.server.save_directory)
+        except GameError:
+            self.server.active_names.discard(name)
+            raise
+        inventory_system.apply_equipment_bonuses(self.character, self.catalog.items)
+        return [f"loaded {name}"]
+
+    async def cmd_save(self):
+        character = self.require_character()
+        await asyncio.to_thread(character_manager.save_character, character, self.server.save_directory)
+        return ["saved"]
+
+    async def cmd_quit(self):
+        await self.release()
+        self.connected = False
+        return ["goodbye"]
+
+    def cmd_stats(self):
+        c = self.require_character()
+        return [
+            f"name: {c['name']}",
+            f"class: {c['class']}",
+            f"level: {c['level']}",
+            f"experience: {c['experience']}/{c['level'] * 100}",
+            f"health: {c['health']}/{c['max_health']}",
+            f"strength: {c['strength']}",
+            f"magic: {c['magic']}",
+            f"gold: {c['gold']}",
+        ] + [
+            f"{slot}: {self.catalog.items.get(item_id, {}).get('name', item_id)}"
+            for slot, item_id in (c.get('equipment') or {}).items()
+        ]
+
+    def cmd_inventory(self):
+        c = self.require_character()
+        lines = []
+        for item_id in c['inventory']:
+            item = self.catalog.items.get(item_id, {})
+            lines.append(f"{item_id} - {item.get('name', item_id)} ({item.get('type', 'unknown')})")
+        return lines
+
+    def cmd_quests(self, which="available"):
+        c = self.require_character()
+        getters = {
+            'available': quest_handler.get_available_quests,
+            'active': quest_handler.get_active_quests,
+            'completed': quest_handler.get_completed_quests,
+        }
+        if which not in getters:
+            raise SessionError("QUESTS takes available, active or completed")
+        return [
+            f"{q['quest_id']} - {q.get('title', q['quest_id'])} (level {q.get('required_level', 1)})"
+            for q in getters[which](c, self.catalog.quests)
+        ]
+
+    def cmd_accept(self, quest_id):
+        quest_handler.accept_quest(self.require_character(), quest_id, self.catalog.quests)
+        return [f"accepted {quest_id}"]
+
+    def cmd_complete(self, quest_id):
+        rewards = quest_handler.complete_quest(self.require_character(), quest_id, self.catalog.quests)
+        return [f"completed {quest_id}: +{rewards['xp_gained']} xp, +{rewards['gold_gained']} gold"]
+
+    def cmd_abandon(self, quest_id):
+        quest_handler.abandon_quest(self.require_character(), quest_id)
+        return [f"abandoned {quest_id}"]
+
+    def item_data(self, item_id):
+        """Raises: SessionError if the item isn't in the catalog"""
+        if item_id not in self.catalog.items:
+            raise SessionError(f"unknown item: {item_id}")
+        return self.catalog.items[item_id]
+
+    def cmd_shop(self, page="1"):
+        if not page.isdigit():
+            raise SessionError("SHOP takes a page number")
+        shop = self.server.shop
+        number, quotes = shop.page(int(page))
+        return [f"page {number}/{shop.page_count()}"] + [
+            f"{q.item_id} - {q.name}: buy {q.buy}, sell {q.sell} ({q.stock} in stock)"
+            for q in quotes
+        ]
+
+    def cmd_buy(self, item_id, *more_item_ids):
+        item_ids = (item_id,) + more_item_ids
+        gold = self.server.shop.checkout(self.require_character(), item_ids)
+        return [f"bought {' '.join(item_ids)} for {gold} gold"]
+
+    def cmd_sell(self, item_id):
+        gold = self.server.shop.sell(self.require_character(), item_id)
+        return [f"sold {item_id} for {gold} gold"]
+
+    def cmd_use(self, item_id):
+        return [inventory_system.use_item(self.require_character(), item_id, self.item_data(item_id))]
+
+    def cmd_equip(self, item_id, slot=None):
+        return [inventory_system.equip_item(self.require_character(), item_id, self.item_data(item_id), slot)]
+
+    def cmd_unequip(self, slot):
+        item_id = inventory_system.unequip_slot(self.require_character(), slot)
+        return [f"unequipped {item_id} from {slot}" if item_id else f"{slot} is empty"]
+
+    def cmd_search(self, *words):
+        if not words:
+            raise SessionError("SEARCH needs at least one word")
+        return [
+            f"{result.kind} {result.key} (score {result.score})"
+            for result in self.server.search_index.search(' '.join(words))
+        ]
+
+    async def cmd_explore(self):
+        c = self.require_character()
+        if not combat_system.can_character_fight(c):
+            raise SessionError("you're too weak to fight, heal first")
+
+        enemy = combat_system.get_random_enemy_for_level(c['level'])
+        # The battle's own log isn't sent; the summary lines below are
+        battle = combat_system.SimpleBattle(c, enemy, io=ScriptedIO(keep_output=False))
+        lines = [f"a {enemy['name']} appears!"]
+
+        # Auto-battle with basic attacks, yielding so one long fight
+        # doesn't stall every other session
+        rounds = 0
+        winner = None
+        while winner is None:
+            winner = battle.auto_round()
+            rounds += 1
+            if rounds % ROUNDS_PER_YIELD == 0:
+                await asyncio.sleep(0)
+
+        rewards = battle.finish_battle(winner)
+        if winner == 'player':
+            character_manager.gain_experience(c, rewards['xp'])
+            character_manager.add_gold(c, rewards['gold'])
+            lines.append(f"victory in {rounds} rounds: +{rewards['xp']} xp, +{rewards['gold']} gold")
+            found, left_behind = loot_system.award_loot(c, self.server.loot.roll(enemy))
+            lines += [f"found {item_id}" for item_id in found]
+            lines += [f"no room for {item_id}, left it behind" for item_id in left_behind]
+        else:
+            character_manager.revive_character(c)
+            lines.append(f"defeated by the {enemy['name']} after {rounds} rounds, revived at half health")
+        return lines
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class GameServer:
+    """
+    Asyncio server hosting many concurrent sessions
+    """
+
+    def __init__(self, catalog, save_directory="data/save_games"):
+        """Initialize server with a shared catalog"""
+        self.catalog = catalog
+        self.shop = shop_system.Shop(catalog.items)  # stock is shared by every session
+        self.loot = loot_system.LootTables(catalog.items)
+        self.save_directory = save_directory
+        self.active_names = set()
+        self.sessions = set()
+        self._search_index = None
+
+    @property
+    def search_index(self):
+        """SearchIndex over the catalog, built on first use"""
+        if self._search_index is None:
+            self._search_index = search_index.build_index(self.catalog.quests, self.catalog.items)
+        return self._search_index
+
+    async def handle_connection(self, reader, writer):
+        """Serve one client until it quits or disconnects"""
+        session = ServerSession(self)
+        self.sessions.add(session)
+        metrics.SESSIONS.inc(label='server')
+        try:
+            writer.write(b"QUEST CHRONICLES SERVER - type HELP for commands\n")
+            while session.connected:
+                raw = await reader.readline()
+                if not raw:
+                    break
+
+                response = await session.handle(raw.decode('utf-8', 'replace').strip())
+
+                # One write per command, not one per line
+                if response:
+                    writer.write(("\n".join(response) + "\n").encode('utf-8'))
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            try:
+                await session.release()
+            except OSError as e:
+                print(f"could not save on disconnect: {e}")
+            self.sessions.discard(session)
+            writer.close()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        """
+        Start listening on TCP (host, port) or a Unix socket path
+
+        Returns: asyncio server object
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, path=path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+
+async def write_metrics_forever(path, interval):
+    """Write a metrics snapshot to path every interval seconds"""
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(metrics.write_snapshot, path)
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, path=None, save_directory="data/save_games",
+                metrics_file=None, metrics_interval=10.0):
+    """Load the catalog once and serve forever"""
+    server = GameServer(GameCatalog.load(), save_directory)
+    listener = await server.start(host, port, path)
+    where = path or f"{host}:{port}"
+    print(f"Quest Chronicles server listening on {where}")
+
+    writer = None
+    if metrics_file is not None:
+        writer = asyncio.create_task(write_metrics_forever(metrics_file, metrics_interval))
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        if writer is not None:
+            writer.cancel()
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Quest Chronicles multiplayer server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--save-dir", default="data/save_games")
+    parser.add_argument("--metrics-file", metavar="PATH", help="write metrics snapshots to this file")
+    parser.add_argument("--metrics-interval", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.save_dir,
+                          args.metrics_file, args.metrics_interval))
+    except KeyboardInterrupt:
+        print("\nserver stopped")
+
+
+if __name__ == "__main__":
+    main()
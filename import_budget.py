@@ -0,0 +1,92 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Import Budget Module
+
+Measures how long `import main` takes with `python -X importtime` and
+checks it against main.IMPORT_BUDGET_MS, so startup stays fast as the
+game grows.
+
+Usage:
+    python import_budget.py              # exit code 1 if over budget
+    python import_budget.py --top 15     # also list the slowest imports
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output
+
+    Returns: List of (module, self_us, cumulative_us)
+    """
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return rows
+
+
+def measure_import(module="main", runs=5, cwd=None):
+    """
+    Import module in fresh interpreters and time it
+
+    Args:
+        module: Module to import
+        runs: Number of interpreter starts (the median is reported)
+        cwd: Directory to run in (default: current directory)
+
+    Returns: (median cumulative ms, rows from the median run)
+    Raises: RuntimeError if the import fails
+    """
+    results = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, cwd=cwd,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{proc.stderr}")
+        rows = parse_importtime(proc.stderr)
+        total = next(cumulative for name, _, cumulative in reversed(rows) if name == module)
+        results.append((total / 1000, rows))
+
+    results.sort(key=lambda result: result[0])
+    return results[len(results) // 2]
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Check the import time of main.py")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=None, help="ms (default main.IMPORT_BUDGET_MS)")
+    parser.add_argument("--top", type=int, default=0, help="show the slowest imports")
+    args = parser.parse_args(argv)
+
+    budget = args.budget
+    if budget is None:
+        import main as game_main
+        budget = game_main.IMPORT_BUDGET_MS
+
+    total, rows = measure_import(args.module, args.runs)
+    print(f"import {args.module}: {total:.1f} ms (budget {budget:g} ms, median of {args.runs})")
+
+    if args.top:
+        for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+            print(f"  {self_us / 1000:8.2f} ms self {cumulative_us / 1000:8.2f} ms total  {name}")
+
+    return 0 if total <= budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
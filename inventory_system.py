@@ -15,6 +15,11 @@ from custom_exceptions import (
     InsufficientResourcesError,
     InvalidItemTypeError
 )
+from character_manager import MODIFIABLE_STATS, record_changes, set_modifier, remove_modifier
+from game_data import EQUIPMENT_SLOTS, item_slot_choices
+from effects import Stat, Clock, DEFAULT_STACKING, item_effects, format_effects, get_active_effects, tick_effects
+import metrics
+import symbols
 
 # Maximum inventory size
 MAX_INVENTORY_SIZE = 20
@@ -45,9 +50,11 @@ def add_item_to_inventory(character, item_id):
     if len(character['inventory']) >= MAX_INVENTORY_SIZE:
         
         #no room for more items
+        metrics.INVENTORY_FULL.inc()
         raise InventoryFullError('inventory is full')
 
-    character['inventory'].append(item_id)
+    character['inventory'].append(symbols.intern(item_id))
+    record_changes(character, 'inventory')
     return True
 
 
@@ -71,6 +78,7 @@ def remove_item_from_inventory(character, item_id):
         raise ItemNotFoundError(f'item "{item_id}" not found in inventory')
 
     inv.remove(item_id)
+    record_changes(character, 'inventory')
     return True
 
 
@@ -121,6 +129,7 @@ def clear_inventory(character):
     
     removed = character.get('inventory', []).copy()
     character['inventory'] = []
+    record_changes(character, 'inventory')
     return removed
 
 # ============================================================================
@@ -140,6 +149,10 @@ def use_item(character, item_id, item_data):
     - consumable: Apply effect and remove from inventory
     - weapon/armor: Cannot be "used", only equipped
     
+    Using an item is an action, so effects timed in actions tick first.
+    Timed effects start on the character's effects.ActiveEffects, stacking
+    by the item's optional 'stacking' rule (default refresh).
+    
     Returns: String describing what happened
     Raises: 
         ItemNotFoundError if item not in inventory
@@ -161,16 +174,25 @@ def use_item(character, item_id, item_data):
     if itype != 'consumable':
         raise InvalidItemTypeError(f'item "{item_id}" of type "{itype}" cannot be used')
 
-    effect = item_data.get('effect')
-    stat_name, value = parse_item_effect(effect)
-
-    #apply effect
-    apply_stat_effect(character, stat_name, value)
+    effects = item_effects(item_data)
+    tick_effects(character, Clock.ACTIONS)
+
+    #apply effect (timed ones through the character's effect tracker)
+    results = []
+    for effect in effects:
+        if effect.duration:
+            added = get_active_effects(character).add(
+                effect, item_id, item_data.get('stacking', DEFAULT_STACKING))
+            results.append(f"{effect.stat.value} {effect.value:+d} for {effect.duration} {effect.clock.value}"
+                           + ('' if added else ' (already active)'))
+        else:
+            STAT_HANDLERS[effect.stat](character, effect.value)
+            results.append(f"{effect.stat.value} + {effect.value}")
 
     #remove one copy
     remove_item_from_inventory(character, item_id)
 
-    return f"used {item_data.get('name', 'item')} -> {stat_name} + {value}"
+    return f"used {item_data.get('name', 'item')} -> " + ', '.join(results)
 
 
 def equip_weapon(character, item_id, item_data):
@@ -184,61 +206,16 @@ def equip_weapon(character, item_id, item_data):
     
     Weapon effect format: "strength:5" (adds 5 to strength)
     
-    If character already has weapon equipped:
-    - Unequip current weapon (remove bonus)
-    - Add old weapon back to inventory
+    The weapon goes in its SLOT (default main_hand); see equip_item.
     
     Returns: String describing equipment change
     Raises:
         ItemNotFoundError if item not in inventory
         InvalidItemTypeError if item type is not 'weapon'
     """
-    # TODO: Implement weapon equipping
-    # Check item exists and is type 'weapon'
-    # Handle unequipping current weapon if exists
-    # Parse effect and apply to character stats
-    # Store equipped_weapon in character dictionary
-    # Remove item from inventory
-    
-    #ownership check
-    if not has_item(character, item_id):
-        raise ItemNotFoundError(f'weapon "{item_id}" is not in inventory')
-
     if item_data.get('type') != 'weapon':
         raise InvalidItemTypeError(f'item "{item_id}" is not a weapon')
-
-    #make sure equip slots are open
-    current_weapon_id = character.get('equipped_weapon')
-
-    #unequip current weapon if present
-    if current_weapon_id is not None:
-        #before adding, making sure theres space
-        if get_inventory_space_remaining(character) <= 0:
-            raise InventoryFullError('no space to unequip current weapon')
-
-        old_weapon_id = current_weapon_id
-
-        #add old weapon back
-        add_item_to_inventory(character, old_weapon_id)
-
-        #remove stat bonus if stored
-        weapon_bonus = character.pop('_equipped_weapon_bonus', None)
-        if weapon_bonus:
-            apply_stat_effect(character, weapon_bonus[0], -weapon_bonus[1])
-
-    #apply new weapon effect
-    effect = item_data.get('effect')
-    stat_name, value = parse_item_effect(effect)
-
-    #apply stat bonus
-    apply_stat_effect(character, stat_name, value)
-    character['_equipped_weapon_bonus'] = (stat_name, value)
-    character['equipped_weapon'] = item_id
-
-    #remove equipped item from inv
-    remove_item_from_inventory(character, item_id)
-
-    return f"equipped {item_data.get('name', 'weapon')} (+{value} {stat_name})"
+    return equip_item(character, item_id, item_data)
 
 
 def equip_armor(character, item_id, item_data):
@@ -252,109 +229,193 @@ def equip_armor(character, item_id, item_data):
     
     Armor effect format: "max_health:10" (adds 10 to max_health)
     
-    If character already has armor equipped:
-    - Unequip current armor (remove bonus)
-    - Add old armor back to inventory
+    The armor goes in its SLOT (default body); see equip_item.
     
     Returns: String describing equipment change
     Raises:
         ItemNotFoundError if item not in inventory
         InvalidItemTypeError if item type is not 'armor'
     """
-    # TODO: Implement armor equipping
-    # Similar to equip_weapon but for armor
-    if not has_item(character, item_id):
-        raise ItemNotFoundError(f'armor "{item_id}" not found in inventory')
-
     if item_data.get('type') != 'armor':
         raise InvalidItemTypeError(f'item "{item_id}" is not armor')
-
-    current_armor_id = character.get('equipped_armor')
-
-    #unequip existing armor
-    if current_armor_id is not None:
-        if get_inventory_space_remaining(character) <= 0:
-            raise InventoryFullError('no space to unequip current armor')
-        #return old armor to inv
-        add_item_to_inventory(character, current_armor_id)
-        #remove stoed armor bonus
-        armor_bonus = character.pop('_equipped_armor_bonus', None)
-        if armor_bonus:
-            apply_stat_effect(character, armor_bonus[0], -armor_bonus[1])
-
-    #apply new armor effect
-    effect = item_data.get('effect')
-    stat_name, value = parse_item_effect(effect)
-    apply_stat_effect(character, stat_name, value)
-    character['_equipped_armor_bonus'] = (stat_name, value)
-    character['equipped_armor'] = item_id
-
-    remove_item_from_inventory(character, item_id)
-
-    return f"equipped {item_data.get('name', 'armor')} (+{value} {stat_name})"
+    return equip_item(character, item_id, item_data)
 
 
 def unequip_weapon(character):
     """
-    Remove equipped weapon and return it to inventory
+    Remove the main hand weapon and return it to inventory
     
     Returns: Item ID that was unequipped, or None if no weapon equipped
     Raises: InventoryFullError if inventory is full
     """
-    # TODO: Implement weapon unequipping
-    # Check if weapon is equipped
-    # Remove stat bonuses
-    # Add weapon back to inventory
-    # Clear equipped_weapon from character
+    return unequip_slot(character, 'main_hand')
+
+
+def unequip_armor(character):
+    """
+    Remove the body armor and return it to inventory
     
-    weapon_id = character.get('equipped_weapon')
-    if not weapon_id:
-        return None
+    Returns: Item ID that was unequipped, or None if no armor equipped
+    Raises: InventoryFullError if inventory is full
+    """
+    return unequip_slot(character, 'body')
 
-    #check space
-    if get_inventory_space_remaining(character) <= 0:
-        raise InventoryFullError('No space to unequip weapon')
+# ============================================================================
+# EQUIPMENT SLOTS
+# ============================================================================
 
-    #reverse bonus
-    bonus = character.pop('_equipped_weapon_bonus', None)
-    if bonus:
-        apply_stat_effect(character, bonus[0], -bonus[1])
+def get_equipment(character):
+    """
+    Returns: The character's {slot: item_id} dictionary (a live view;
+             change it through equip_item/unequip_slot)
+    """
+    equipment = character.get('equipment')
+    if equipment is None:
+        equipment = character['equipment'] = {}
+    return equipment
 
-    #remove equip slot and add item back
-    character['equipped_weapon'] = None
-    add_item_to_inventory(character, weapon_id)
-    return weapon_id
 
+def choose_slot(character, item_id, item_data, slot=None):
+    """
+    Pick the slot an item will be equipped in
+    
+    Args:
+        slot: Requested slot, or None for the first free slot the item
+              fits (the first slot it fits if all are taken)
+    
+    Returns: Slot name
+    Raises: InvalidItemTypeError if the item can't go in that slot (or
+            can't be equipped at all)
+    """
+    choices = item_slot_choices(item_data)
+    if slot is not None:
+        if slot not in EQUIPMENT_SLOTS or item_data.get('type') not in EQUIPMENT_SLOTS[slot]:
+            raise InvalidItemTypeError(f'item "{item_id}" cannot be equipped in {slot}')
+        return slot
+    if not choices:
+        raise InvalidItemTypeError(f'item "{item_id}" cannot be equipped')
 
-def unequip_armor(character):
+    equipment = character.get('equipment') or {}
+    for choice in choices:
+        if choice not in equipment:
+            return choice
+    return choices[0]
+
+
+def equipment_effects(item_id, item_data):
     """
-    Remove equipped armor and return it to inventory
+    Get the effects an item gives as equipment
     
-    Returns: Item ID that was unequipped, or None if no armor equipped
-    Raises: InventoryFullError if inventory is full
+    Returns: Tuple of effects.Effect
+    Raises: InvalidItemTypeError if an effect changes a stat equipment
+            can't give a bonus to (health, say)
+    """
+    effects = item_effects(item_data)
+    for effect in effects:
+        if effect.stat not in MODIFIABLE_STATS:
+            stat = getattr(effect.stat, 'value', effect.stat)
+            raise InvalidItemTypeError(f'item "{item_id}" cannot be equipped: equipment cannot change {stat}')
+    return effects
+
+
+def equip_item(character, item_id, item_data, slot=None):
     """
-    # TODO: Implement armor unequipping
+    Equip an item in a slot, swapping out whatever was there
     
-    armor_id = character.get('equipped_armor')
-    if not armor_id:
-        return None
+    The swap is atomic: everything is checked before anything changes,
+    and the old item takes the new item's place in the inventory, so a
+    swap works even with a full inventory. The stat bonus is recomputed
+    once, for the one slot that changed.
+    
+    Args:
+        character: Character dictionary
+        item_id: Item to equip (must be in the inventory)
+        item_data: Item information dictionary
+        slot: Slot to use (default: chosen by choose_slot)
+    
+    Returns: String describing equipment change
+    Raises:
+        ItemNotFoundError if item not in inventory
+        InvalidItemTypeError if the item doesn't fit the slot, or has an
+            effect equipment can't give (see equipment_effects)
+    """
+    inventory = character.get('inventory', [])
+    if item_id not in inventory:
+        raise ItemNotFoundError(f'item "{item_id}" is not in inventory')
+
+    slot = choose_slot(character, item_id, item_data, slot)
+    effects = equipment_effects(item_id, item_data)
+
+    # Replaces the slot's old bonus
+    set_modifier(character, slot, effects)
+
+    equipment = get_equipment(character)
+    old_item_id = equipment.get(slot)
+    position = inventory.index(item_id)
+    if old_item_id is None:
+        del inventory[position]
+    else:
+        inventory[position] = old_item_id
+    equipment[slot] = item_id
+    record_changes(character, 'inventory', 'equipment')
+
+    return f"equipped {item_data.get('name', item_id)} ({format_effects(effects)})"
+
+
+def unequip_slot(character, slot):
+    """
+    Take the item out of a slot and put it back in the inventory
     
+    Returns: Item ID that was unequipped, or None if the slot was empty
+    Raises:
+        InventoryFullError if inventory is full
+        ValueError for an unknown slot
+    """
+    if slot not in EQUIPMENT_SLOTS:
+        raise ValueError(f"unknown equipment slot: {slot}")
+
+    equipment = character.get('equipment')
+    if not equipment or slot not in equipment:
+        return None
+
     if get_inventory_space_remaining(character) <= 0:
-        raise InventoryFullError('no space to unequip armor')
+        raise InventoryFullError(f'no space to unequip {slot}')
+
+    remove_modifier(character, slot)
+    item_id = equipment.pop(slot)
+    character['inventory'].append(item_id)
+    record_changes(character, 'inventory', 'equipment')
+    return item_id
 
-    bonus = character.pop('_equipped_armor_bonus', None)
-    if bonus:
-        apply_stat_effect(character, bonus[0], -bonus[1])
 
-    character['equipped_armor'] = None
-    add_item_to_inventory(character, armor_id)
-    return armor_id
+def apply_equipment_bonuses(character, item_data_dict):
+    """
+    Set the stat bonus of every equipped item (after loading a save)
+    
+    Saves store which item is in each slot, not its bonus, so the bonus
+    always matches the current item catalog.
+    
+    Returns: List of slots whose item isn't in item_data_dict, or can no
+             longer be equipped (those slots keep their item but give no
+             bonus)
+    """
+    missing = []
+    for slot, item_id in (character.get('equipment') or {}).items():
+        item = item_data_dict.get(item_id)
+        try:
+            if item is None:
+                raise ItemNotFoundError(item_id)
+            set_modifier(character, slot, equipment_effects(item_id, item))
+        except (ItemNotFoundError, InvalidItemTypeError):
+            missing.append(slot)
+            remove_modifier(character, slot)
+    return missing
 
 # ============================================================================
 # SHOP SYSTEM
 # ============================================================================
 
-def purchase_item(character, item_id, item_data):
+def purchase_item(character, item_id, item_data, price=None):
     """
     Purchase an item from a shop
     
@@ -362,32 +423,20 @@ def purchase_item(character, item_id, item_data):
         character: Character dictionary
         item_id: Item to purchase
         item_data: Item information with 'cost' field
+        price: Gold to pay (default the item's cost)
     
     Returns: True if purchased successfully
     Raises:
         InsufficientResourcesError if not enough gold
         InventoryFullError if inventory is full
     """
-    # TODO: Implement purchasing
-    # Check if character has enough gold
-    # Check if inventory has space
-    # Subtract gold from character
-    # Add item to inventory
-    
-    cost = int(item_data.get('cost', 0))
-    if character.get('gold', 0) < cost:
-        raise InsufficientResourcesError('not enough gold to purchase item')
-
-    if get_inventory_space_remaining(character) <= 0:
-        raise InventoryFullError('inventory is full so you cant purchase')
-
-    #subtract gold and add item
-    character['gold'] -= cost
-    add_item_to_inventory(character, item_id)
+    with transaction(character) as txn:
+        txn.spend(int(item_data.get('cost', 0)) if price is None else price)
+        txn.add(item_id)
     return True
 
 
-def sell_item(character, item_id, item_data):
+def sell_item(character, item_id, item_data, price=None):
     """
     Sell an item for half its purchase cost
     
@@ -395,27 +444,122 @@ def sell_item(character, item_id, item_data):
         character: Character dictionary
         item_id: Item to sell
         item_data: Item information with 'cost' field
+        price: Gold received (default half the item's cost)
     
     Returns: Amount of gold received
     Raises: ItemNotFoundError if item not in inventory
     """
-    # TODO: Implement selling
-    # Check if character has item
-    # Calculate sell price (cost // 2)
-    # Remove item from inventory
-    # Add gold to character
+    gold_received = int(item_data.get('cost', 0)) // 2 if price is None else price
+    with transaction(character) as txn:
+        txn.remove(item_id)
+        txn.earn(gold_received)
+    return gold_received
+
+# ============================================================================
+# TRANSACTIONS
+# ============================================================================
+
+class Transaction:
+    """
+    Gold and inventory changes applied as a unit
     
-    if not has_item(character, item_id):
-        raise ItemNotFoundError(f'item "{item_id}" not in inventory')
+    Changes are only staged while the with block runs. When it ends they
+    are all checked once and applied together; if a check fails (or the
+    block raises) nothing is changed.
+    
+        with transaction(character) as txn:
+            txn.spend(cost)
+            txn.add(item_id)
+    
+    Attributes:
+        gold: Net gold change so far
+        added, removed: Item IDs to add to / remove from the inventory
+    """
 
-    cost = int(item_data.get('cost', 0))
-    gold_received = cost // 2
+    __slots__ = ('character', 'gold', 'added', 'removed')
 
-    #remove a copy and add gold
-    remove_item_from_inventory(character, item_id)
-    character['gold'] = character.get('gold', 0) + gold_received
-    return gold_received
+    def __init__(self, character):
+        self.character = character
+        self.gold = 0
+        self.added = []
+        self.removed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.commit()
+        return False
 
+    def spend(self, gold):
+        """Stage paying gold"""
+        self.gold -= gold
+
+    def earn(self, gold):
+        """Stage receiving gold"""
+        self.gold += gold
+
+    def add(self, item_id):
+        """Stage adding one item"""
+        self.added.append(symbols.intern(item_id))
+
+    def remove(self, item_id):
+        """Stage removing one item"""
+        self.removed.append(item_id)
+
+    def validate(self):
+        """
+        Check the staged changes against the character
+        
+        Raises:
+            ItemNotFoundError if a removed item isn't in the inventory
+            InsufficientResourcesError if gold would go below zero
+            InventoryFullError if the inventory would overflow
+        """
+        inventory = self.character.get('inventory', [])
+        for item_id in set(self.removed):
+            if inventory.count(item_id) < self.removed.count(item_id):
+                raise ItemNotFoundError(f'item "{item_id}" not in inventory')
+
+        if self.character.get('gold', 0) + self.gold < 0:
+            raise InsufficientResourcesError('not enough gold')
+
+        if len(inventory) - len(self.removed) + len(self.added) > MAX_INVENTORY_SIZE:
+            metrics.INVENTORY_FULL.inc()
+            raise InventoryFullError('inventory is full')
+
+    def commit(self):
+        """
+        Validate and apply the staged changes
+        
+        Raises: see validate (nothing is applied)
+        """
+        self.validate()
+        character = self.character
+        fields = []
+        if self.removed or self.added:
+            if 'inventory' not in character:
+                character['inventory'] = []
+            inventory = character['inventory']
+            for item_id in self.removed:
+                inventory.remove(item_id)
+            inventory.extend(self.added)
+            fields.append('inventory')
+        if self.gold:
+            character['gold'] = character.get('gold', 0) + self.gold
+            fields.append('gold')
+        if fields:
+            record_changes(character, *fields)
+
+
+def transaction(character):
+    """
+    Start a Transaction on a character's gold and inventory
+    
+    Returns: Transaction (use it as a context manager)
+    """
+    return Transaction(character)
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -428,6 +572,9 @@ def parse_item_effect(effect_string):
     Args:
         effect_string: String in format "stat_name:value"
     
+    Items loaded by game_data already carry compiled effects
+    (item['effects']); this is only for raw effect text.
+    
     Returns: Tuple of (stat_name, value)
     Example: "health:20" → ("health", 20)
     """
@@ -446,41 +593,60 @@ def parse_item_effect(effect_string):
     raise ValueError('unknown effect format')
     
 
+def _add_health(character, value):
+    #clamp between 0 and max_health
+    health = character.get('health', 0) + value
+    character['health'] = max(0, min(health, character.get('max_health', health)))
+    record_changes(character, 'health')
+
+
+def _add_max_health(character, value):
+    character['max_health'] = character.get('max_health', 0) + value
+    #if max_health shrank below current health
+    if character.get('health', 0) > character['max_health']:
+        character['health'] = character['max_health']
+    record_changes(character, 'max_health', 'health')
+
+
+def _add_strength(character, value):
+    character['strength'] = character.get('strength', 0) + value
+    record_changes(character, 'strength')
+
+
+def _add_magic(character, value):
+    character['magic'] = character.get('magic', 0) + value
+    record_changes(character, 'magic')
+
+
+# Stat -> function applying a change to it (Stat members hash like their
+# names, so plain 'health' strings find the same entry)
+STAT_HANDLERS = {
+    Stat.HEALTH: _add_health,
+    Stat.MAX_HEALTH: _add_max_health,
+    Stat.STRENGTH: _add_strength,
+    Stat.MAGIC: _add_magic,
+}
+
+
 def apply_stat_effect(character, stat_name, value):
     """
     Apply a stat modification to character
     
-    Valid stats: health, max_health, strength, magic
+    Args:
+        character: Character dictionary
+        stat_name: effects.Stat (or its name: health, max_health,
+                   strength, magic)
+        value: Integer amount to add
     
     Note: health cannot exceed max_health
+    Raises: ValueError for an unknown stat
     """
-    # TODO: Implement stat application
-    # Add value to character[stat_name]
-    # If stat is health, ensure it doesn't exceed max_health
-    if stat_name not in ('health', 'max_health', 'strength', 'magic'):
-        #other stats can be added here
+    handler = STAT_HANDLERS.get(stat_name)
+    if handler is None:
         raise ValueError(f"unknown stat: {stat_name}")
 
-    #make sure key exist
-    if stat_name not in character:
-        #initialize numeric stats when missing
-        character[stat_name] = 0
+    handler(character, int(value))
 
-    #apply change
-    character[stat_name] = character.get(stat_name, 0) + int(value)
-
-    #if max_health changed and health exceeds new max
-    if stat_name == 'max_health':
-        if character.get('health', 0) > character['max_health']:
-            character['health'] = character['max_health']
-        
-    #make sure health is within bounds
-    if stat_name == 'health':
-        if character.get('health', 0) < 0:
-            character['health'] = 0
-        if character.get('health', 0) > character.get('max_health', character['health']):
-            character['health'] = character.get('max_health', character['health'])
-        
 
 def display_inventory(character, item_data_dict):
     """
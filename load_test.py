@@ -0,0 +1,320 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Load Test Module
+
+Runs many simulated players through the real main.py menus at once and
+reports how many full game sessions per second the code sustains.
+
+Each player is a PlayerBot (a scripted game_io adapter) that starts a new
+game and then picks game menu actions from a seeded plan:
+
+    new game -> shop -> explore (1-3 times) -> quests -> stats -> save and quit
+
+Battles, "press enter" prompts and death screens are answered by the bot
+itself, so plans stay in step no matter how a fight goes.
+
+Usage:
+    python load_test.py --players 200 --workers 16 --seed 1
+    python load_test.py --players 200 --workers 4 --processes
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections import deque, defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import main
+import game_data
+import shop_system
+from game_io import ScriptedIO
+
+DEFAULT_PLAYERS = 20
+DEFAULT_WORKERS = 8
+
+CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+
+# Battle answer per class: mages use fireball, everyone else attacks
+# (a cleric only heals with its special, so it would never win)
+BATTLE_CHOICES = {'Mage': '2'}
+
+# Answer for a sub-menu prompt when the plan has nothing left for it
+BACK_ANSWERS = {
+    'choice (1-3):': '3',
+    'choice (1-7):': '7',
+}
+
+GAME_MENU_PROMPT = 'enter choice (1-6)'
+
+# ============================================================================
+# SIMULATED PLAYER
+# ============================================================================
+
+class PlayerBot(ScriptedIO):
+    """
+    Scripted player that times each game menu action
+
+    Args:
+        name: Character name
+        character_class: Character class
+        plan: List of (action, menu_choice, answers) for the game menu
+    """
+
+    def __init__(self, name, character_class, plan, clock=time.perf_counter):
+        super().__init__([name, character_class], keep_output=False)
+        self.plan = deque(plan)
+        self.battle_choice = BATTLE_CHOICES.get(character_class, '1')
+        self.clock = clock
+        self.timings = []
+        self.action = 'new_game'
+        self.started = clock()
+        self.died = False
+
+    def _send(self, text):
+        super()._send(text)
+        if 'YOU HAVE DIED' in text:
+            self.died = True
+
+    def _receive(self, prompt):
+        if prompt.startswith(GAME_MENU_PROMPT):
+            self.finish()
+            # Drop answers the last action didn't need
+            self.answers.clear()
+            if self.plan:
+                self.action, choice, answers = self.plan.popleft()
+            else:
+                self.action, choice, answers = 'save', '6', []
+            self.answers.extend(answers)
+            self.started = self.clock()
+            return choice
+
+        if 'press enter' in prompt:
+            return ''
+        if prompt == '> ':
+            return self.battle_choice
+        if self.answers:
+            return str(self.answers.popleft())
+        return BACK_ANSWERS.get(prompt.strip(), '')
+
+    def finish(self):
+        """Record the time spent on the current action"""
+        if self.action is not None:
+            self.timings.append((self.action, self.clock() - self.started))
+            self.action = None
+
+
+def build_plan(rng, items):
+    """
+    Build a player's game menu plan
+
+    Returns: List of (action, menu_choice, answers)
+    """
+    # The shop lists its stock a page at a time, grouped by item type
+    item_ids = list(shop_system.default_stock(items))
+    position = item_ids.index('health_potion') if 'health_potion' in item_ids else 0
+    page, row = divmod(position, shop_system.PAGE_SIZE)
+
+    plan = [('shop', '5', ['1'] + ['n'] * page + [str(row + 1), '3'])]
+    plan += [('explore', '4', [])] * rng.randint(1, 3)
+    plan.append(('quests', '3', ['4', '1', '6', '1', '7']))
+    plan.append(('stats', '1', []))
+    plan.append(('save', '6', []))
+    return plan
+
+
+def run_player(index, seed, save_directory, quests, items):
+    """
+    Play one full game
+
+    Returns: Dictionary with 'timings' [(action, seconds)], 'died' and
+             'output_bytes'
+    """
+    rng = random.Random(seed * 1_000_003 + index)
+    name = f"loadtest{index:05d}"
+    character_class = rng.choice(CLASSES)
+
+    bot = PlayerBot(name, character_class, build_plan(rng, items))
+    session = main.GameSession(quests=quests, items=items, rng=rng, io=bot, save_directory=save_directory)
+    main.new_game(session)
+    bot.finish()
+
+    return {'timings': bot.timings, 'died': bot.died, 'output_bytes': bot.bytes_written}
+
+
+def _run_player_measured(args):
+    """Process pool entry point: run a player and measure this process's I/O"""
+    before = read_process_io()
+    result = run_player(*args)
+    after = read_process_io()
+    result['io'] = io_delta(before, after)
+    return result
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def read_process_io():
+    """
+    Read this process's I/O counters from /proc/self/io (Linux only)
+
+    Returns: {'read_bytes': int, 'write_bytes': int} or None if unavailable
+    """
+    try:
+        with open('/proc/self/io', 'r') as file:
+            fields = dict(line.split(':', 1) for line in file if ':' in line)
+        return {'read_bytes': int(fields['rchar']), 'write_bytes': int(fields['wchar'])}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def io_delta(before, after):
+    """Difference between two read_process_io() results, or None"""
+    if before is None or after is None:
+        return None
+    return {key: after[key] - before[key] for key in before}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (0 if empty)"""
+    if not sorted_values:
+        return 0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def directory_usage(path):
+    """Returns: (file count, total bytes) for the files directly in path"""
+    count = total = 0
+    for entry in os.scandir(path):
+        if entry.is_file():
+            count += 1
+            total += entry.stat().st_size
+    return count, total
+
+# ============================================================================
+# LOAD TEST
+# ============================================================================
+
+def run_load_test(players=DEFAULT_PLAYERS, workers=DEFAULT_WORKERS, seed=0,
+                  save_directory=None, processes=False, quests=None, items=None):
+    """
+    Run players concurrently and summarize the results
+
+    Args:
+        players: Number of simulated players
+        workers: Threads (or processes) playing at once
+        seed: Base seed; the same seed replays the same games
+        save_directory: Where saves go (a temporary directory if None)
+        processes: Use a process pool instead of threads
+        quests, items: Catalogs (loaded from data/ if not given)
+
+    Returns: Report dictionary (see format_report)
+    """
+    if quests is None:
+        quests = game_data.load_quests()
+    if items is None:
+        items = game_data.load_items()
+
+    if save_directory is None:
+        with tempfile.TemporaryDirectory() as temp_directory:
+            return run_load_test(players, workers, seed, temp_directory, processes, quests, items)
+
+    tasks = [(index, seed, save_directory, quests, items) for index in range(players)]
+
+    io_before = read_process_io()
+    start = time.perf_counter()
+    if processes:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_player_measured, tasks))
+    else:
+        main.load_lazy_modules()  # lazy loading isn't thread-safe
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda task: run_player(*task), tasks))
+    elapsed = time.perf_counter() - start
+
+    if processes:
+        deltas = [result['io'] for result in results]
+        io = None if None in deltas else {
+            key: sum(delta[key] for delta in deltas) for key in ('read_bytes', 'write_bytes')
+        }
+    else:
+        io = io_delta(io_before, read_process_io())
+
+    latencies = defaultdict(list)
+    for result in results:
+        for action, seconds in result['timings']:
+            latencies[action].append(seconds)
+
+    actions = {}
+    for action, values in latencies.items():
+        values.sort()
+        actions[action] = {
+            'count': len(values),
+            'p50_ms': percentile(values, 50) * 1000,
+            'p99_ms': percentile(values, 99) * 1000,
+        }
+
+    save_files, save_bytes = directory_usage(save_directory)
+    total_actions = sum(action['count'] for action in actions.values())
+
+    return {
+        'players': players,
+        'workers': workers,
+        'mode': 'processes' if processes else 'threads',
+        'elapsed': elapsed,
+        'sessions_per_second': players / elapsed if elapsed else 0.0,
+        'actions_per_second': total_actions / elapsed if elapsed else 0.0,
+        'deaths': sum(1 for result in results if result['died']),
+        'actions': actions,
+        'io': io,
+        'save_files': save_files,
+        'save_bytes': save_bytes,
+        'output_bytes': sum(result['output_bytes'] for result in results),
+    }
+
+
+def format_report(report):
+    """Returns: List of text lines describing a load test report"""
+    lines = [
+        f"players: {report['players']} ({report['workers']} {report['mode']})",
+        f"elapsed: {report['elapsed']:.3f}s",
+        f"throughput: {report['sessions_per_second']:.1f} sessions/s, "
+        f"{report['actions_per_second']:.1f} actions/s",
+        f"deaths: {report['deaths']}",
+        "",
+        f"{'action':<10} {'count':>7} {'p50 ms':>9} {'p99 ms':>9}",
+    ]
+    for action, stats in sorted(report['actions'].items()):
+        lines.append(f"{action:<10} {stats['count']:>7} {stats['p50_ms']:>9.3f} {stats['p99_ms']:>9.3f}")
+
+    lines.append("")
+    if report['io'] is not None:
+        lines.append(f"save I/O: {report['io']['write_bytes']} bytes written, "
+                     f"{report['io']['read_bytes']} bytes read")
+    lines.append(f"save files: {report['save_files']} ({report['save_bytes']} bytes on disk)")
+    lines.append(f"screen output: {report['output_bytes']} bytes")
+    return lines
+
+
+def main_cli(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Quest Chronicles load test")
+    parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save-dir", default=None, help="keep saves here instead of a temporary directory")
+    parser.add_argument("--processes", action="store_true", help="use processes instead of threads")
+    args = parser.parse_args(argv)
+
+    if args.save_dir is not None:
+        os.makedirs(args.save_dir, exist_ok=True)
+
+    report = run_load_test(args.players, args.workers, args.seed, args.save_dir, args.processes)
+    for line in format_report(report):
+        print(line)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,229 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Loot System Module
+
+Item drops for defeated enemies. Each enemy type has loot tables for
+level bands; a table says how many times to roll, how likely a roll is
+to drop nothing, and which items can drop as LootRules (an item type
+and cost band, with a weight shared by every catalog item that matches).
+Rules are resolved through the item catalog's index, so tables work with
+any catalog.
+
+When the tables load, each one is turned into an alias table (Vose's
+alias method), so every roll costs one random number and two list
+lookups no matter how many items the table holds.
+"""
+
+import random
+from collections import Counter, namedtuple
+
+import game_data
+import inventory_system
+from custom_exceptions import InventoryFullError, InvalidTargetError
+
+# Items of item_type costing min_cost..max_cost (None = no bound), sharing weight
+LootRule = namedtuple('LootRule', ['weight', 'item_type', 'min_cost', 'max_cost'], defaults=(None, None))
+
+# Loot for one level band: rolls per kill, weight of dropping nothing, rules
+LootBand = namedtuple('LootBand', ['min_level', 'rolls', 'nothing', 'rules'])
+
+# Enemy type -> level bands (a band applies from its min_level up to the next band)
+DEFAULT_LOOT_TABLES = {
+    'goblin': [
+        LootBand(1, 1, 60, [LootRule(30, 'consumable', max_cost=30), LootRule(10, 'weapon', max_cost=100)]),
+        LootBand(3, 1, 50, [LootRule(35, 'consumable', max_cost=75), LootRule(10, 'weapon', max_cost=150),
+                            LootRule(5, 'armor', max_cost=100)]),
+    ],
+    'orc': [
+        LootBand(1, 1, 45, [LootRule(35, 'consumable', max_cost=75), LootRule(10, 'weapon', max_cost=200),
+                            LootRule(10, 'armor', max_cost=150)]),
+        LootBand(5, 2, 45, [LootRule(30, 'consumable'), LootRule(15, 'weapon'), LootRule(10, 'armor')]),
+    ],
+    'dragon': [
+        LootBand(1, 2, 30, [LootRule(30, 'consumable', min_cost=50), LootRule(20, 'weapon', min_cost=150),
+                            LootRule(15, 'armor', min_cost=150), LootRule(5, 'accessory')]),
+    ],
+}
+
+# ============================================================================
+# ALIAS METHOD
+# ============================================================================
+
+class AliasTable:
+    """
+    Constant-time sampling from a weighted list (Vose's alias method)
+
+    Built in O(n): every column i holds probability prob[i] of returning
+    i and otherwise returns alias[i].
+
+    Args:
+        weights: Non-negative weights, at least one above zero
+
+    Raises: ValueError for an empty list, a negative weight or all zeros
+    """
+
+    def __init__(self, weights):
+        weights = list(weights)
+        total = sum(weights)
+        if not weights or total <= 0 or min(weights) < 0:
+            raise ValueError('weights must be non-negative with a positive total')
+
+        n = len(weights)
+        scaled = [weight * n / total for weight in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self.prob[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+        # Whatever is left is 1.0 up to rounding error
+
+    def __len__(self):
+        return len(self.prob)
+
+    def sample(self, rng=random):
+        """Returns: One index, chosen with probability weight / total"""
+        column = rng.random() * len(self.prob)
+        i = int(column)
+        return i if column - i < self.prob[i] else self.alias[i]
+
+    def sample_many(self, count, rng=random):
+        """Returns: List of count indexes (for simulations)"""
+        prob, alias, n, uniform = self.prob, self.alias, len(self.prob), rng.random
+        result = []
+        for _ in range(count):
+            column = uniform() * n
+            i = int(column)
+            result.append(i if column - i < prob[i] else alias[i])
+        return result
+
+# ============================================================================
+# LOOT TABLES
+# ============================================================================
+
+class LootTable:
+    """
+    One band's drops, ready to roll
+
+    Attributes:
+        rolls: Rolls per kill
+        outcomes: Item ID (or None for nothing) per alias table index
+        chances: {outcome: probability of one roll giving it}
+    """
+
+    def __init__(self, band, items):
+        index = game_data.item_index(items)
+        outcomes = [None] if band.nothing else []
+        weights = [band.nothing] if band.nothing else []
+        for rule in band.rules:
+            matches = index.query(item_type=rule.item_type, min_cost=rule.min_cost, max_cost=rule.max_cost)
+            for item_id in matches:
+                outcomes.append(item_id)
+                weights.append(rule.weight / len(matches))
+
+        self.rolls = band.rolls
+        self.outcomes = outcomes
+        self.alias = AliasTable(weights)
+        total = sum(weights)
+        self.chances = Counter()
+        for outcome, weight in zip(outcomes, weights):
+            self.chances[outcome] += weight / total
+
+    def roll(self, rng=random):
+        """Returns: List of dropped item IDs for one kill (may be empty)"""
+        drops = []
+        for _ in range(self.rolls):
+            outcome = self.outcomes[self.alias.sample(rng)]
+            if outcome is not None:
+                drops.append(outcome)
+        return drops
+
+    def roll_many(self, kills, rng=random):
+        """Returns: Counter of item IDs dropped over many kills"""
+        outcomes = self.outcomes
+        drops = Counter(outcomes[i] for i in self.alias.sample_many(kills * self.rolls, rng))
+        del drops[None]
+        return drops
+
+
+class LootTables:
+    """
+    Every enemy's loot tables, built from an item catalog
+
+    Args:
+        items: Item catalog {item_id: item_data}
+        tables: {enemy_type: [LootBand, ...]} (default DEFAULT_LOOT_TABLES)
+
+    Raises: ValueError if a band has no positive weight
+    """
+
+    def __init__(self, items, tables=None):
+        tables = DEFAULT_LOOT_TABLES if tables is None else tables
+        self.bands = {
+            enemy_type: sorted(((band.min_level, LootTable(band, items)) for band in bands),
+                               key=lambda entry: entry[0])
+            for enemy_type, bands in tables.items()
+        }
+
+    def table_for(self, enemy_type, level=1):
+        """
+        Get the table for an enemy type at a level
+
+        Returns: LootTable, or None if the enemy type (or level) has no loot
+        """
+        table = None
+        for min_level, band_table in self.bands.get(enemy_type.lower(), ()):
+            if level < min_level:
+                break
+            table = band_table
+        return table
+
+    def roll(self, enemy, rng=random):
+        """
+        Roll an enemy's drops
+
+        Args:
+            enemy: Enemy dictionary from combat_system.create_enemy
+
+        Returns: List of item IDs
+        """
+        table = self.table_for(enemy.get('type', enemy['name']), enemy.get('level', 1))
+        return table.roll(rng) if table else []
+
+    def simulate(self, enemy_type, level, kills, rng=random):
+        """
+        Drops from many kills at once
+
+        Returns: Counter of item IDs
+        Raises: InvalidTargetError if the enemy type has no loot at level
+        """
+        table = self.table_for(enemy_type, level)
+        if table is None:
+            raise InvalidTargetError(f'no loot table for {enemy_type} at level {level}')
+        return table.roll_many(kills, rng)
+
+# ============================================================================
+# AWARDING DROPS
+# ============================================================================
+
+def award_loot(character, item_ids):
+    """
+    Put dropped items in the character's inventory
+
+    Each item goes through add_item_to_inventory's capacity check; once
+    the inventory is full the rest are left behind.
+
+    Returns: (list of item IDs added, list of item IDs left behind)
+    """
+    added = []
+    for position, item_id in enumerate(item_ids):
+        try:
+            inventory_system.add_item_to_inventory(character, item_id)
+        except InventoryFullError:
+            return added, list(item_ids[position:])
+        added.append(item_id)
+    return added, []
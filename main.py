@@ -16,30 +16,151 @@ This is the main game file that ties all modules together.
 Demonstrates module integration and complete game flow.
 """
 
-# Import all our custom modules
-import character_manager
-import inventory_system
-import quest_handler
-import combat_system
-import game_data
-from custom_exceptions import *
+import importlib.util
+import os
 import random
+import sys
+
+from game_io import ConsoleIO
+from custom_exceptions import *
+import metrics
+
+# ============================================================================
+# LAZY IMPORTS
+# ============================================================================
+
+# Budget for `python -X importtime -c "import main"` (cumulative, in ms);
+# checked by import_budget.py
+IMPORT_BUDGET_MS = 30
+
+
+def lazy_import(name):
+    """
+    Import a module on first attribute access
+    
+    The game subsystems below are only loaded once a menu actually uses
+    them, so startup (and short runs like listing saves) doesn't pay for
+    all of them.
+    
+    importlib's LazyLoader isn't thread-safe before Python 3.12: two
+    threads touching a lazy module for the first time can both run it.
+    Call load_lazy_modules() before starting threads that use the game.
+    
+    Returns: The module (already imported, or a lazy module)
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# Import all our custom modules
+character_manager = lazy_import("character_manager")
+inventory_system = lazy_import("inventory_system")
+quest_handler = lazy_import("quest_handler")
+combat_system = lazy_import("combat_system")
+game_data = lazy_import("game_data")
+shop_system = lazy_import("shop_system")
+loot_system = lazy_import("loot_system")
+
+LAZY_MODULES = (character_manager, inventory_system, quest_handler, combat_system,
+                game_data, shop_system, loot_system)
+
+
+def load_lazy_modules():
+    """Finish loading every lazily imported subsystem (before starting threads)"""
+    for module in LAZY_MODULES:
+        module.__name__  # any attribute access runs a lazy module
 
 # ============================================================================
 # GAME STATE
 # ============================================================================
 
-# Global variables for game data
-current_character = None
-all_quests = {}
-all_items = {}
-game_running = False
+class GameSession:
+    """
+    Everything one running game needs
+    
+    Holds the character, the quest/item catalogs, the random number
+    generator and the I/O adapter, so menu functions don't need module
+    globals and several games can run in one interpreter.
+    
+    Menus call session.output(text) and session.input(prompt), which go
+    to the adapter's write() and read().
+    
+    The quest and item catalogs are loaded the first time session.quests
+    or session.items is read, not at startup.
+    """
+
+    def __init__(self, quests=None, items=None, rng=None, io=None, save_directory="data/save_games"):
+        """
+        Initialize a session
+        
+        Args:
+            quests, items: Shared catalogs (loaded on first use if not given)
+            rng: random.Random used for exploration (seed it for replays)
+            io: game_io adapter (default ConsoleIO)
+            save_directory: Where this session's saves go
+        """
+        self.character = None
+        self._quests = quests
+        self._items = items
+        self.rng = rng if rng is not None else random.Random()
+        self.io = io if io is not None else ConsoleIO()
+        self.input = self.io.read
+        self.output = self.io.write
+        self.save_directory = save_directory
+        self.running = False
+        self._shop = None
+        self._loot = None
+
+    @property
+    def quests(self):
+        """Quest catalog (loaded on first access)"""
+        if self._quests is None:
+            load_game_data(self)
+        return self._quests
+
+    @quests.setter
+    def quests(self, quests):
+        self._quests = quests
+
+    @property
+    def items(self):
+        """Item catalog (loaded on first access)"""
+        if self._items is None:
+            load_game_data(self)
+        return self._items
+
+    @items.setter
+    def items(self, items):
+        self._items = items
+        self._shop = None
+        self._loot = None
+
+    @property
+    def shop(self):
+        """The session's shop, stocked from the item catalog on first access"""
+        if self._shop is None:
+            self._shop = shop_system.Shop(self.items)
+        return self._shop
+
+    @property
+    def loot(self):
+        """Enemy loot tables for the item catalog, built on first access"""
+        if self._loot is None:
+            self._loot = loot_system.LootTables(self.items)
+        return self._loot
 
 # ============================================================================
 # MAIN MENU
 # ============================================================================
 
-def main_menu():
+def main_menu(session):
     """
     Display main menu and get player choice
     
@@ -51,17 +172,17 @@ def main_menu():
     Returns: Integer choice (1-3)
     """
     while True:
-        print('\n--- MAIN MENU ---')
-        print('1. New Game')
-        print('2. Load Game')
-        print('3. Exit')
-        choice = input('Enter choice (1-3): ').strip()
+        session.output('\n--- MAIN MENU ---')
+        session.output('1. New Game')
+        session.output('2. Load Game')
+        session.output('3. Exit')
+        choice = session.input('Enter choice (1-3): ').strip()
         if choice in ('1', '2', '3'):
             return int(choice)
-        print('invalid input, please enter 1, 2, or 3')
+        session.output('invalid input, please enter 1, 2, or 3')
 
 
-def new_game():
+def new_game(session):
     """
     Start a new game
     
@@ -71,64 +192,62 @@ def new_game():
     
     Creates character and starts game loop
     """
-    global current_character
-    
-    print('\n--- NEW GAME ---')
-    name = input('Enter your character name: ').strip()
-    print('available classes: Warrior, Mage, Rogue, Cleric')
-    char_class = input('choose your class: ').strip().capitalize()
+    session.output('\n--- NEW GAME ---')
+    name = session.input('Enter your character name: ').strip()
+    session.output('available classes: Warrior, Mage, Rogue, Cleric')
+    char_class = session.input('choose your class: ').strip().capitalize()
 
     try:
         # Create character
-        current_character = character_manager.create_character(name, char_class)
-        print(f'character "{name}" the {char_class} created successfully')
+        session.character = character_manager.create_character(name, char_class)
+        session.output(f'character "{name}" the {char_class} created successfully')
         
         # Give starting items
-        starter_items = ["Health Potion", "Rusty Sword"]
-        for item_name in starter_items:
-            if item_name in all_items:
+        starter_items = ["health_potion", "rusty_sword"]
+        for item_id in starter_items:
+            if item_id in session.items:
                 try:
-                    inventory_system.add_item(current_character, all_items[item_name])
-                    print(f'received: {item_name}')
+                    inventory_system.add_item_to_inventory(session.character, item_id)
+                    session.output(f'received: {session.items[item_id]["name"]}')
                 except InventoryFullError:
                     pass
 
         # Save and start game
-        save_game()
-        game_loop()
+        save_game(session)
+        character_manager.enable_journal(session.character, session.save_directory)
+        game_loop(session)
     except InvalidCharacterClassError as e:
-        print(f'Error: {e}')
+        metrics.count_exception(e)
+        session.output(f'Error: {e}')
         return
 
 
-def load_game():
+def load_game(session):
     """
     Load an existing saved game
     
     Shows list of saved characters
     Prompts user to select one
     """
-    global current_character
-    
-    print('\n--- LOAD GAME ---')
+    session.output('\n--- LOAD GAME ---')
     
     # Get list of saved characters
-    saved_characters = character_manager.list_saved_characters()
+    saved_characters = character_manager.list_saved_characters(session.save_directory)
 
     if not saved_characters:
-        print('no saved games found')
-        input('press enter to continue...')
+        session.output('no saved games found')
+        session.input('press enter to continue...')
         return
 
     # Display saved characters
-    print('saved characters:')
+    session.output('saved characters:')
     for i, char_name in enumerate(saved_characters, 1):
-        print(f'{i}. {char_name}')
-    print(f'{len(saved_characters) + 1}. back')
+        session.output(f'{i}. {char_name}')
+    session.output(f'{len(saved_characters) + 1}. back')
 
     # Get user choice
     while True:
-        choice = input(f'select character (1-{len(saved_characters) + 1}): ').strip()
+        choice = session.input(f'select character (1-{len(saved_characters) + 1}): ').strip()
         if choice.isdigit():
             choice_num = int(choice)
             if choice_num == len(saved_characters) + 1:
@@ -136,60 +255,69 @@ def load_game():
             if 1 <= choice_num <= len(saved_characters):
                 char_name = saved_characters[choice_num - 1]
                 break
-        print(f'please enter a number between 1 and {len(saved_characters) + 1}')
+        session.output(f'please enter a number between 1 and {len(saved_characters) + 1}')
 
     try:
         # Load character
-        current_character = character_manager.load_character(char_name)
-        print(f'character "{char_name}" loaded successfully')
-        input('press enter to continue...')
-        game_loop()
+        session.character = character_manager.load_character(char_name, session.save_directory)
+        inventory_system.apply_equipment_bonuses(session.character, session.items)
+        character_manager.enable_journal(session.character, session.save_directory)
+        session.output(f'character "{char_name}" loaded successfully')
+        session.input('press enter to continue...')
+        game_loop(session)
     except CharacterNotFoundError as e:
-        print(f'Error: {e}')
-        input('press enter to continue...')
+        metrics.count_exception(e)
+        session.output(f'Error: {e}')
+        session.input('press enter to continue...')
     except SaveFileCorruptedError as e:
-        print(f'Error: {e}')
-        print('save file may be corrupted')
-        input('press enter to continue...')
+        metrics.count_exception(e)
+        session.output(f'Error: {e}')
+        session.output('save file may be corrupted')
+        session.input('press enter to continue...')
 
 
 # ============================================================================
 # GAME LOOP
 # ============================================================================
 
-def game_loop():
+def game_loop(session):
     """
     Main game loop - shows game menu and processes actions
     """
-    global game_running, current_character
-    
-    game_running = True
+    session.running = True
+    metrics.SESSIONS.inc(label='menu')
     
-    while game_running:
-        choice = game_menu()
-        
-        if choice == 1:
-            view_character_stats()
-        elif choice == 2:
-            view_inventory()
-        elif choice == 3:
-            quest_menu()
-        elif choice == 4:
-            explore()
-        elif choice == 5:
-            shop()
-        elif choice == 6:
-            save_game()
-            print('\ngame saved!')
-            print('thanks for playing!')
-            game_running = False
-
-        # Auto save after each action except save and quit
-        if game_running and choice != 6:
-            save_game()
-
-
-def game_menu():
+    try:
+        while session.running:
+            choice = game_menu(session)
+            
+            if choice == 1:
+                view_character_stats(session)
+            elif choice == 2:
+                view_inventory(session)
+            elif choice == 3:
+                quest_menu(session)
+            elif choice == 4:
+                explore(session)
+            elif choice == 5:
+                shop(session)
+            elif choice == 6:
+                save_game(session)
+                session.output('\ngame saved!')
+                session.output('thanks for playing!')
+                session.running = False
+
+            # Auto save after each action except save and quit
+            # (journaled characters already recorded each change as it happened)
+            if session.running and choice != 6 and getattr(session.character, 'journal', None) is None:
+                save_game(session)
+    finally:
+        # Quit, game over or an error: fold the journal in and close its file
+        if session.character is not None:
+            character_manager.disable_journal(session.character)
+
+
+def game_menu(session):
     """
     Display game menu and get player choice
     
@@ -203,516 +331,561 @@ def game_menu():
     
     Returns: Integer choice (1-6)
     """
-    print('\n' + '=' * 50)
-    print(f'GAME MENU - {current_character["name"]} the {current_character["class"]}')
-    print('=' * 50)
+    session.output('\n' + '=' * 50)
+    session.output(f'GAME MENU - {session.character["name"]} the {session.character["class"]}')
+    session.output('=' * 50)
     # FIXED: changed 'current_health' to 'health'
-    print(f'level {current_character["level"]} | HP: {current_character["health"]}/{current_character["max_health"]} | gold: {current_character["gold"]}')
-    print('=' * 50)
-    print('1. view character stats')
-    print('2. view inventory')
-    print('3. quest menu')
-    print('4. explore (find battles)')
-    print('5. shop')
-    print('6. save and quit')
-    print('=' * 50)
+    session.output(f'level {session.character["level"]} | HP: {session.character["health"]}/{session.character["max_health"]} | gold: {session.character["gold"]}')
+    session.output('=' * 50)
+    session.output('1. view character stats')
+    session.output('2. view inventory')
+    session.output('3. quest menu')
+    session.output('4. explore (find battles)')
+    session.output('5. shop')
+    session.output('6. save and quit')
+    session.output('=' * 50)
 
     while True:
-        choice = input('enter choice (1-6): ').strip()
+        choice = session.input('enter choice (1-6): ').strip()
         if choice in ('1', '2', '3', '4', '5', '6'):
             return int(choice)
-        print('please enter a number between 1 and 6')
+        session.output('please enter a number between 1 and 6')
 
 
 # ============================================================================
 # GAME ACTIONS
 # ============================================================================
 
-def view_character_stats():
+def view_character_stats(session):
     """Display character information"""
-    global current_character
-    
-    print('\n' + '=' * 50)
-    print('CHARACTER STATS')
-    print('=' * 50)
+    session.output('\n' + '=' * 50)
+    session.output('CHARACTER STATS')
+    session.output('=' * 50)
 
     # Basic info
-    print(f'\nname: {current_character["name"]}')
-    print(f'class: {current_character["class"]}')
-    print(f'level: {current_character["level"]}')
+    session.output(f'\nname: {session.character["name"]}')
+    session.output(f'class: {session.character["class"]}')
+    session.output(f'level: {session.character["level"]}')
     # FIXED: Added function to calculate XP needed
-    xp_needed = current_character["level"] * 100
-    print(f'experience: {current_character["experience"]}/{xp_needed}')
+    xp_needed = session.character["level"] * 100
+    session.output(f'experience: {session.character["experience"]}/{xp_needed}')
 
     # Health and stats (FIXED: removed non-existent fields)
-    print(f'\nhealth: {current_character["health"]}/{current_character["max_health"]}')
-    print(f'strength: {current_character["strength"]}')
-    print(f'magic: {current_character["magic"]}')
+    session.output(f'\nhealth: {session.character["health"]}/{session.character["max_health"]}')
+    session.output(f'strength: {session.character["strength"]}')
+    session.output(f'magic: {session.character["magic"]}')
 
     # Resources
-    print(f'\ngold: {current_character["gold"]}')
+    session.output(f'\ngold: {session.character["gold"]}')
 
-    # Equipment (simplified - these may not exist yet)
-    print('\nequipment:')
-    weapon = current_character.get('equipped_weapon')
-    armor = current_character.get('equipped_armor')
-    print(f'  weapon: {weapon["name"] if weapon else "none"}')
-    print(f'  armor: {armor["name"] if armor else "none"}')
+    # Equipment, one line per slot
+    session.output('\nequipment:')
+    equipment = session.character.get('equipment') or {}
+    for slot in game_data.EQUIPMENT_SLOTS:
+        item_id = equipment.get(slot)
+        name = session.items.get(item_id, {}).get('name', item_id) if item_id else 'none'
+        session.output(f'  {slot.replace("_", " ")}: {name}')
 
     # Quest progress
-    active = quest_handler.get_active_quests(current_character, all_quests)
-    completed = quest_handler.get_completed_quests(current_character, all_quests)
-    print(f'\nquests: {len(active)} active, {len(completed)} completed')
+    active = quest_handler.get_active_quests(session.character, session.quests)
+    completed = quest_handler.get_completed_quests(session.character, session.quests)
+    session.output(f'\nquests: {len(active)} active, {len(completed)} completed')
 
-    input('\npress enter to continue...')
+    session.input('\npress enter to continue...')
 
 
-def view_inventory():
+def view_inventory(session):
     """Display and manage inventory"""
-    global current_character, all_items
-    
     while True:
-        print('\n' + '=' * 50)
-        print('INVENTORY')
-        print('=' * 50)
+        session.output('\n' + '=' * 50)
+        session.output('INVENTORY')
+        session.output('=' * 50)
         
-        inventory = current_character.get('inventory', [])
+        inventory = session.character.get('inventory', [])
+        equipment = session.character.get('equipment') or {}
 
-        if not inventory:
-            print('\nyour inventory is empty')
-            input('\npress enter to go back...')
+        if not inventory and not equipment:
+            session.output('\nyour inventory is empty')
+            session.input('\npress enter to go back...')
             return
         
-        # Display inventory
-        print(f'\ncapacity: {len(inventory)}/{current_character.get("inventory_capacity", 20)}')
-        print('\nitems:')
-        for i, item in enumerate(inventory, 1):
-            print(f'{i}. {item["name"]} - {item["type"]} - {item.get("description", "no description")}')
-        
-        print(f'\n{len(inventory) + 1}. back')
+        # Display inventory (entries are item IDs)
+        session.output(f'\ncapacity: {len(inventory)}/{inventory_system.MAX_INVENTORY_SIZE}')
+        session.output('\nitems:')
+        for i, item_id in enumerate(inventory, 1):
+            item = session.items.get(item_id, {})
+            session.output(f'{i}. {item.get("name", item_id)} - {item.get("type", "unknown")} - '
+                           f'{item.get("description", "no description")}')
+
+        # Equipped items can be picked too, to unequip them
+        slots = list(equipment)
+        for i, slot in enumerate(slots, len(inventory) + 1):
+            item_id = equipment[slot]
+            session.output(f'{i}. {session.items.get(item_id, {}).get("name", item_id)} (equipped: {slot})')
+
+        back = len(inventory) + len(slots) + 1
+        session.output(f'\n{back}. back')
 
         # Get choice
-        choice = input(f'\nselect item to use/equip (1-{len(inventory) + 1}): ').strip()
+        choice = session.input(f'\nselect item to use/equip (1-{back}): ').strip()
         if choice.isdigit():
             choice_num = int(choice)
-            if choice_num == len(inventory) + 1:
+            if choice_num == back:
                 return
             if 1 <= choice_num <= len(inventory):
-                item = inventory[choice_num - 1]
-                use_item_menu(item)
+                use_item_menu(session, inventory[choice_num - 1])
+            elif len(inventory) < choice_num < back:
+                unequip_menu(session, slots[choice_num - len(inventory) - 1])
             else:
-                print(f'please enter a number between 1 and {len(inventory) + 1}')
+                session.output(f'please enter a number between 1 and {back}')
         else:
-            print('invalid input')
+            session.output('invalid input')
 
 
-def use_item_menu(item):
+def use_item_menu(session, item_id):
     """Menu for using/equipping an item"""
-    global current_character
-    
-    print(f'\n--- {item["name"]} ---')
-    print(f'type: {item["type"]}')
-    print(f'description: {item.get("description", "no description")}')
+    item = session.items.get(item_id, {'name': item_id, 'type': 'unknown'})
+    session.output(f'\n--- {item["name"]} ---')
+    session.output(f'type: {item["type"]}')
+    session.output(f'description: {item.get("description", "no description")}')
     
     if item['type'] == 'consumable':
-        print('\n1. use')
-        print('2. drop')
-        print('3. back')
+        session.output('\n1. use')
+        session.output('2. drop')
+        session.output('3. back')
         
-        choice = input('\nchoice: ').strip()
+        choice = session.input('\nchoice: ').strip()
         if choice == '1':
             try:
-                inventory_system.use_item(current_character, item)
-                print(f'used {item["name"]}!')
-            except ItemNotUsableError as e:
-                print(f'error: {e}')
+                session.output(inventory_system.use_item(session.character, item_id, item))
+            except (ItemNotFoundError, InvalidItemTypeError) as e:
+                metrics.count_exception(e)
+                session.output(f'error: {e}')
         elif choice == '2':
-            inventory_system.remove_item(current_character, item)
-            print(f'dropped {item["name"]}')
+            inventory_system.remove_item_from_inventory(session.character, item_id)
+            session.output(f'dropped {item["name"]}')
     
-    elif item['type'] in ['weapon', 'armor']:
-        print('\n1. equip')
-        print('2. drop')
-        print('3. back')
+    elif game_data.item_slot_choices(item):
+        session.output('\n1. equip')
+        session.output('2. drop')
+        session.output('3. back')
         
-        choice = input('\nchoice: ').strip()
+        choice = session.input('\nchoice: ').strip()
         if choice == '1':
             try:
-                inventory_system.equip_item(current_character, item)
-                print(f'equipped {item["name"]}!')
-            except ItemNotEquippableError as e:
-                print(f'error: {e}')
+                session.output(inventory_system.equip_item(session.character, item_id, item))
+            except (ItemNotFoundError, InvalidItemTypeError, InventoryFullError) as e:
+                metrics.count_exception(e)
+                session.output(f'error: {e}')
         elif choice == '2':
-            inventory_system.remove_item(current_character, item)
-            print(f'dropped {item["name"]}')
+            inventory_system.remove_item_from_inventory(session.character, item_id)
+            session.output(f'dropped {item["name"]}')
+
+    else:
+        session.output('\n1. drop')
+        session.output('2. back')
+        if session.input('\nchoice: ').strip() == '1':
+            inventory_system.remove_item_from_inventory(session.character, item_id)
+            session.output(f'dropped {item["name"]}')
+
+
+def unequip_menu(session, slot):
+    """Menu for an equipped item"""
+    item_id = session.character['equipment'][slot]
+    name = session.items.get(item_id, {}).get('name', item_id)
+    session.output(f'\n--- {name} ({slot}) ---')
+    session.output('\n1. unequip')
+    session.output('2. back')
+
+    if session.input('\nchoice: ').strip() == '1':
+        try:
+            inventory_system.unequip_slot(session.character, slot)
+            session.output(f'unequipped {name}')
+        except InventoryFullError as e:
+            metrics.count_exception(e)
+            session.output(f'error: {e}')
 
 
-def quest_menu():
+def quest_menu(session):
     """Quest management menu"""
-    global current_character, all_quests
-    
     while True:
-        print('\n' + '=' * 50)
-        print('QUEST MENU')
-        print('=' * 50)
-        print('1. view active quests')
-        print('2. view available quests')
-        print('3. view completed quests')
-        print('4. accept quest')
-        print('5. abandon quest')
-        print('6. complete quest (for testing)')
-        print('7. back')
+        session.output('\n' + '=' * 50)
+        session.output('QUEST MENU')
+        session.output('=' * 50)
+        session.output('1. view active quests')
+        session.output('2. view available quests')
+        session.output('3. view completed quests')
+        session.output('4. accept quest')
+        session.output('5. abandon quest')
+        session.output('6. complete quest (for testing)')
+        session.output('7. back')
         
-        choice = input('\nchoice (1-7): ').strip()
+        choice = session.input('\nchoice (1-7): ').strip()
 
         if choice == '1':
-            view_active_quests()
+            view_active_quests(session)
         elif choice == '2':
-            view_available_quests()
+            view_available_quests(session)
         elif choice == '3':
-            view_completed_quests()
+            view_completed_quests(session)
         elif choice == '4':
-            accept_quest_menu()
+            accept_quest_menu(session)
         elif choice == '5':
-            abandon_quest_menu()
+            abandon_quest_menu(session)
         elif choice == '6':
-            test_complete_quest()
+            test_complete_quest(session)
         elif choice == '7':
             return
         else:
-            print('please enter a number between 1 and 7')
+            session.output('please enter a number between 1 and 7')
 
 
-def view_active_quests():
+def view_active_quests(session):
     """Display active quests"""
-    active = quest_handler.get_active_quests(current_character, all_quests)
+    active = quest_handler.get_active_quests(session.character, session.quests)
     
-    print('\n--- active quests ---')
+    session.output('\n--- active quests ---')
     if not active:
-        print('no active quests')
+        session.output('no active quests')
     else:
         for quest in active:
-            print(f'\n{quest["title"]}')
-            print(f'  {quest["description"]}')
-            print(f'  rewards: XP={quest.get("reward_xp", 0)}, Gold={quest.get("reward_gold", 0)}')
+            session.output(f'\n{quest["title"]}')
+            session.output(f'  {quest["description"]}')
+            session.output(f'  rewards: XP={quest.get("reward_xp", 0)}, Gold={quest.get("reward_gold", 0)}')
     
-    input('\npress enter to continue...')
+    session.input('\npress enter to continue...')
 
 
-def view_available_quests():
+def view_available_quests(session):
     """Display available quests"""
-    print('\n--- available quests ---')
-    available = quest_handler.get_available_quests(current_character, all_quests)
+    session.output('\n--- available quests ---')
+    available = quest_handler.get_available_quests(session.character, session.quests)
     
     if not available:
-        print('no quests available at your level')
+        session.output('no quests available at your level')
     else:
         for quest in available:
-            print(f'\n{quest["title"]} (level {quest["required_level"]})')
-            print(f'  {quest["description"]}')
-            print(f'  rewards: XP={quest.get("reward_xp", 0)}, Gold={quest.get("reward_gold", 0)}')
+            session.output(f'\n{quest["title"]} (level {quest["required_level"]})')
+            session.output(f'  {quest["description"]}')
+            session.output(f'  rewards: XP={quest.get("reward_xp", 0)}, Gold={quest.get("reward_gold", 0)}')
     
-    input('\npress enter to continue...')
+    session.input('\npress enter to continue...')
 
 
-def view_completed_quests():
+def view_completed_quests(session):
     """Display completed quests"""
-    completed = quest_handler.get_completed_quests(current_character, all_quests)
+    completed = quest_handler.get_completed_quests(session.character, session.quests)
     
-    print('\n--- completed quests ---')
+    session.output('\n--- completed quests ---')
     if not completed:
-        print('no completed quests yet')
+        session.output('no completed quests yet')
     else:
         for quest in completed:
-            print(f'✓ {quest["title"]}')
+            session.output(f'✓ {quest["title"]}')
     
-    input('\npress enter to continue...')
+    session.input('\npress enter to continue...')
 
 
-def accept_quest_menu():
+def accept_quest_menu(session):
     """Accept a new quest"""
-    print('\n--- accept quest ---')
+    session.output('\n--- accept quest ---')
     
-    available = quest_handler.get_available_quests(current_character, all_quests)
+    available = quest_handler.get_available_quests(session.character, session.quests)
     
     if not available:
-        print('no quests available')
-        input('press enter to continue...')
+        session.output('no quests available')
+        session.input('press enter to continue...')
         return
     
     for i, quest in enumerate(available, 1):
-        print(f'{i}. {quest["title"]}')
+        session.output(f'{i}. {quest["title"]}')
     
-    choice = input(f'\nselect quest (1-{len(available)}): ').strip()
+    choice = session.input(f'\nselect quest (1-{len(available)}): ').strip()
     if choice.isdigit():
         choice_num = int(choice)
         if 1 <= choice_num <= len(available):
             quest = available[choice_num - 1]
             try:
-                quest_handler.accept_quest(current_character, quest['quest_id'], all_quests)
-                print(f'accepted quest: {quest["title"]}')
-            except (QuestAlreadyActiveError, QuestAlreadyCompletedError, 
-                    InsufficientLevelError, QuestRequirementsNotMetError) as e:
-                print(f'error: {e}')
+                quest_handler.accept_quest(session.character, quest['quest_id'], session.quests)
+                session.output(f'accepted quest: {quest["title"]}')
+            except (QuestAlreadyCompletedError, InsufficientLevelError,
+                    QuestRequirementsNotMetError) as e:
+                metrics.count_exception(e)
+                session.output(f'error: {e}')
         else:
-            print('invalid choice')
+            session.output('invalid choice')
     else:
-        print('invalid input')
+        session.output('invalid input')
     
-    input('\npress enter to continue...')
+    session.input('\npress enter to continue...')
 
 
-def abandon_quest_menu():
+def abandon_quest_menu(session):
     """Abandon an active quest"""
-    active = quest_handler.get_active_quests(current_character, all_quests)
+    active = quest_handler.get_active_quests(session.character, session.quests)
     
     if not active:
-        print('\nno active quests to abandon')
-        input('press enter to continue...')
+        session.output('\nno active quests to abandon')
+        session.input('press enter to continue...')
         return
     
-    print('\n--- abandon quest ---')
+    session.output('\n--- abandon quest ---')
     for i, quest in enumerate(active, 1):
-        print(f'{i}. {quest["title"]}')
+        session.output(f'{i}. {quest["title"]}')
     
-    choice = input(f'\nselect quest to abandon (1-{len(active)}): ').strip()
+    choice = session.input(f'\nselect quest to abandon (1-{len(active)}): ').strip()
     if choice.isdigit():
         choice_num = int(choice)
         if 1 <= choice_num <= len(active):
             quest = active[choice_num - 1]
             try:
-                quest_handler.abandon_quest(current_character, quest['quest_id'])
-                print('abandoned quest')
+                quest_handler.abandon_quest(session.character, quest['quest_id'])
+                session.output('abandoned quest')
             except QuestNotActiveError as e:
-                print(f'error: {e}')
+                metrics.count_exception(e)
+                session.output(f'error: {e}')
         else:
-            print('invalid choice')
+            session.output('invalid choice')
     else:
-        print('invalid input')
+        session.output('invalid input')
     
-    input('\npress enter to continue...')
+    session.input('\npress enter to continue...')
 
 
-def test_complete_quest():
+def test_complete_quest(session):
     """Complete a quest (for testing)"""
-    active = quest_handler.get_active_quests(current_character, all_quests)
+    active = quest_handler.get_active_quests(session.character, session.quests)
     
     if not active:
-        print('\nno active quests')
-        input('press enter to continue...')
+        session.output('\nno active quests')
+        session.input('press enter to continue...')
         return
     
-    print('\n--- complete quest ---')
+    session.output('\n--- complete quest ---')
     for i, quest in enumerate(active, 1):
-        print(f'{i}. {quest["title"]}')
+        session.output(f'{i}. {quest["title"]}')
     
-    choice = input(f'\nselect quest (1-{len(active)}): ').strip()
+    choice = session.input(f'\nselect quest (1-{len(active)}): ').strip()
     if choice.isdigit():
         choice_num = int(choice)
         if 1 <= choice_num <= len(active):
             quest = active[choice_num - 1]
             try:
-                rewards = quest_handler.complete_quest(current_character, quest['quest_id'], all_quests)
-                print('quest completed!')
-                print(f"rewards: XP={rewards.get('xp_gained', 0)}, Gold={rewards.get('gold_gained', 0)}")
+                rewards = quest_handler.complete_quest(session.character, quest['quest_id'], session.quests)
+                session.output('quest completed!')
+                session.output(f"rewards: XP={rewards.get('xp_gained', 0)}, Gold={rewards.get('gold_gained', 0)}")
             except QuestNotActiveError as e:
-                print(f'error: {e}')
+                metrics.count_exception(e)
+                session.output(f'error: {e}')
         else:
-            print('invalid choice')
+            session.output('invalid choice')
     else:
-        print('invalid input')
+        session.output('invalid input')
     
-    input('\npress enter to continue...')
+    session.input('\npress enter to continue...')
 
         
-def explore():
+def explore(session):
     """Find and fight random enemies"""
-    global current_character
-    
-    print('\n' + '=' * 50)
-    print('EXPLORING...')
-    print('=' * 50)
+    session.output('\n' + '=' * 50)
+    session.output('EXPLORING...')
+    session.output('=' * 50)
     
     # Generate enemy
-    level = current_character['level']
-    enemy_level = max(1, level + random.randint(-1, 2))
+    level = session.character['level']
+    enemy_level = max(1, level + session.rng.randint(-1, 2))
     
-    enemy_types = ["goblin", "orc", "wolf", "bandit", "skeleton"]
-    enemy_name = random.choice(enemy_types)
+    enemy = combat_system.get_random_enemy_for_level(enemy_level)
     
-    enemy = combat_system.create_enemy(enemy_name, enemy_level)
-    
-    print(f'\na level {enemy_level} {enemy_name} appears!')
-    input('press enter to fight...')
+    session.output(f'\na level {enemy_level} {enemy["name"]} appears!')
+    session.input('press enter to fight...')
 
     try:
         # Start combat
-        battle = combat_system.SimpleBattle(current_character, enemy)
+        battle = combat_system.SimpleBattle(session.character, enemy, io=session.io, rng=session.rng)
         winner = battle.fight()
         
         if winner == "player":
-            print('\nvictory!')
-            xp_gain = enemy['experience_reward']
+            session.output('\nvictory!')
+            xp_gain = enemy['xp_reward']
             gold_gain = enemy['gold_reward']
             
-            print(f'gained {xp_gain} XP and {gold_gain} gold!')
+            session.output(f'gained {xp_gain} XP and {gold_gain} gold!')
             
-            character_manager.gain_experience(current_character, xp_gain)
-            current_character['gold'] += gold_gain
-
+            character_manager.gain_experience(session.character, xp_gain)
+            character_manager.add_gold(session.character, gold_gain)
+
+            found, left_behind = loot_system.award_loot(session.character, session.loot.roll(enemy, session.rng))
+            for item_id in found:
+                session.output(f'found: {session.items[item_id]["name"]}')
+            for item_id in left_behind:
+                session.output(f'no room for {session.items[item_id]["name"]}, left it behind')
+
+        elif winner == "enemy":
+            session.output('\ndefeat!')
+            handle_character_death(session)
         else:
-            print('\ndefeat!')
-            handle_character_death()
+            session.output('\nyou got away')
     
-    except InsufficientHealthError:
-        print("\nyou're too weak to fight! heal first")
+    except CharacterDeadError as e:
+        metrics.count_exception(e)
+        session.output("\nyou're too weak to fight! heal first")
     except Exception as e:
-        print(f'\nbattle error: {e}')
+        metrics.count_exception(e)
+        session.output(f'\nbattle error: {e}')
     
-    input('\npress enter to continue...')
+    session.input('\npress enter to continue...')
 
 
-def shop():
+def shop(session):
     """Shop menu for buying/selling items"""
-    global current_character, all_items
-    
-    shop_items = {
-        "Health Potion": 50,
-        "Iron Sword": 100,
-        "Steel Armor": 150,
-        "Magic Staff": 200,
-        "Leather Boots": 75
-    }
-    
     while True:
-        print('\n' + '=' * 50)
-        print('SHOP')
-        print('=' * 50)
-        print(f'your gold: {current_character["gold"]}')
-        print('\n1. buy item')
-        print('2. sell item')
-        print('3. back')
-
-        choice = input('\nchoice (1-3): ').strip()
+        session.output('\n' + '=' * 50)
+        session.output('SHOP')
+        session.output('=' * 50)
+        session.output(f'your gold: {session.character["gold"]}')
+        session.output('\n1. buy item')
+        session.output('2. sell item')
+        session.output('3. back')
+
+        choice = session.input('\nchoice (1-3): ').strip()
         
         if choice == '1':
-            print('\n--- available items ---')
-            items = list(shop_items.items())
-            for i, (item_name, price) in enumerate(items, 1):
-                print(f'{i}. {item_name} - {price} gold')
-            
-            item_choice = input(f'\nselect item (1-{len(items)}): ').strip()
-            if item_choice.isdigit():
-                choice_num = int(item_choice)
-                if 1 <= choice_num <= len(items):
-                    item_name, price = items[choice_num - 1]
-                    
-                    if current_character['gold'] >= price:
-                        if item_name in all_items:
-                            try:
-                                inventory_system.add_item(current_character, all_items[item_name])
-                                current_character['gold'] -= price
-                                print(f'purchased {item_name}!')
-                            except InventoryFullError:
-                                print('inventory is full!')
-                        else:
-                            print('item not available')
-                    else:
-                        print('not enough gold!')
-                else:
-                    print('invalid choice')
-            else:
-                print('invalid input')
+            buy_menu(session)
         elif choice == '2':
-            inventory = current_character.get('inventory', [])
-            if not inventory:
-                print('\nnothing to sell!')
-            else:
-                print('\n--- your items ---')
-                for i, item in enumerate(inventory, 1):
-                    sell_price = item.get('value', 10) // 2
-                    print(f'{i}. {item["name"]} - {sell_price} gold')
-                
-                item_choice = input(f'\nselect item (1-{len(inventory)}): ').strip()
-                if item_choice.isdigit():
-                    choice_num = int(item_choice)
-                    if 1 <= choice_num <= len(inventory):
-                        item = inventory[choice_num - 1]
-                        sell_price = item.get('value', 10) // 2
-                        inventory_system.remove_item(current_character, item)
-                        current_character['gold'] += sell_price
-                        print(f'sold {item["name"]} for {sell_price} gold!')
-                    else:
-                        print('invalid choice')
-                else:
-                    print('invalid input')
-        
+            sell_menu(session)
         elif choice == '3':
             return
         else:
-            print('please enter 1, 2, or 3')
+            session.output('please enter 1, 2, or 3')
+
+
+def buy_menu(session):
+    """Browse the shop a page at a time and buy one item"""
+    page = 1
+    while True:
+        page, quotes = session.shop.page(page)
+        pages = session.shop.page_count()
+        session.output(f'\n--- available items (page {page}/{pages}) ---')
+        for i, quote in enumerate(quotes, 1):
+            stock = f'{quote.stock} left' if quote.stock else 'sold out'
+            session.output(f'{i}. {quote.name} - {quote.buy} gold ({stock})')
+        if pages > 1:
+            session.output('n. next page    p. previous page')
+
+        item_choice = session.input(f'\nselect item (1-{len(quotes)}, enter to go back): ').strip().lower()
+        if not item_choice:
+            return
+        if item_choice in ('n', 'p') and pages > 1:
+            page = page % pages + 1 if item_choice == 'n' else (page - 2) % pages + 1
+        elif item_choice.isdigit() and 1 <= int(item_choice) <= len(quotes):
+            quote = quotes[int(item_choice) - 1]
+            try:
+                price = session.shop.buy(session.character, quote.item_id)
+                session.output(f'purchased {quote.name} for {price} gold!')
+            except InsufficientResourcesError as e:
+                metrics.count_exception(e)
+                session.output('not enough gold!')
+            except InventoryFullError as e:
+                metrics.count_exception(e)
+                session.output('inventory is full!')
+            except OutOfStockError as e:
+                metrics.count_exception(e)
+                session.output(f'{quote.name} is sold out!')
+            return
+        else:
+            session.output('invalid choice')
+
+
+def sell_menu(session):
+    """Sell one item from the inventory"""
+    inventory = session.character.get('inventory', [])
+    if not inventory:
+        session.output('\nnothing to sell!')
+        return
+
+    session.output('\n--- your items ---')
+    for i, item_id in enumerate(inventory, 1):
+        quote = session.shop.quote(item_id)
+        session.output(f'{i}. {quote.name} - {quote.sell} gold')
+    
+    item_choice = session.input(f'\nselect item (1-{len(inventory)}): ').strip()
+    if item_choice.isdigit() and 1 <= int(item_choice) <= len(inventory):
+        item_id = inventory[int(item_choice) - 1]
+        gold = session.shop.sell(session.character, item_id)
+        session.output(f'sold {session.shop.quote(item_id).name} for {gold} gold!')
+    else:
+        session.output('invalid choice')
 
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def save_game():
+def save_game(session):
     """Save current game state"""
-    global current_character
-    
-    if current_character:
+    if session.character:
         try:
-            character_manager.save_character(current_character)
+            character_manager.save_character(session.character, session.save_directory)
         except Exception as e:
-            print(f'error saving game: {e}')
+            metrics.count_exception(e)
+            session.output(f'error saving game: {e}')
 
 
-def load_game_data():
-    """Load all quest and item data from files"""
-    global all_quests, all_items
+def load_game_data(session):
+    """
+    Load all quest and item data from files
     
-    all_quests = game_data.load_quests()
-    all_items = game_data.load_items()
+    Creates the default data files if they're missing.
+    Raises: InvalidDataFormatError if a data file can't be parsed
+    """
+    try:
+        quests = game_data.load_quests()
+        items = game_data.load_items()
+    except MissingDataFileError:
+        session.output("Creating default game data...")
+        game_data.create_default_data_files()
+        quests = game_data.load_quests()
+        items = game_data.load_items()
+    session.quests = quests
+    session.items = items
 
 
-def handle_character_death():
+def handle_character_death(session):
     """Handle character death"""
-    global current_character, game_running
-    
-    print('\n' + '=' * 50)
-    print('YOU HAVE DIED')
-    print('=' * 50)
+    session.output('\n' + '=' * 50)
+    session.output('YOU HAVE DIED')
+    session.output('=' * 50)
     
-    revive_cost = current_character['level'] * 50
+    revive_cost = session.character['level'] * 50
     
-    print(f'\nrevive for {revive_cost} gold?')
-    print('1. yes')
-    print('2. no (quit)')
+    session.output(f'\nrevive for {revive_cost} gold?')
+    session.output('1. yes')
+    session.output('2. no (quit)')
     
-    choice = input('\nchoice: ').strip()
+    choice = session.input('\nchoice: ').strip()
     if choice == '1':
-        if current_character['gold'] >= revive_cost:
-            character_manager.revive_character(current_character)
-            current_character['gold'] -= revive_cost
-            print('\nyou have been revived!')
+        if session.character['gold'] >= revive_cost:
+            character_manager.revive_character(session.character)
+            character_manager.add_gold(session.character, -revive_cost)
+            session.output('\nyou have been revived!')
         else:
-            print('\nnot enough gold to revive')
-            print('game over')
-            game_running = False
+            session.output('\nnot enough gold to revive')
+            session.output('game over')
+            session.running = False
     else:
-        print('\ngame over')
-        game_running = False
+        session.output('\ngame over')
+        session.running = False
 
 
-def display_welcome():
+def display_welcome(session):
     """Display welcome message"""
-    print("=" * 50)
-    print("     QUEST CHRONICLES - A MODULAR RPG ADVENTURE")
-    print("=" * 50)
-    print("\nWelcome to Quest Chronicles!")
-    print("Build your character, complete quests, and become a legend!")
-    print()
+    session.output("=" * 50)
+    session.output("     QUEST CHRONICLES - A MODULAR RPG ADVENTURE")
+    session.output("=" * 50)
+    session.output("\nWelcome to Quest Chronicles!")
+    session.output("Build your character, complete quests, and become a legend!")
+    session.output('')
 
 
 # ============================================================================
@@ -721,40 +894,48 @@ def display_welcome():
 
 def main():
     """Main game execution function"""
+    session = GameSession()
     
     # Display welcome message
-    display_welcome()
-    
-    # Load game data
-    try:
-        load_game_data()
-        print("Game data loaded successfully!")
-    except MissingDataFileError:
-        print("Creating default game data...")
-        game_data.create_default_data_files()
-        load_game_data()
-    except InvalidDataFormatError as e:
-        print(f"Error loading game data: {e}")
-        print("Please check data files for errors.")
-        return
+    display_welcome(session)
     
-    # Main menu loop
+    # Game data is loaded the first time a game needs it
     while True:
-        choice = main_menu()
+        choice = main_menu(session)
         
-        if choice == 1:
-            new_game()
-        elif choice == 2:
-            load_game()
-        elif choice == 3:
-            print("\nThanks for playing Quest Chronicles!")
-            break
-        else:
-            print("Invalid choice. Please select 1-3.")
-
-if __name__ == "__main__":
-    main()
+        try:
+            if choice == 1:
+                new_game(session)
+            elif choice == 2:
+                load_game(session)
+            elif choice == 3:
+                session.output("\nThanks for playing Quest Chronicles!")
+                session.io.flush()
+                break
+            else:
+                session.output("Invalid choice. Please select 1-3.")
+        except InvalidDataFormatError as e:
+            metrics.count_exception(e)
+            session.output(f"Error loading game data: {e}")
+            session.output("Please check data files for errors.")
+            session.io.flush()
+            return
 
 if __name__ == "__main__":
-    main()
-
+    # `python main.py <command> ...` runs a non-interactive operations
+    # command (see game_cli.py) instead of the game
+    if len(sys.argv) > 1:
+        import game_cli
+        sys.exit(game_cli.main(sys.argv[1:]))
+
+    # QUEST_PROFILE=1 times every game module function and prints a table
+    # on exit (or writes it to QUEST_PROFILE_OUTPUT, .json for JSON)
+    if os.environ.get("QUEST_PROFILE") == "1":
+        import profiling
+        profiling.enable()
+        try:
+            main()
+        finally:
+            profiling.dump_stats(os.environ.get("QUEST_PROFILE_OUTPUT"))
+    else:
+        main()
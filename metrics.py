@@ -0,0 +1,383 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Metrics Module
+
+In-process counters and histograms for capacity planning, with
+Prometheus text and JSON snapshots.
+
+Updates are lock-free: every thread adds into its own shard (a plain list
+reached through threading.local), and a snapshot sums the shards. A lock
+is taken only the first time a thread touches a metric, so inc() and
+observe() are cheap enough for the battle loop.
+
+The game's metrics are defined at the bottom of this module so a snapshot
+lists all of them, even ones still at zero.
+
+Usage:
+    import metrics
+    metrics.BATTLES.inc(label='player')
+    metrics.SAVE_SECONDS.observe(0.004)
+    metrics.write_snapshot("metrics.prom")        # Prometheus text
+    metrics.write_snapshot("metrics.json")        # JSON
+    metrics.send_snapshot(("127.0.0.1", 9100))    # or a Unix socket path
+"""
+
+import bisect
+import os
+import threading
+import time
+
+# Seconds; suits saves, loads and data file parsing
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# ============================================================================
+# SHARDED STORAGE
+# ============================================================================
+
+class _Shards:
+    """
+    Per-thread lists of numbers that are summed on read
+
+    A shard whose thread has exited is folded into retired (when another
+    thread's shard is created, or on read), so short-lived worker pools
+    don't leave a shard behind per thread.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.local = threading.local()
+        self.shards = []            # (thread, values) for threads seen so far
+        self.retired = [0] * size   # totals of threads that have exited
+        self.lock = threading.Lock()
+
+    def mine(self):
+        """Returns: This thread's shard (created on first use)"""
+        try:
+            return self.local.values
+        except AttributeError:
+            values = [0] * self.size
+            with self.lock:
+                self._retire_exited()
+                self.shards.append((threading.current_thread(), values))
+            self.local.values = values
+            return values
+
+    def _retire_exited(self):
+        """Fold the shards of exited threads into retired (lock held)"""
+        live = []
+        for thread, values in self.shards:
+            if thread.is_alive():
+                live.append((thread, values))
+            else:
+                for i, value in enumerate(values):
+                    self.retired[i] += value
+        self.shards = live
+
+    def totals(self):
+        """Returns: Sum of every shard, position by position"""
+        with self.lock:
+            self._retire_exited()
+            shards = [values for _, values in self.shards]
+            totals = list(self.retired)
+        for values in shards:
+            for i, value in enumerate(values):
+                totals[i] += value
+        return totals
+
+    def clear(self):
+        """Zero every shard"""
+        with self.lock:
+            self.retired = [0] * self.size
+            for _, values in self.shards:
+                values[:] = [0] * self.size
+
+# ============================================================================
+# METRIC TYPES
+# ============================================================================
+
+class Counter:
+    """
+    Monotonic counter, optionally split by one label
+
+    Args:
+        name: Metric name
+        help_text: One line description
+        label: Label name (e.g. 'outcome') or None for a plain counter
+    """
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, label=None):
+        self.name = name
+        self.help = help_text
+        self.label = label
+        self._values = {}  # label value (or None) -> _Shards
+        self._lock = threading.Lock()
+
+    def _shards(self, label):
+        shards = self._values.get(label)
+        if shards is None:
+            with self._lock:
+                shards = self._values.setdefault(label, _Shards(1))
+        return shards
+
+    def inc(self, amount=1, label=None):
+        """Add amount (default 1) to the counter, or to one label's count"""
+        self._shards(label).mine()[0] += amount
+
+    def value(self, label=None):
+        """Returns: Current count (for one label if given)"""
+        shards = self._values.get(label)
+        return shards.totals()[0] if shards is not None else 0
+
+    def values(self):
+        """Returns: {label value: count} (key None for a plain counter)"""
+        return {label: shards.totals()[0] for label, shards in list(self._values.items())}
+
+    def clear(self):
+        """Reset to zero"""
+        for shards in list(self._values.values()):
+            shards.clear()
+
+
+class Histogram:
+    """
+    Distribution of observed values in fixed buckets
+
+    Args:
+        name: Metric name
+        help_text: One line description
+        buckets: Sorted upper bounds; values above the last go in +Inf
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        # One slot per bucket, one for +Inf, then the sum
+        self._shards = _Shards(len(self.buckets) + 2)
+
+    def observe(self, value):
+        """Record one value"""
+        values = self._shards.mine()
+        values[bisect.bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    def time(self):
+        """Context manager that observes the seconds spent inside it"""
+        return _Timer(self)
+
+    def snapshot(self):
+        """
+        Returns: {'buckets': [(upper bound, cumulative count)], 'sum', 'count'}
+                 (the last bound is float('inf'))
+        """
+        totals = self._shards.totals()
+        cumulative = 0
+        buckets = []
+        for bound, count in zip(self.buckets + (float('inf'),), totals[:-1]):
+            cumulative += count
+            buckets.append((bound, cumulative))
+        return {'buckets': buckets, 'sum': totals[-1], 'count': cumulative}
+
+    def clear(self):
+        """Reset to zero"""
+        self._shards.clear()
+
+
+class _Timer:
+    """Observes elapsed seconds into a histogram"""
+
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+class MetricsRegistry:
+    """Named metrics and their exports"""
+
+    def __init__(self):
+        self.metrics = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self.metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"metric {metric.name} already registered as a {existing.kind}")
+                return existing
+            self.metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, help_text, label=None):
+        """Returns: The counter called name (created if new)"""
+        return self._register(Counter(name, help_text, label))
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        """Returns: The histogram called name (created if new)"""
+        return self._register(Histogram(name, help_text, buckets))
+
+    def clear(self):
+        """Reset every metric to zero"""
+        for metric in list(self.metrics.values()):
+            metric.clear()
+
+    def snapshot(self):
+        """Returns: JSON-ready dictionary of every metric's current value"""
+        result = {}
+        for name, metric in sorted(self.metrics.items()):
+            entry = {'type': metric.kind, 'help': metric.help}
+            if metric.kind == 'counter':
+                values = metric.values()
+                if metric.label is None:
+                    entry['value'] = values.get(None, 0)
+                else:
+                    entry['label'] = metric.label
+                    entry['values'] = {label: count for label, count in sorted(values.items())}
+            else:
+                data = metric.snapshot()
+                entry['buckets'] = {_format_bound(bound): count for bound, count in data['buckets']}
+                entry['sum'] = data['sum']
+                entry['count'] = data['count']
+            result[name] = entry
+
+        return {'timestamp': time.time(), 'uptime': time.time() - self.started, 'metrics': result}
+
+    def to_json(self):
+        """Returns: JSON snapshot text"""
+        import json  # kept out of module import to keep game startup fast
+
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """Returns: Snapshot in the Prometheus text exposition format"""
+        lines = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            if metric.kind == 'counter':
+                values = metric.values()
+                if metric.label is None:
+                    lines.append(f"{name} {_format_number(values.get(None, 0))}")
+                else:
+                    for label, count in sorted(values.items()):
+                        lines.append(f'{name}{{{metric.label}="{_escape(label)}"}} {_format_number(count)}')
+            else:
+                data = metric.snapshot()
+                for bound, count in data['buckets']:
+                    lines.append(f'{name}_bucket{{le="{_format_bound(bound)}"}} {count}')
+                lines.append(f"{name}_sum {_format_number(data['sum'])}")
+                lines.append(f"{name}_count {data['count']}")
+        return "\n".join(lines) + "\n"
+
+    def render(self, fmt):
+        """Returns: Snapshot text in 'prometheus' or 'json' format"""
+        if fmt == 'json':
+            return self.to_json()
+        if fmt == 'prometheus':
+            return self.to_prometheus()
+        raise ValueError("format must be 'prometheus' or 'json'")
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float('inf') else repr(float(bound))
+
+
+def _format_number(value):
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _escape(label):
+    return str(label).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+REGISTRY = MetricsRegistry()
+
+
+def snapshot():
+    """Returns: JSON-ready snapshot of the default registry"""
+    return REGISTRY.snapshot()
+
+
+def write_snapshot(path, fmt=None, registry=REGISTRY):
+    """
+    Write a snapshot to a file (replaced atomically)
+
+    Args:
+        path: Output file
+        fmt: 'prometheus' or 'json' (default: json if path ends in .json)
+    """
+    fmt = fmt or ('json' if path.endswith('.json') else 'prometheus')
+    text = registry.render(fmt)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w') as file:
+        file.write(text)
+    os.replace(temp_path, path)
+
+
+def send_snapshot(address, fmt='prometheus', registry=REGISTRY, timeout=5.0):
+    """
+    Send a snapshot to a listening socket and close the connection
+
+    Args:
+        address: (host, port) for TCP or a path string for a Unix socket
+        fmt: 'prometheus' or 'json'
+    """
+    import socket  # only needed for socket export
+
+    data = registry.render(fmt).encode('utf-8')
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(address)
+        sock.sendall(data)
+
+# ============================================================================
+# GAME METRICS
+# ============================================================================
+
+SESSIONS = REGISTRY.counter(
+    'quest_sessions_total', 'Game sessions started', label='frontend')
+BATTLES = REGISTRY.counter(
+    'quest_battles_total', 'Battles finished', label='outcome')
+QUEST_COMPLETIONS = REGISTRY.counter(
+    'quest_completions_total', 'Quests completed')
+INVENTORY_FULL = REGISTRY.counter(
+    'quest_inventory_full_total', 'Items rejected because the inventory was full')
+EXCEPTIONS = REGISTRY.counter(
+    'quest_exceptions_total', 'Errors reported to players and callers', label='exception')
+SAVE_SECONDS = REGISTRY.histogram(
+    'quest_save_seconds', 'Time to save a character')
+CHARACTER_LOAD_SECONDS = REGISTRY.histogram(
+    'quest_character_load_seconds', 'Time to load a character')
+DATA_LOAD_SECONDS = REGISTRY.histogram(
+    'quest_data_load_seconds', 'Time to load a quest or item data file')
+
+
+def count_exception(error):
+    """
+    Count an error in EXCEPTIONS by class name
+
+    Call where the error is reported (server reply, CLI record, game
+    menu), once per error.
+    """
+    EXCEPTIONS.inc(label=type(error).__name__)
@@ -0,0 +1,212 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Profiling Module
+
+Opt-in per-function timing for the game modules. enable() swaps every
+public function (and public method of classes defined in the module) for a
+timing wrapper; disable() puts the originals back. While disabled nothing
+is wrapped, so the game runs at full speed.
+
+For each function it records call count, cumulative time (including calls
+it makes) and the slowest single call.
+
+Usage:
+    import profiling
+    profiling.enable()
+    ... play ...
+    profiling.dump_stats()                # sorted table on stdout
+    profiling.dump_stats("stats.json")    # JSON file
+
+main.py turns this on when QUEST_PROFILE=1 is set and prints the table on exit.
+"""
+
+import functools
+import importlib
+import json
+import sys
+import threading
+import time
+import types
+
+PROFILED_MODULES = (
+    'game_data',
+    'character_manager',
+    'inventory_system',
+    'quest_handler',
+    'combat_system',
+)
+
+SORT_KEYS = ('total', 'calls', 'max', 'mean', 'name')
+
+_stats = {}
+_patched = []  # (owner, attribute, original) in the order they were replaced
+_lock = threading.Lock()
+
+# ============================================================================
+# STATS
+# ============================================================================
+
+class FunctionStats:
+    """Call count, cumulative seconds and slowest call for one function"""
+
+    __slots__ = ('calls', 'total', 'max')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed):
+        """Record one call"""
+        with _lock:
+            self.calls += 1
+            self.total += elapsed
+            if elapsed > self.max:
+                self.max = elapsed
+
+
+def _timed(name, func):
+    """Returns: wrapper around func that records into _stats[name]"""
+    stats = _stats.setdefault(name, FunctionStats())
+    clock = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats.add(clock() - start)
+
+    return wrapper
+
+# ============================================================================
+# ENABLE / DISABLE
+# ============================================================================
+
+def is_enabled():
+    """Returns: True while functions are wrapped"""
+    return bool(_patched)
+
+
+def enable(module_names=PROFILED_MODULES):
+    """
+    Start timing every public function in the given modules
+
+    Names that other profiled modules imported directly (for example
+    inventory_system's `from character_manager import record_changes`)
+    are wrapped too. Calling enable() twice does nothing.
+    """
+    if _patched:
+        return
+
+    modules = [importlib.import_module(name) for name in module_names]
+    wrappers = {}  # id(original) -> wrapper
+
+    for module in modules:
+        for name, obj in list(vars(module).items()):
+            if name.startswith('_'):
+                continue
+            if isinstance(obj, types.FunctionType) and obj.__module__ == module.__name__:
+                wrappers[id(obj)] = _timed(f"{module.__name__}.{name}", obj)
+            elif isinstance(obj, type) and obj.__module__ == module.__name__:
+                for attribute, member in list(vars(obj).items()):
+                    if not attribute.startswith('_') and isinstance(member, types.FunctionType):
+                        wrapper = _timed(f"{module.__name__}.{name}.{attribute}", member)
+                        _patched.append((obj, attribute, member))
+                        setattr(obj, attribute, wrapper)
+
+    # Replace every reference to a wrapped function, including imported names
+    for module in modules:
+        for name, obj in list(vars(module).items()):
+            wrapper = wrappers.get(id(obj))
+            if wrapper is not None and isinstance(obj, types.FunctionType):
+                _patched.append((module, name, obj))
+                setattr(module, name, wrapper)
+
+
+def disable():
+    """Put the original functions back (collected stats are kept)"""
+    while _patched:
+        owner, attribute, original = _patched.pop()
+        setattr(owner, attribute, original)
+
+
+def reset():
+    """Forget collected stats"""
+    with _lock:
+        for stats in _stats.values():
+            stats.calls = 0
+            stats.total = 0.0
+            stats.max = 0.0
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def get_stats(sort_by='total', limit=None):
+    """
+    Collected stats for functions that were called
+
+    Args:
+        sort_by: One of SORT_KEYS (largest first, or alphabetical for 'name')
+        limit: Only return this many rows
+
+    Returns: List of dictionaries with name, calls, total, mean and max
+             (times in seconds)
+    Raises: ValueError for an unknown sort_by
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+
+    with _lock:
+        rows = [
+            {
+                'name': name,
+                'calls': stats.calls,
+                'total': stats.total,
+                'mean': stats.total / stats.calls,
+                'max': stats.max,
+            }
+            for name, stats in _stats.items() if stats.calls
+        ]
+
+    rows.sort(key=lambda row: row[sort_by], reverse=(sort_by != 'name'))
+    return rows[:limit] if limit is not None else rows
+
+
+def format_stats(rows):
+    """Returns: Table text for rows from get_stats() (times in milliseconds)"""
+    width = max([len('function')] + [len(row['name']) for row in rows])
+    lines = [f"{'function':<{width}} {'calls':>9} {'total ms':>11} {'mean ms':>10} {'max ms':>10}"]
+    for row in rows:
+        lines.append(
+            f"{row['name']:<{width}} {row['calls']:>9} {row['total'] * 1000:>11.3f} "
+            f"{row['mean'] * 1000:>10.4f} {row['max'] * 1000:>10.4f}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def dump_stats(path=None, sort_by='total', limit=None):
+    """
+    Print or save the collected stats
+
+    Args:
+        path: None prints a table to stdout; a path ending in .json writes
+              JSON; any other path writes the table as text
+        sort_by, limit: As for get_stats()
+
+    Returns: The rows that were written
+    """
+    rows = get_stats(sort_by, limit)
+
+    if path is None:
+        sys.stdout.write(format_stats(rows))
+    elif path.endswith('.json'):
+        with open(path, 'w') as file:
+            json.dump({'unit': 'seconds', 'functions': rows}, file, indent=2)
+    else:
+        with open(path, 'w') as file:
+            file.write(format_stats(rows))
+
+    return rows
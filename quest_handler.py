@@ -14,8 +14,12 @@ from custom_exceptions import (
     QuestRequirementsNotMetError,
     QuestAlreadyCompletedError,
     QuestNotActiveError,
-    InsufficientLevelError
+    InsufficientLevelError,
+    CharacterDeadError
 )
+from character_manager import gain_experience, record_changes
+import metrics
+import symbols
 
 # ============================================================================
 # QUEST MANAGEMENT
@@ -78,7 +82,8 @@ def accept_quest(character, quest_id, quest_data_dict):
             )
     
     # Add to active quests
-    character['active_quests'].append(quest_id)
+    character['active_quests'].append(symbols.intern(quest_id))
+    record_changes(character, 'active_quests')
     
     return True
 
@@ -117,21 +122,24 @@ def complete_quest(character, quest_id, quest_data_dict):
     # Add to completed quests
     if 'completed_quests' not in character:
         character['completed_quests'] = []
-    character['completed_quests'].append(quest_id)
+    character['completed_quests'].append(symbols.intern(quest_id))
+    record_changes(character, 'active_quests', 'completed_quests')
+    metrics.QUEST_COMPLETIONS.inc()
     
     # Grant rewards
     reward_xp = quest.get('reward_xp', 0)
     reward_gold = quest.get('reward_gold', 0)
     
-    # Add XP (use gain_experience if available, otherwise add directly)
+    # Add XP (a dead character can't level up, so it just banks the XP)
     try:
-        import character_manager
-        character_manager.gain_experience(character, reward_xp)
-    except:
+        gain_experience(character, reward_xp)
+    except CharacterDeadError:
         character['experience'] = character.get('experience', 0) + reward_xp
+        record_changes(character, 'experience')
     
     # Add gold
     character['gold'] = character.get('gold', 0) + reward_gold
+    record_changes(character, 'gold')
     
     # Return reward summary
     return {
@@ -152,6 +160,7 @@ def abandon_quest(character, quest_id):
         raise QuestNotActiveError(f"Quest '{quest_id}' is not active")
     
     character['active_quests'].remove(quest_id)
+    record_changes(character, 'active_quests')
     return True
 
 
@@ -0,0 +1,513 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Search Index Module
+
+Full-text search over quest TITLE/DESCRIPTION and item NAME/DESCRIPTION.
+
+Text is split into lowercase words and an inverted index maps each word
+to the records containing it and how many times (its postings, sorted by
+record). A query looks up the postings of its words, keeps the records
+that contain every word and ranks them by total term frequency, so no
+description text is read at query time. A query word ending in '*'
+matches every indexed word starting with it, found by binary search on
+the sorted vocabulary.
+
+The index is saved next to the data files and reused while they are
+unchanged. Loading maps the file into memory and reads only its small
+JSON header; record keys, vocabulary words and postings are decoded from
+the mapping as queries reach them.
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter, namedtuple
+from heapq import nlargest
+
+import game_data
+from custom_exceptions import CorruptedDataError, MissingDataFileError
+
+# File layout, every integer an unsigned 32-bit little-endian number:
+# MAGIC, version, header length, JSON header (sources, record and term
+# counts), then one kind byte per record (its index in KINDS), record key
+# offsets and key text, term offsets and term text (sorted), the term
+# table of (offset, count) pairs, and the postings: record numbers
+# followed by term frequencies for each term in turn
+INDEX_MAGIC = b'QCSI'
+INDEX_VERSION = 2
+
+DEFAULT_INDEX_FILE = "data/search_index.bin"
+
+KINDS = ('quest', 'item')
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+
+UINT32 = struct.Struct('<I')
+UINT32_TYPE = 'I' if array('I').itemsize == 4 else 'L'
+
+# Words too common to be worth indexing
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in',
+    'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'to', 'with',
+})
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+QUERY_PATTERN = re.compile(r"[a-z0-9]+\*?")
+
+# One search hit: kind is 'quest' or 'item', key its ID
+SearchResult = namedtuple('SearchResult', ['kind', 'key', 'score'])
+
+
+def tokenize(text):
+    """Returns: List of the lowercase words in text, without stop words"""
+    return [word for word in WORD_PATTERN.findall(text.lower()) if word not in STOP_WORDS]
+
+
+def uint32_array(data, start=0, count=None):
+    """Returns: array of the little-endian 32-bit numbers in data[start:]"""
+    values = array(UINT32_TYPE)
+    values.frombytes(data[start:] if count is None else data[start:start + 4 * count])
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def uint32_bytes(values):
+    """Returns: values packed as little-endian 32-bit numbers"""
+    values = array(UINT32_TYPE, values)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+def string_section(strings):
+    """Returns: (offsets bytes, text bytes) storing strings back to back"""
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = [0]
+    for text in encoded:
+        offsets.append(offsets[-1] + len(text))
+    return uint32_bytes(offsets), b''.join(encoded)
+
+# ============================================================================
+# STORED SECTIONS
+# ============================================================================
+
+class StoredStrings:
+    """
+    Strings in a mapped index file, decoded one at a time
+
+    Supports len() and indexing, so bisect can search a sorted
+    vocabulary without decoding all of it.
+    """
+
+    def __init__(self, data, offsets_start, text_start, count):
+        self._data = data
+        self._offsets_start = offsets_start
+        self._text_start = text_start
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError('string index out of range')
+        start, end = struct.unpack_from('<2I', self._data, self._offsets_start + 4 * position)
+        return self._data[self._text_start + start:self._text_start + end].decode('utf-8')
+
+
+class StoredRecords:
+    """(kind, key) records of a mapped index file, decoded as they're used"""
+
+    def __init__(self, kinds, keys):
+        self._kinds = kinds
+        self._keys = keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __getitem__(self, record):
+        return KINDS[self._kinds[record]], self._keys[record]
+
+    def __iter__(self):
+        for record in range(len(self._keys)):
+            yield self[record]
+
+# ============================================================================
+# SEARCH INDEX
+# ============================================================================
+
+class SearchIndex:
+    """
+    Inverted index from words to quest and item records
+
+    Records are numbered in the order they're added; each word's
+    postings are two arrays, record numbers (ascending) and how often
+    the word appears in each.
+
+    Attributes:
+        records: Sequence of (kind, key) per record number
+        sources: {filename: [mtime_ns, size]} of the data it was built from
+    """
+
+    def __init__(self):
+        self.records = []
+        self.sources = {}
+        self._kinds = bytearray()  # KIND_CODES value per record
+        self._postings = {}   # term -> (records, frequencies), built or read so far
+        self._peaks = {}      # term -> its highest frequency
+        self._terms = None    # sorted vocabulary
+        self._vocabulary = None  # StoredStrings of the vocabulary, if loaded from a file
+        self._table = None    # start of the term table in the mapped file, if loaded
+        self._map = None
+        self._data_start = 0
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, kind, key, *texts):
+        """
+        Index one record
+
+        Args:
+            kind: 'quest' or 'item'
+            key: Quest or item ID
+            texts: Text fields to index
+
+        Raises: ValueError on an index loaded from a file (those are
+                read-only) or for an unknown kind
+        """
+        if self._map is not None:
+            raise ValueError('a loaded search index is read-only; build a new one')
+        if kind not in KIND_CODES:
+            raise ValueError(f'unknown record kind: {kind}')
+        record = len(self.records)
+        self.records.append((kind, key))
+        self._kinds.append(KIND_CODES[kind])
+        counts = Counter()
+        for text in texts:
+            counts.update(tokenize(text))
+        for term, count in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array(UINT32_TYPE), array(UINT32_TYPE))
+            postings[0].append(record)
+            postings[1].append(count)
+        self._terms = None
+        self._peaks.clear()
+
+    def close(self):
+        """Release the mapped index file (a loaded index can't search afterwards)"""
+        if self._map is not None:
+            self._map.close()
+
+    @property
+    def terms(self):
+        """Sorted vocabulary"""
+        if self._terms is None:
+            self._terms = list(self._vocabulary) if self._vocabulary is not None else sorted(self._postings)
+        return self._terms
+
+    def search(self, query, limit=10, kind=None):
+        """
+        Find the records containing every word of a query
+
+        Args:
+            query: Words to find; a word ending in '*' is a prefix
+            limit: Most results to return
+            kind: 'quest' or 'item' to search only those records
+
+        Returns: List of SearchResult, highest total term frequency first
+                 (ties in record order)
+        """
+        groups = []
+        for word in QUERY_PATTERN.findall(query.lower()):
+            if word.endswith('*'):
+                terms = self._prefix_terms(word[:-1])
+            elif word in STOP_WORDS:
+                continue
+            else:
+                terms = [word] if self._has_term(word) else []
+            if not terms:
+                return []
+            groups.append(terms)
+        if not groups or (kind is not None and kind not in KIND_CODES):
+            return []
+
+        postings = self._read_postings({term for terms in groups for term in terms})
+        if len(groups) == 1 and len(groups[0]) == 1:
+            return self._top_postings(groups[0][0], limit, kind)
+        groups = [[postings[term] for term in terms] for terms in groups]
+
+        # Intersect starting from the group with the fewest postings, so
+        # each later group only checks the records still in the running
+        groups.sort(key=lambda group: sum(len(postings[0]) for postings in group))
+        scores = Counter()
+        for records, frequencies in groups[0]:
+            scores.update(dict(zip(records, frequencies)))
+
+        for group in groups[1:]:
+            found = Counter()
+            for records, frequencies in group:
+                if len(records) <= len(scores):
+                    found.update({record: frequency for record, frequency in zip(records, frequencies)
+                                  if record in scores})
+                else:
+                    for record in scores:
+                        position = bisect_left(records, record)
+                        if position < len(records) and records[position] == record:
+                            found[record] += frequencies[position]
+            scores = Counter({record: scores[record] + extra for record, extra in found.items()})
+            if not scores:
+                return []
+
+        # Filter by kind last, once only the matching records are left
+        if kind is not None:
+            code = KIND_CODES[kind]
+            scores = {record: score for record, score in scores.items() if self._kinds[record] == code}
+
+        best = nlargest(limit, scores.items(), key=lambda hit: (hit[1], -hit[0]))
+        return [SearchResult(*self.records[record], score) for record, score in best]
+
+    def _sorted_terms(self):
+        """Returns: The vocabulary as a sorted sequence, without decoding a stored one"""
+        return self._vocabulary if self._vocabulary is not None else self.terms
+
+    def _prefix_terms(self, prefix):
+        """Returns: Indexed terms starting with prefix"""
+        terms = self._sorted_terms()
+        position = bisect_left(terms, prefix)
+        found = []
+        while position < len(terms):
+            term = terms[position]
+            if not term.startswith(prefix):
+                break
+            found.append(term)
+            position += 1
+        return found
+
+    def _has_term(self, term):
+        if term in self._postings:
+            return True
+        terms = self._sorted_terms()
+        position = bisect_left(terms, term)
+        return position < len(terms) and terms[position] == term
+
+    def _top_postings(self, term, limit, kind):
+        """
+        Best records for a single-term query
+
+        Finds positions with the highest frequency first using
+        array.index, so a very common word costs a few C-level scans
+        rather than a Python loop over every record.
+
+        Returns: List of SearchResult
+        """
+        records, frequencies = self._postings[term]
+        code = None if kind is None else KIND_CODES[kind]
+        results = []
+        value = self._peaks.get(term)
+        if value is None:
+            value = self._peaks[term] = max(frequencies)
+        while value > 0 and len(results) < limit:
+            position = 0
+            while len(results) < limit:
+                try:
+                    position = frequencies.index(value, position)
+                except ValueError:
+                    break
+                record = records[position]
+                if code is None or self._kinds[record] == code:
+                    results.append(SearchResult(*self.records[record], value))
+                position += 1
+            value -= 1
+        return results
+
+    def _read_postings(self, terms):
+        """
+        Get the postings of several terms, reading any not yet loaded
+        from the mapped index file
+
+        Returns: {term: (records, frequencies)}
+        """
+        for term in terms:
+            if term in self._postings:
+                continue
+            try:
+                position = bisect_left(self._vocabulary, term)
+                offset, count = struct.unpack_from('<2I', self._map, self._table + 8 * position)
+                start = self._data_start + 4 * offset
+                records = uint32_array(self._map, start, count)
+                frequencies = uint32_array(self._map, start + 4 * count, count)
+            except (ValueError, TypeError, struct.error) as e:
+                raise CorruptedDataError(f'could not read search index: {e}')
+            if len(frequencies) != count:
+                raise CorruptedDataError('search index is truncated')
+            self._postings[term] = (records, frequencies)
+        return {term: self._postings[term] for term in terms}
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, filename):
+        """
+        Write the index to a single binary file
+
+        The file is replaced in one step, so indexes already loaded from
+        it keep reading the old contents.
+
+        Returns: True if successful
+        """
+        terms = self.terms
+        postings = self._read_postings(terms)
+        records = list(self.records)
+        header = json.dumps({
+            'version': INDEX_VERSION,
+            'sources': self.sources,
+            'records': len(records),
+            'terms': len(terms),
+        }).encode('utf-8')
+
+        table = []
+        offset = 0
+        for term in terms:
+            count = len(postings[term][0])
+            table.extend((offset, count))
+            offset += 2 * count
+
+        directory = os.path.dirname(filename)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        temp = filename + '.tmp'
+        with open(temp, 'wb') as file:
+            file.write(INDEX_MAGIC)
+            file.write(uint32_bytes([INDEX_VERSION, len(header)]))
+            file.write(header)
+            file.write(bytes(KIND_CODES[kind] for kind, _ in records))
+            file.writelines(string_section([key for _, key in records]))
+            file.writelines(string_section(terms))
+            file.write(uint32_bytes(table))
+            for term in terms:
+                file.write(uint32_bytes(postings[term][0]))
+                file.write(uint32_bytes(postings[term][1]))
+        os.replace(temp, filename)
+
+        return True
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Map an index written by save(); only the header is read now
+
+        Returns: SearchIndex
+        Raises:
+            MissingDataFileError if the file doesn't exist
+            CorruptedDataError if the file can't be decoded
+        """
+        if not os.path.exists(filename):
+            raise MissingDataFileError(f'search index not found: {filename}')
+
+        index = cls()
+        try:
+            with open(filename, 'rb') as file:
+                data = index._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            if data[:4] != INDEX_MAGIC:
+                raise CorruptedDataError('not a search index file')
+            version, header_length = struct.unpack_from('<2I', data, 4)
+            if version != INDEX_VERSION:
+                raise CorruptedDataError(f'unsupported search index version: {version}')
+            header = json.loads(data[12:12 + header_length].decode('utf-8'))
+            record_count, term_count = header['records'], header['terms']
+
+            kinds_start = 12 + header_length
+            key_offsets = kinds_start + record_count
+            key_text = key_offsets + 4 * (record_count + 1)
+            term_offsets = key_text + UINT32.unpack_from(data, key_text - 4)[0]
+            term_text = term_offsets + 4 * (term_count + 1)
+            index._table = term_text + UINT32.unpack_from(data, term_text - 4)[0]
+            index._data_start = index._table + 8 * term_count
+            if index._data_start > len(data):
+                raise CorruptedDataError('search index is truncated')
+
+            index.sources = header['sources']
+            index._kinds = data[kinds_start:key_offsets]
+            if index._kinds and max(index._kinds) >= len(KINDS):
+                raise CorruptedDataError('search index has an unknown record kind')
+            index.records = StoredRecords(index._kinds, StoredStrings(data, key_offsets, key_text, record_count))
+            index._vocabulary = StoredStrings(data, term_offsets, term_text, term_count)
+        except CorruptedDataError:
+            index.close()
+            raise
+        except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+            index.close()
+            raise CorruptedDataError(f'could not read search index: {e}')
+
+        return index
+
+# ============================================================================
+# BUILDING AND LOADING
+# ============================================================================
+
+def build_index(quests=None, items=None):
+    """
+    Index quest and item catalogs
+
+    Args:
+        quests: {quest_id: quest_data} (TITLE and DESCRIPTION are indexed)
+        items: {item_id: item_data} (NAME and DESCRIPTION are indexed)
+
+    Returns: SearchIndex
+    """
+    index = SearchIndex()
+    for quest_id, quest in (quests or {}).items():
+        index.add('quest', quest_id, quest.get('title', ''), quest.get('description', ''))
+    for item_id, item in (items or {}).items():
+        index.add('item', item_id, item.get('name', ''), item.get('description', ''))
+    return index
+
+
+def source_stamps(filenames):
+    """Returns: {filename: [mtime_ns, size]} used to tell if an index is stale"""
+    stamps = {}
+    for filename in filenames:
+        stat = os.stat(filename)
+        stamps[filename] = [stat.st_mtime_ns, stat.st_size]
+    return stamps
+
+
+def load_search_index(quest_file="data/quests.txt", item_file="data/items.txt",
+                      index_file=DEFAULT_INDEX_FILE):
+    """
+    Load the saved index, or rebuild and save it if the data files changed
+
+    Returns: SearchIndex
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+            from loading the data files when the index has to be rebuilt
+    """
+    if not os.path.exists(quest_file) or not os.path.exists(item_file):
+        raise MissingDataFileError(f'data files not found: {quest_file}, {item_file}')
+    sources = source_stamps([quest_file, item_file])
+
+    try:
+        index = SearchIndex.load(index_file)
+        if index.sources == sources:
+            return index
+        index.close()
+    except (MissingDataFileError, CorruptedDataError):
+        pass
+
+    index = build_index(game_data.load_quests(quest_file), game_data.load_items(item_file))
+    index.sources = sources
+    try:
+        index.save(index_file)
+    except OSError:
+        pass  # a read-only data directory just means rebuilding next time
+    return index
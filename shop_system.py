@@ -0,0 +1,212 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Shop System Module
+
+Shops sell items from the item catalog. Each shop keeps a stock level per
+item; buying takes one off, selling an item the shop carries puts one
+back, and sold-out items come back one unit every restock_seconds.
+
+Prices follow demand: a fully stocked item costs its catalog COST, and the
+price rises toward (1 + DEMAND_MARKUP) x COST as the shop runs out. The
+shop pays half its current price when buying an item back.
+
+Quotes are cached per item and only recomputed when that item's stock
+changes, and the catalog is browsed one page at a time so a menu only
+formats the items it shows.
+"""
+
+import time
+from collections import namedtuple
+
+import game_data
+import inventory_system
+from custom_exceptions import ItemNotFoundError, OutOfStockError
+
+# Units of each item type a shop keeps when fully stocked
+DEFAULT_STOCK = {
+    'consumable': 10,
+    'weapon': 3,
+    'armor': 3,
+    'accessory': 2,
+}
+
+# Seconds for one unit of a sold item to be restocked
+RESTOCK_SECONDS = 60
+
+# Price increase when an item is sold out (0.5 = 50% over COST)
+DEMAND_MARKUP = 0.5
+
+# Items per page when browsing
+PAGE_SIZE = 8
+
+# What the shop charges and pays for an item, and how many it has
+Quote = namedtuple('Quote', ['item_id', 'name', 'buy', 'sell', 'stock'])
+
+# ============================================================================
+# PRICING
+# ============================================================================
+
+def default_stock(items):
+    """
+    Full stock levels for a catalog
+
+    Returns: Dictionary {item_id: units} for every item whose type is in
+             DEFAULT_STOCK, grouped by type in DEFAULT_STOCK order
+    """
+    index = game_data.item_index(items)
+    return {
+        item_id: units
+        for item_type, units in DEFAULT_STOCK.items()
+        for item_id in index.of_type(item_type)
+    }
+
+
+def demand_price(cost, stock, max_stock):
+    """
+    Price of an item given how much of it the shop has left
+
+    Args:
+        cost: Catalog COST
+        stock: Units in stock
+        max_stock: Units when fully stocked (0 if the shop doesn't carry it)
+
+    Returns: Integer price, COST at full stock and
+             (1 + DEMAND_MARKUP) x COST when sold out
+    """
+    if max_stock <= 0 or stock >= max_stock:
+        return cost
+    shortage = 1 - max(stock, 0) / max_stock
+    return int(round(cost * (1 + DEMAND_MARKUP * shortage)))
+
+# ============================================================================
+# SHOP
+# ============================================================================
+
+class Shop:
+    """
+    One shop's stock and prices
+
+    Args:
+        items: Item catalog {item_id: item_data}
+        stock: Full stock levels {item_id: units} (default default_stock(items))
+        restock_seconds: Seconds per restocked unit
+        clock: Function returning the current time in seconds
+    """
+
+    def __init__(self, items, stock=None, restock_seconds=RESTOCK_SECONDS, clock=time.monotonic):
+        self.items = items
+        self.max_stock = dict(default_stock(items) if stock is None else stock)
+        self.stock = dict(self.max_stock)
+        self.item_ids = list(self.max_stock)  # browsing order
+        self.restock_seconds = restock_seconds
+        self.clock = clock
+        self._restock_at = {}  # item_id -> when its next unit arrives (items below full stock)
+        self._quotes = {}      # item_id -> Quote, dropped when the item's stock changes
+
+    def page_count(self, per_page=PAGE_SIZE):
+        """Returns: Number of pages (at least 1)"""
+        return max(1, -(-len(self.item_ids) // per_page))
+
+    def page(self, number, per_page=PAGE_SIZE):
+        """
+        Quotes for one page of the shop's items
+
+        Args:
+            number: Page number, from 1 (clamped to the pages there are)
+
+        Returns: (page number, list of Quote)
+        """
+        number = min(max(number, 1), self.page_count(per_page))
+        start = (number - 1) * per_page
+        return number, [self.quote(item_id) for item_id in self.item_ids[start:start + per_page]]
+
+    def quote(self, item_id):
+        """
+        Current prices and stock for an item
+
+        Items the shop doesn't carry can still be sold to it (for half
+        their COST); items not in the catalog are worth nothing.
+
+        Returns: Quote
+        """
+        if item_id in self._restock_at:
+            self._restock(item_id)
+        quote = self._quotes.get(item_id)
+        if quote is None:
+            item = self.items.get(item_id, {})
+            stock = self.stock.get(item_id, 0)
+            buy = demand_price(int(item.get('cost', 0)), stock, self.max_stock.get(item_id, 0))
+            quote = self._quotes[item_id] = Quote(item_id, item.get('name', item_id), buy, buy // 2, stock)
+        return quote
+
+    def buy(self, character, item_id):
+        """
+        Sell an item to a character at the current price
+
+        Returns: Gold paid
+        Raises: see checkout
+        """
+        return self.checkout(character, [item_id])
+
+    def checkout(self, character, item_ids):
+        """
+        Sell a cart of items in one transaction: all of them or none
+
+        Each unit is priced at the stock level it leaves, so a cart costs
+        the same as buying its items one at a time.
+
+        Returns: Gold paid
+        Raises:
+            ItemNotFoundError if the shop doesn't carry an item
+            OutOfStockError if there aren't enough of an item left
+            InsufficientResourcesError if not enough gold
+            InventoryFullError if the items don't fit
+        """
+        taken = {}
+        with inventory_system.transaction(character) as txn:
+            for item_id in item_ids:
+                if item_id not in self.max_stock:
+                    raise ItemNotFoundError(f'the shop does not sell "{item_id}"')
+                quote = self.quote(item_id)
+                stock = quote.stock - taken.get(item_id, 0)
+                if stock <= 0:
+                    raise OutOfStockError(f'{quote.name} is out of stock')
+                txn.spend(demand_price(int(self.items[item_id].get('cost', 0)), stock, self.max_stock[item_id]))
+                txn.add(item_id)
+                taken[item_id] = taken.get(item_id, 0) + 1
+
+        for item_id, count in taken.items():
+            self._set_stock(item_id, self.stock[item_id] - count)
+        return -txn.gold
+
+    def sell(self, character, item_id):
+        """
+        Buy an item back from a character at the current price
+
+        Returns: Gold received
+        Raises: ItemNotFoundError if item not in inventory
+        """
+        quote = self.quote(item_id)
+        inventory_system.sell_item(character, item_id, self.items.get(item_id, {}), quote.sell)
+        if item_id in self.max_stock:
+            self._set_stock(item_id, min(quote.stock + 1, self.max_stock[item_id]))
+        return quote.sell
+
+    def _set_stock(self, item_id, stock):
+        """Change an item's stock, dropping its cached quote"""
+        self.stock[item_id] = stock
+        self._quotes.pop(item_id, None)
+        if stock >= self.max_stock[item_id]:
+            self._restock_at.pop(item_id, None)
+        elif item_id not in self._restock_at:
+            self._restock_at[item_id] = self.clock() + self.restock_seconds
+
+    def _restock(self, item_id):
+        """Add the units that have arrived since the item sold out"""
+        now = self.clock()
+        due = self._restock_at[item_id]
+        if now < due:
+            return
+        arrived = 1 + int((now - due) // self.restock_seconds)
+        self._restock_at[item_id] = due + arrived * self.restock_seconds
+        self._set_stock(item_id, min(self.stock[item_id] + arrived, self.max_stock[item_id]))
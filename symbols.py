@@ -0,0 +1,36 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Symbols Module
+
+Interned item and quest IDs. The same few hundred IDs are repeated in
+every character's inventory and quest lists; without interning, each
+save file loaded or catalog parsed makes its own copy of every string.
+
+IDs are interned with sys.intern, so every reference to 'health_potion'
+is the same object: memory grows with the number of distinct IDs in use,
+and a list lookup with an interned ID succeeds on the identity check
+before comparing any characters. Interned strings are freed once nothing
+refers to them, so IDs read from old saves don't pile up.
+
+Lists and save files keep holding the ID strings themselves, so
+characters still save, print and compare exactly as before.
+
+Usage:
+    import symbols
+    item_id = symbols.intern(item_id)   # canonical copy
+"""
+
+import sys
+
+# ============================================================================
+# INTERNING
+# ============================================================================
+
+def intern(name):
+    """Returns: The canonical copy of an item or quest ID"""
+    return sys.intern(str(name))
+
+
+def intern_all(names):
+    """Returns: List of the canonical copies of names"""
+    return [sys.intern(str(name)) for name in names]
@@ -0,0 +1,221 @@
+"""
+Benchmark fixtures
+
+Synthetic data (from content_generator) and the baseline check shared by
+the benchmark suite. Uses the pytest-benchmark plugin when it's installed
+and a small timeit-based stand-in otherwise, so the suite always runs.
+
+Baselines are stored relative to a fixed pure-Python calibration loop
+timed at the start of each run, so they carry over between machines of
+different speeds. A benchmark slower than its baseline only warns unless
+BENCHMARK_CHECK=1, since timings on shared CI runners are too noisy to
+fail a build on by default.
+
+Environment variables:
+    BENCHMARK_LARGE=1             also run the 1M record data file benchmarks
+    BENCHMARK_UPDATE_BASELINES=1  write this run's timings to baselines.json
+    BENCHMARK_CHECK=1             fail (instead of warn) on a regression
+    BENCHMARK_MAX_REGRESSION=25   percent slower than baseline that counts as one
+"""
+
+import json
+import os
+import sys
+import timeit
+import warnings
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import character_manager
+import content_generator
+import inventory_system
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+BASELINE_UNIT = "calibration loops (min)"
+DEFAULT_MAX_REGRESSION = 25.0
+
+try:
+    import pytest_benchmark  # noqa: F401 (provides the benchmark fixture)
+    HAVE_PYTEST_BENCHMARK = True
+except ImportError:
+    HAVE_PYTEST_BENCHMARK = False
+
+# ============================================================================
+# TIMING
+# ============================================================================
+
+def calibration_loop():
+    """Fixed pure-Python work (dicts, strings, sorting) that baselines are measured in"""
+    table = {}
+    for i in range(100_000):
+        key = f"item_{i % 997}"
+        table[key] = table.get(key, 0) + i
+    return sorted(table.items(), key=lambda entry: entry[1])
+
+
+def time_calibration(repeat=5):
+    """Returns: Fastest of repeat runs of calibration_loop, in seconds"""
+    return min(timeit.repeat(calibration_loop, number=1, repeat=repeat))
+
+
+class SimpleBenchmark:
+    """
+    Minimal stand-in for pytest-benchmark's fixture
+
+    Supports calling it with a function and its arguments, pedantic()
+    and stats.stats.min, which is all the suite uses.
+    """
+
+    def __init__(self):
+        self.stats = None
+
+    # Each round runs the function enough times to take this long
+    ROUND_SECONDS = 0.01
+
+    def __call__(self, func, *args, **kwargs):
+        timer = timeit.Timer(lambda: func(*args, **kwargs))
+        number = 1
+        while timer.timeit(number) < self.ROUND_SECONDS:
+            number *= 2
+        fastest = min(timer.repeat(repeat=5, number=number)) / number
+        self.stats = SimpleNamespace(stats=SimpleNamespace(min=fastest))
+        return func(*args, **kwargs)
+
+    def pedantic(self, func, args=(), kwargs=None, setup=None, rounds=1):
+        fastest = result = None
+        for _ in range(rounds):
+            call_args, call_kwargs = setup() if setup is not None else (args, kwargs or {})
+            start = timeit.default_timer()
+            result = func(*call_args, **call_kwargs)
+            elapsed = timeit.default_timer() - start
+            fastest = elapsed if fastest is None else min(fastest, elapsed)
+        self.stats = SimpleNamespace(stats=SimpleNamespace(min=fastest))
+        return result
+
+# ============================================================================
+# SYNTHETIC DATA
+# ============================================================================
+
+def make_quest_dict(count):
+    """Build a quest dictionary like load_quests() returns, without a file"""
+    return {quest['quest_id']: quest for quest in content_generator.generate_quests(count)}
+
+
+def make_character(name="BenchHero", inventory_size=0, completed=0, level=25):
+    """Build a mid-game character with a filled inventory and quest history"""
+    character = character_manager.create_character(name, "Warrior")
+    character['level'] = level
+    character['inventory'] = [f"item_{i % 7}" for i in range(inventory_size)]
+    character['completed_quests'] = [f"quest_{i}" for i in range(completed)]
+    character['active_quests'] = [f"quest_{completed + i}" for i in range(5)]
+    return character
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture(scope="session")
+def data_files(tmp_path_factory):
+    """Returns: function(kind, count) -> path of a generated data file (cached)"""
+    directory = tmp_path_factory.mktemp("bench_data")
+    writers = {'quests': content_generator.write_quest_file, 'items': content_generator.write_item_file}
+    cache = {}
+
+    def get(kind, count):
+        if count >= 1_000_000 and os.environ.get("BENCHMARK_LARGE") != "1":
+            pytest.skip("set BENCHMARK_LARGE=1 to run 1M record benchmarks")
+        if (kind, count) not in cache:
+            filename = str(directory / f"{kind}_{count}.txt")
+            writers[kind](filename, count)
+            cache[(kind, count)] = filename
+        return cache[(kind, count)]
+
+    return get
+
+
+if not HAVE_PYTEST_BENCHMARK:
+    @pytest.fixture
+    def benchmark():
+        """Timeit-based benchmark fixture used when pytest-benchmark isn't installed"""
+        return SimpleBenchmark()
+
+
+@pytest.fixture(scope="session")
+def baselines():
+    """Stored baselines in calibration loops, this run's calibration, and its results"""
+    try:
+        with open(BASELINE_FILE, 'r') as file:
+            stored = json.load(file)
+    except FileNotFoundError:
+        stored = {}
+
+    # Baselines in any other unit (such as absolute seconds) aren't comparable
+    state = {
+        'stored': stored.get('benchmarks', {}) if stored.get('unit') == BASELINE_UNIT else {},
+        'measured': {},
+        'calibration': time_calibration(),
+    }
+    yield state
+
+    if os.environ.get("BENCHMARK_UPDATE_BASELINES") == "1" and state['measured']:
+        merged = dict(state['stored'])
+        merged.update(state['measured'])
+        with open(BASELINE_FILE, 'w') as file:
+            json.dump({'unit': BASELINE_UNIT, 'benchmarks': dict(sorted(merged.items()))}, file, indent=2)
+            file.write("\n")
+
+
+@pytest.fixture
+def bench(benchmark, baselines, request):
+    """
+    Run a benchmark and compare its fastest round with the stored baseline
+
+    Usage: bench(func, *args, setup=None, rounds=None)
+        setup: called before every round and returns (args, kwargs), as
+               in benchmark.pedantic; use it (instead of args) when func
+               changes its input
+        rounds: fixed number of rounds (pedantic mode)
+
+    Warns (or with BENCHMARK_CHECK=1, fails the test) if the fastest
+    round, in calibration loops, is more than BENCHMARK_MAX_REGRESSION
+    percent above the baseline. The minimum is compared rather than the
+    mean because it barely moves with background load.
+    """
+    def run(func, *args, setup=None, rounds=None):
+        if setup is not None:
+            # pedantic() takes either setup or args, not both
+            result = benchmark.pedantic(func, setup=setup, rounds=rounds or 50)
+        elif rounds is not None:
+            result = benchmark.pedantic(func, args=args, rounds=rounds)
+        else:
+            result = benchmark(func, *args)
+
+        if benchmark.stats is None:
+            return result  # --benchmark-disable
+
+        name = request.node.name
+        relative = benchmark.stats.stats.min / baselines['calibration']
+        baselines['measured'][name] = relative
+
+        baseline = baselines['stored'].get(name)
+        limit = float(os.environ.get("BENCHMARK_MAX_REGRESSION", DEFAULT_MAX_REGRESSION))
+        if baseline and os.environ.get("BENCHMARK_UPDATE_BASELINES") != "1":
+            slower = (relative - baseline) / baseline * 100
+            if slower > limit:
+                message = (f"{name}: min {relative:.4g} calibration loops is {slower:.0f}% slower "
+                           f"than baseline {baseline:.4g} (limit {limit:.0f}%)")
+                if os.environ.get("BENCHMARK_CHECK") == "1":
+                    pytest.fail(message)
+                warnings.warn(message)
+        return result
+
+    return run
+
+
+@pytest.fixture
+def full_inventory_character():
+    """Character whose inventory is at MAX_INVENTORY_SIZE"""
+    return make_character(inventory_size=inventory_system.MAX_INVENTORY_SIZE)
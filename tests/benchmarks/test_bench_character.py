@@ -0,0 +1,26 @@
+"""
+Benchmark Character Saves
+save_character / load_character for a mid-game character
+"""
+
+import pytest
+
+import character_manager
+from conftest import make_character
+
+# ============================================================================
+# SAVE / LOAD BENCHMARKS
+# ============================================================================
+
+def test_save_character(bench, tmp_path):
+    """Benchmark writing a save file"""
+    character = make_character(inventory_size=20, completed=200)
+    assert bench(character_manager.save_character, character, str(tmp_path)) is True
+
+def test_load_character(bench, tmp_path):
+    """Benchmark reading and verifying a save file"""
+    character = make_character(inventory_size=20, completed=200)
+    character_manager.save_character(character, str(tmp_path))
+
+    loaded = bench(character_manager.load_character, character['name'], str(tmp_path))
+    assert loaded == character
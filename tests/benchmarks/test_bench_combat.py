@@ -0,0 +1,30 @@
+"""
+Benchmark Combat
+Resolving a full battle through SimpleBattle
+"""
+
+import random
+
+import pytest
+
+import character_manager
+import combat_system
+from game_io import ScriptedIO
+
+# ============================================================================
+# COMBAT BENCHMARKS
+# ============================================================================
+
+@pytest.mark.parametrize("enemy_type", ["goblin", "orc"])
+def test_battle_resolution(bench, enemy_type):
+    """Benchmark a warrior fighting to the end with basic attacks"""
+    def setup():
+        character = character_manager.create_character("BenchHero", "Warrior")
+        enemy = combat_system.create_enemy(enemy_type)
+        battle = combat_system.SimpleBattle(
+            character, enemy, io=ScriptedIO(["1"] * 100, keep_output=False), rng=random.Random(0)
+        )
+        return (battle,), {}
+
+    result = bench(combat_system.SimpleBattle.start_battle, setup=setup, rounds=200)
+    assert result['winner'] == 'player'
@@ -0,0 +1,33 @@
+"""
+Benchmark Game Data
+Data file loading at 1k, 100k and 1M records
+"""
+
+import pytest
+
+import game_data
+
+SIZES = [1_000, 100_000, 1_000_000]
+
+
+def rounds_for(count):
+    """Fewer rounds for the big files so a run stays under a minute"""
+    return 3 if count >= 100_000 else None
+
+# ============================================================================
+# LOADING BENCHMARKS
+# ============================================================================
+
+@pytest.mark.parametrize("count", SIZES)
+def test_load_quests(bench, data_files, count):
+    """Benchmark load_quests"""
+    filename = data_files('quests', count)
+    quests = bench(game_data.load_quests, filename, rounds=rounds_for(count))
+    assert len(quests) == count
+
+@pytest.mark.parametrize("count", SIZES)
+def test_load_items(bench, data_files, count):
+    """Benchmark load_items"""
+    filename = data_files('items', count)
+    items = bench(game_data.load_items, filename, rounds=rounds_for(count))
+    assert len(items) == count
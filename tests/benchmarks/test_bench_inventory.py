@@ -0,0 +1,57 @@
+"""
+Benchmark Inventory
+Inventory operations on a full inventory
+"""
+
+import pytest
+
+import inventory_system
+from custom_exceptions import InventoryFullError
+from conftest import make_character
+
+# ============================================================================
+# INVENTORY BENCHMARKS
+# ============================================================================
+
+def test_add_item_last_slot(bench):
+    """Benchmark adding the item that fills the inventory"""
+    def setup():
+        character = make_character(inventory_size=inventory_system.MAX_INVENTORY_SIZE - 1)
+        return (character, "item_0"), {}
+
+    bench(inventory_system.add_item_to_inventory, setup=setup, rounds=200)
+
+def test_add_item_when_full(bench, full_inventory_character):
+    """Benchmark the InventoryFullError path"""
+    def add_rejected():
+        try:
+            inventory_system.add_item_to_inventory(full_inventory_character, "item_0")
+        except InventoryFullError:
+            return True
+        return False
+
+    assert bench(add_rejected)
+
+def test_remove_item_at_capacity(bench):
+    """Benchmark removing the last-added kind of item from a full inventory"""
+    def setup():
+        character = make_character(inventory_size=inventory_system.MAX_INVENTORY_SIZE)
+        return (character, "item_6"), {}
+
+    bench(inventory_system.remove_item_from_inventory, setup=setup, rounds=200)
+
+def test_count_item_at_capacity(bench, full_inventory_character):
+    """Benchmark counting an item in a full inventory"""
+    assert bench(inventory_system.count_item, full_inventory_character, "item_0") == 3
+
+def test_purchase_and_sell_transaction(bench):
+    """Benchmark a purchase and sale, each one transaction"""
+    character = make_character(inventory_size=inventory_system.MAX_INVENTORY_SIZE - 1)
+    character['gold'] = 1_000_000_000  # each round trip loses 5 gold
+    item = {'cost': 10}
+
+    def round_trip():
+        inventory_system.purchase_item(character, "item_0", item)
+        return inventory_system.sell_item(character, "item_0", item)
+
+    assert bench(round_trip) == 5
@@ -0,0 +1,23 @@
+"""
+Benchmark Quests
+get_available_quests against large quest catalogs
+"""
+
+import pytest
+
+import quest_handler
+from conftest import make_character, make_quest_dict
+
+# ============================================================================
+# QUEST BENCHMARKS
+# ============================================================================
+
+@pytest.mark.parametrize("count", [1_000, 10_000, 100_000])
+def test_get_available_quests(bench, count):
+    """Benchmark filtering available quests for a character with 200 completed"""
+    quests = make_quest_dict(count)
+    character = make_character(completed=200)
+
+    rounds = 3 if count >= 100_000 else None
+    available = bench(quest_handler.get_available_quests, character, quests, rounds=rounds)
+    assert available
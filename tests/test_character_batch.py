@@ -0,0 +1,62 @@
+"""
+Test Batch Character Loading and Saving
+Tests load_characters / save_characters used by server batch jobs
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from custom_exceptions import CharacterNotFoundError, InvalidSaveDataError
+
+# ============================================================================
+# BATCH SAVE / LOAD TESTS
+# ============================================================================
+
+def test_save_and_load_many_characters(tmp_path):
+    """Test that a batch save can be read back by a batch load"""
+    save_dir = str(tmp_path)
+    chars = [character_manager.create_character(f"Hero{i}", "Warrior") for i in range(25)]
+    chars[3]['inventory'] = ['health_potion', 'iron_sword']
+
+    assert character_manager.save_characters(chars, save_dir) == 25
+
+    names = [c['name'] for c in chars]
+    loaded = list(character_manager.load_characters(names, save_dir))
+
+    assert [c['name'] for c in loaded] == names
+    assert loaded[3]['inventory'] == ['health_potion', 'iron_sword']
+
+def test_load_all_characters(tmp_path):
+    """Test that names=None loads every save in the directory"""
+    save_dir = str(tmp_path)
+    for name in ("Alpha", "Beta", "Gamma"):
+        character_manager.save_character(character_manager.create_character(name, "Mage"), save_dir)
+
+    loaded = character_manager.load_characters(save_directory=save_dir)
+    assert sorted(c['name'] for c in loaded) == ["Alpha", "Beta", "Gamma"]
+
+def test_batch_load_collects_errors(tmp_path):
+    """Test that one bad save doesn't abort the batch when errors are collected"""
+    save_dir = str(tmp_path)
+    character_manager.save_character(character_manager.create_character("Good", "Rogue"), save_dir)
+    with open(os.path.join(save_dir, "Broken_save.txt"), "w") as f:
+        f.write("NAME: Broken\nLEVEL: not_a_number\n")
+
+    errors = {}
+    loaded = list(character_manager.load_characters(["Good", "Broken", "Missing"], save_dir, errors=errors))
+
+    assert [c['name'] for c in loaded] == ["Good"]
+    assert isinstance(errors["Broken"], InvalidSaveDataError)
+    assert isinstance(errors["Missing"], CharacterNotFoundError)
+
+def test_batch_load_raises_without_error_dict(tmp_path):
+    """Test that errors propagate when no error dictionary is given"""
+    with pytest.raises(CharacterNotFoundError):
+        list(character_manager.load_characters(["Nobody"], str(tmp_path)))
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,140 @@
+"""
+Test Character Class
+Tests that the slotted Character keeps dictionary-style compatibility
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+from character_manager import Character
+from custom_exceptions import InvalidSaveDataError
+
+# ============================================================================
+# CHARACTER CLASS TESTS
+# ============================================================================
+
+def test_create_character_returns_slotted_character():
+    """Test that create_character returns a Character without a __dict__"""
+    char = character_manager.create_character("SlotTest", "Cleric")
+
+    assert isinstance(char, Character)
+    assert not hasattr(char, '__dict__')
+    assert char['class'] == char.character_class == "Cleric"
+    assert char['health'] == char.health == 100
+
+def test_mapping_style_access():
+    """Test item get/set/contains/pop behave like the old dictionary"""
+    char = character_manager.create_character("MapTest", "Rogue")
+
+    char['gold'] += 50
+    assert char.gold == 150
+    assert 'inventory' in char
+    assert 'equipped_weapon' not in char
+    assert char.get('equipped_weapon') is None
+
+    char['equipped_weapon'] = 'iron_sword'
+    assert 'equipped_weapon' in char
+    assert char.pop('equipped_weapon') == 'iron_sword'
+    assert char.pop('equipped_weapon', None) is None
+
+    # Unknown keys go to the overflow dict
+    char['inventory_capacity'] = 30
+    assert char['inventory_capacity'] == 30
+    with pytest.raises(KeyError):
+        char['not_a_field']
+
+def test_equipment_works_with_character():
+    """Test that inventory_system's equipment helpers work on a Character"""
+    char = character_manager.create_character("GearTest", "Warrior")
+    inventory_system.add_item_to_inventory(char, "iron_sword")
+    inventory_system.equip_weapon(char, "iron_sword", {'type': 'weapon', 'effect': 'strength:5'})
+
+    assert char['strength'] == 20
+    assert inventory_system.unequip_weapon(char) == "iron_sword"
+    assert char['strength'] == 15
+
+def test_round_trip_through_dict():
+    """Test to_dict / from_dict preserve the character"""
+    char = character_manager.create_character("DictTest", "Mage")
+    char['inventory'].append('health_potion')
+
+    copy = Character.from_dict(char.to_dict())
+    assert copy == char
+    assert copy.to_dict() == char.to_dict()
+
+def test_validate_character_checks_types():
+    """Test validate_character_data still catches bad types on a Character"""
+    char = character_manager.create_character("TypeTest", "Warrior")
+    assert character_manager.validate_character_data(char) == True
+
+    char['gold'] = "lots"
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.validate_character_data(char)
+# ============================================================================
+# STAT MODIFIER TESTS
+# ============================================================================
+
+def test_modifiers_separate_base_and_effective_stats():
+    """Test bonuses show in char[stat] but not in the base value"""
+    char = character_manager.create_character("ModTest", "Warrior")
+    character_manager.set_modifier(char, 'weapon', [('strength', 5)])
+    character_manager.set_modifier(char, 'ring', [('strength', 2), ('magic', 3)])
+
+    assert char['strength'] == 22 and char.base('strength') == 15
+    assert char['magic'] == 8 and char.strength == 15
+
+    character_manager.remove_modifier(char, 'ring')
+    assert (char['strength'], char['magic']) == (20, 5)
+
+def test_writes_change_the_base_stat():
+    """Test level-ups and other writes keep the bonus separate"""
+    char = character_manager.create_character("LevelTest", "Warrior")
+    character_manager.set_modifier(char, 'weapon', [('strength', 5)])
+
+    character_manager.gain_experience(char, 100)
+    assert char.base('strength') == 17
+    assert char['strength'] == 22
+
+    character_manager.remove_modifier(char, 'weapon')
+    assert char['strength'] == 17
+
+def test_saves_store_base_stats(tmp_path):
+    """Test bonuses are not baked into the save file"""
+    char = character_manager.create_character("SaveMod", "Mage")
+    character_manager.set_modifier(char, 'armor', [('max_health', 25)])
+    char['health'] = 100
+    character_manager.save_character(char, str(tmp_path))
+
+    loaded = character_manager.load_character("SaveMod", str(tmp_path))
+    assert loaded['max_health'] == 80
+    assert loaded['health'] == 100  # current health is never a bonus
+
+def test_losing_max_health_bonus_clamps_health():
+    """Test removing a max_health bonus keeps health within the new max"""
+    char = character_manager.create_character("ClampTest", "Cleric")
+    character_manager.set_modifier(char, 'armor', [('max_health', 20)])
+    inventory_system.apply_stat_effect(char, 'health', 100)
+    assert char['health'] == 120
+
+    character_manager.remove_modifier(char, 'armor')
+    assert char['health'] == char['max_health'] == 100
+
+def test_modifiers_on_plain_dictionaries():
+    """Test dictionary characters get the bonus added to the stat itself"""
+    char = {'strength': 10, 'health': 50, 'max_health': 50}
+    character_manager.set_modifier(char, 'weapon', [('strength', 4)])
+    assert char['strength'] == 14
+    character_manager.remove_modifier(char, 'weapon')
+    assert char['strength'] == 10
+
+    with pytest.raises(ValueError):
+        character_manager.set_modifier(char, 'weapon', [('gold', 4)])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,90 @@
+"""
+Test Character Store
+Tests the columnar store used for population-wide stats
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from character_store import CharacterStore
+from custom_exceptions import CorruptedDataError
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def make_store():
+    """Build a store of 10 characters with gold 0, 10, ..., 90"""
+    store = CharacterStore()
+    for i in range(10):
+        char = character_manager.create_character(f"Hero{i}", "Warrior" if i % 2 else "Mage")
+        char['gold'] = i * 10
+        store.append(char)
+    return store
+
+# ============================================================================
+# CHARACTER STORE TESTS
+# ============================================================================
+
+def test_build_from_save_directory(tmp_path):
+    """Test building a store from saved characters"""
+    save_dir = str(tmp_path)
+    chars = [character_manager.create_character(f"Saved{i}", "Rogue") for i in range(5)]
+    character_manager.save_characters(chars, save_dir)
+
+    store = CharacterStore.from_save_directory(save_dir)
+    assert len(store) == 5
+    assert list(store.column('gold')) == [100] * 5
+
+def test_percentiles_and_histogram():
+    """Test percentile interpolation and histogram bin counts"""
+    store = make_store()
+
+    assert store.percentile('gold', 0) == 0
+    assert store.percentile('gold', 50) == 45
+    assert store.percentile('gold', 100) == 90
+
+    hist = store.histogram('gold', bins=3)
+    assert [count for _, _, count in hist] == [3, 3, 4]
+    assert store.count_between('gold', 20, 50) == 4
+
+def test_group_by_class():
+    """Test per-class summaries"""
+    groups = make_store().group_by_class('gold')
+
+    assert groups['Mage']['count'] == 5
+    assert groups['Mage']['total'] == 0 + 20 + 40 + 60 + 80
+    assert groups['Warrior']['max'] == 90
+
+def test_unknown_column():
+    """Test that only numeric character fields are columns"""
+    with pytest.raises(ValueError):
+        make_store().column('inventory')
+
+def test_save_and_load_store(tmp_path):
+    """Test the store round-trips through its single-file format"""
+    store = make_store()
+    filename = str(tmp_path / "characters.qcs")
+    store.save(filename)
+
+    loaded = CharacterStore.load(filename)
+    assert loaded.names == store.names
+    assert loaded.group_by_class('gold') == store.group_by_class('gold')
+
+    # Numbers are little-endian whatever machine wrote them
+    with open(filename, "rb") as f:
+        data = f.read()
+    assert list(store.columns)[-1] == 'gold'
+    assert data[-8:] == (90).to_bytes(8, 'little')
+
+    with open(filename, "r+b") as f:
+        f.write(b"XXXX")
+    with pytest.raises(CorruptedDataError):
+        CharacterStore.load(filename)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
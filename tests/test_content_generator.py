@@ -0,0 +1,89 @@
+"""
+Test Content Generator
+Tests generated quest/item files load and keep a valid prerequisite DAG
+"""
+
+import pytest
+import sys
+import os
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import content_generator
+import game_data
+import quest_handler
+from custom_exceptions import InvalidDataFormatError
+
+# ============================================================================
+# QUEST GENERATION TESTS
+# ============================================================================
+
+def test_generated_quests_load_and_validate(tmp_path):
+    """Test a generated quest file parses with load_quests"""
+    filename = str(tmp_path / "quests.txt")
+    assert content_generator.write_quest_file(filename, 2000, seed=4) == 2000
+
+    quests = game_data.load_quests(filename)
+    assert len(quests) == 2000
+    for quest in quests.values():
+        assert game_data.validate_quest_data(quest)
+    quest_handler.validate_quest_prerequisites(quests)
+
+def test_prerequisites_form_bounded_dag():
+    """Test prerequisites point backwards, respect max_depth and levels"""
+    seen = {}
+    deepest = 0
+    for quest in content_generator.generate_quests(5000, seed=1, chain_probability=0.9, max_depth=25):
+        prerequisite = quest['prerequisite']
+        depth = 0
+        if prerequisite != 'NONE':
+            assert prerequisite in seen
+            assert quest['required_level'] >= seen[prerequisite][1]
+            depth = seen[prerequisite][0] + 1
+        seen[quest['quest_id']] = (depth, quest['required_level'])
+        deepest = max(deepest, depth)
+
+    assert deepest == 24
+
+def test_same_seed_same_content():
+    """Test generation is reproducible"""
+    first = list(content_generator.generate_quests(50, seed=9))
+    assert first == list(content_generator.generate_quests(50, seed=9))
+    assert first != list(content_generator.generate_quests(50, seed=10))
+
+def test_generation_uses_constant_memory():
+    """Test memory doesn't grow with the number of records"""
+    tracemalloc.start()
+    for _ in content_generator.generate_quests(30_000, window=100):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak < 1_000_000
+
+# ============================================================================
+# ITEM GENERATION TESTS
+# ============================================================================
+
+def test_generated_items_follow_type_mix(tmp_path):
+    """Test items load and only use the requested types"""
+    filename = str(tmp_path / "items.txt")
+    mix = content_generator.parse_type_mix("weapon=1,armor=0")
+    content_generator.write_item_file(filename, 500, seed=2, type_mix=mix)
+
+    items = game_data.load_items(filename)
+    assert len(items) == 500
+    assert {item['type'] for item in items.values()} == {'weapon'}
+    for item in items.values():
+        assert game_data.validate_item_data(item)
+
+def test_invalid_type_mix():
+    """Test unknown item types are rejected"""
+    with pytest.raises(InvalidDataFormatError):
+        content_generator.parse_type_mix("shield=1")
+    with pytest.raises(InvalidDataFormatError):
+        next(content_generator.generate_items(1, type_mix={'weapon': 0}))
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
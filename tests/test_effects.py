@@ -0,0 +1,278 @@
+"""
+Test Effects
+Tests item effects are compiled at load time, applied from the compiled form,
+and that timed effects tick, stack and expire
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import content_generator
+import game_data
+import inventory_system
+import combat_system
+import game_server
+import game_cli
+from effects import (Effect, Stat, Clock, ActiveEffects, compile_effects, item_effects,
+                     get_active_effects)
+from game_io import ScriptedIO
+from custom_exceptions import InvalidDataFormatError
+
+# ============================================================================
+# COMPILING TESTS
+# ============================================================================
+
+def test_compile_single_and_multi_stat():
+    """Test effect text compiles to Stat/int pairs"""
+    assert compile_effects("health:20") == (Effect(Stat.HEALTH, 20),)
+    assert compile_effects(" strength : 5 , magic:-2") == (
+        Effect(Stat.STRENGTH, 5), Effect(Stat.MAGIC, -2))
+
+def test_compile_timed_effects():
+    """Test durations in turns (default or t) and actions (a)"""
+    assert compile_effects("strength:5:3,magic:-2:4a,health:5:2t") == (
+        Effect(Stat.STRENGTH, 5, 3, Clock.TURNS),
+        Effect(Stat.MAGIC, -2, 4, Clock.ACTIONS),
+        Effect(Stat.HEALTH, 5, 2, Clock.TURNS),
+    )
+
+@pytest.mark.parametrize("text", ["health", "speed:5", "health:lots", "", "magic:2:0", "magic:2:3x", "magic:2:a"])
+def test_compile_rejects_bad_effects(text):
+    """Test malformed effects raise ValueError"""
+    with pytest.raises(ValueError):
+        compile_effects(text)
+
+def test_load_items_compiles_effects(tmp_path):
+    """Test loaded items carry compiled effects and normalized text"""
+    filename = str(tmp_path / "items.txt")
+    with open(filename, 'w') as file:
+        file.write(content_generator.format_item_block({
+            'item_id': 'charm', 'name': 'Charm', 'type': 'armor',
+            'effect': 'max_health: 10, magic:3', 'cost': 40, 'description': 'x'}))
+
+    item = game_data.load_items(filename)['charm']
+    assert item['effects'] == (Effect(Stat.MAX_HEALTH, 10), Effect(Stat.MAGIC, 3))
+    assert item['effect'] == "max_health:10,magic:3"
+    assert game_data.validate_item_data(item)
+
+def test_unknown_stat_fails_at_load(tmp_path):
+    """Test an unknown stat is caught when the catalog loads"""
+    filename = str(tmp_path / "items.txt")
+    with open(filename, 'w') as file:
+        file.write(content_generator.format_item_block({
+            'item_id': 'boots', 'name': 'Boots', 'type': 'armor',
+            'effect': 'speed:3', 'cost': 40, 'description': 'x'}))
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_items(filename)
+
+# ============================================================================
+# APPLYING TESTS
+# ============================================================================
+
+def test_use_item_applies_every_modifier():
+    """Test a multi-stat consumable changes each stat"""
+    char = character_manager.create_character("Tonic", "Mage")
+    char['health'] = 50
+    inventory_system.add_item_to_inventory(char, "tonic")
+    item = {'name': 'Tonic', 'type': 'consumable', 'effects': compile_effects("health:20,magic:2")}
+
+    message = inventory_system.use_item(char, "tonic", item)
+
+    assert (char['health'], char['magic']) == (70, 22)
+    assert message == "used Tonic -> health + 20, magic + 2"
+
+def test_equip_and_unequip_multi_stat_armor():
+    """Test equipping applies and unequipping removes every modifier"""
+    char = character_manager.create_character("Plate", "Warrior")
+    before = (char['max_health'], char['strength'])
+    inventory_system.add_item_to_inventory(char, "plate")
+    item = {'name': 'Plate', 'type': 'armor', 'effect': 'max_health:25,strength:-2'}
+
+    message = inventory_system.equip_armor(char, "plate", item)
+    assert message == "equipped Plate (+25 max_health, -2 strength)"
+    assert (char['max_health'], char['strength']) == (before[0] + 25, before[1] - 2)
+
+    inventory_system.unequip_armor(char)
+    assert (char['max_health'], char['strength']) == before
+
+def test_item_effects_prefers_compiled_form():
+    """Test compiled effects are used without looking at the text"""
+    compiled = (Effect(Stat.STRENGTH, 7),)
+    assert item_effects({'effect': 'not parsed', 'effects': compiled}) is compiled
+
+def test_apply_stat_effect_accepts_names_and_stats():
+    """Test both 'health' and Stat.HEALTH dispatch, unknown stats fail"""
+    char = {'health': 10, 'max_health': 30}
+    inventory_system.apply_stat_effect(char, 'health', 5)
+    inventory_system.apply_stat_effect(char, Stat.HEALTH, 50)
+    assert char['health'] == 30
+    with pytest.raises(ValueError):
+        inventory_system.apply_stat_effect(char, 'speed', 1)
+
+# ============================================================================
+# TIMED EFFECT TESTS
+# ============================================================================
+
+def make_tracker():
+    """Returns: (character, its ActiveEffects)"""
+    char = character_manager.create_character("Timed", "Warrior")
+    return char, get_active_effects(char)
+
+def test_buff_expires_after_its_duration():
+    """Test a buff is applied, lasts N turns, then comes off"""
+    char, tracker = make_tracker()
+    base = char['strength']
+    tracker.add(Effect(Stat.STRENGTH, 5, 3), source="elixir")
+    assert char['strength'] == base + 5
+    assert char.base('strength') == base
+
+    assert tracker.tick() == [] and tracker.tick() == []
+    assert tracker.tick() == [Effect(Stat.STRENGTH, 5, 3)]
+    assert char['strength'] == base
+    assert len(tracker) == 0
+
+def test_health_over_time_applies_each_tick():
+    """Test timed health heals every turn and never gets taken back"""
+    char, tracker = make_tracker()
+    char['health'] = 50
+    tracker.add(Effect(Stat.HEALTH, 5, 3), source="regen")
+
+    tracker.tick(steps=2)
+    assert char['health'] == 60
+    tracker.tick(steps=5)
+    assert char['health'] == 65
+    assert tracker.active() == []
+
+def test_clocks_are_independent():
+    """Test action effects only expire on action ticks"""
+    char, tracker = make_tracker()
+    base = char['magic']
+    tracker.add(Effect(Stat.MAGIC, 4, 1, Clock.ACTIONS), source="focus")
+
+    tracker.tick(Clock.TURNS, 10)
+    assert char['magic'] == base + 4
+    tracker.tick(Clock.ACTIONS)
+    assert char['magic'] == base
+
+def test_stacking_rules():
+    """Test refresh replaces, stack adds up to MAX_STACKS, ignore keeps"""
+    char, tracker = make_tracker()
+    base = char['strength']
+
+    tracker.add(Effect(Stat.STRENGTH, 2, 2), "brew")
+    tracker.tick()
+    tracker.add(Effect(Stat.STRENGTH, 3, 2), "brew")  # refresh
+    assert char['strength'] == base + 3
+    tracker.tick()
+    assert char['strength'] == base + 3  # old copy was cancelled, not expired
+    tracker.tick()
+    assert char['strength'] == base
+
+    for _ in range(7):
+        tracker.add(Effect(Stat.STRENGTH, 1, 5), "brew", stacking='stack')
+    assert char['strength'] == base + 5
+
+    assert not tracker.add(Effect(Stat.STRENGTH, 9, 5), "brew", stacking='ignore')
+    tracker.clear()
+    assert char['strength'] == base
+    with pytest.raises(ValueError):
+        tracker.add(Effect(Stat.STRENGTH, 1, 1), "brew", stacking='sometimes')
+
+def test_tick_only_touches_due_effects():
+    """Test a tick does not visit effects that are not due yet"""
+    visited = []
+    tracker = ActiveEffects({}, apply=lambda character, stat, value: visited.append(value))
+    for i in range(1, 1001):
+        tracker.add(Effect(Stat.STRENGTH, i, i), source=i)
+    visited.clear()
+
+    tracker.tick()
+    assert visited == [-1]
+
+def test_use_item_starts_timed_effects_and_ticks_actions():
+    """Test use_item adds timed effects and counts as an action"""
+    char = character_manager.create_character("Brewer", "Mage")
+    base = char['magic']
+    item = {'name': 'Focus Draught', 'type': 'consumable', 'effect': 'magic:6:1a'}
+    for _ in range(2):
+        inventory_system.add_item_to_inventory(char, "draught")
+
+    message = inventory_system.use_item(char, "draught", item)
+    assert message == "used Focus Draught -> magic +6 for 1 actions"
+    assert char['magic'] == base + 6
+
+    # the second use ticks the first one off, then starts a new one
+    inventory_system.use_item(char, "draught", item)
+    assert char['magic'] == base + 6
+    assert len(char.effects) == 1
+
+def test_battle_ticks_turn_effects_and_ends_them():
+    """Test poison ticks each round and turn buffs end with the battle"""
+    char = character_manager.create_character("Fighter", "Warrior")
+    base = char['strength']
+    enemy = combat_system.create_enemy("dragon")
+    get_active_effects(enemy).add(Effect(Stat.HEALTH, -100, 3), source="venom")
+    get_active_effects(char).add(Effect(Stat.STRENGTH, 10, 99), source="rage")
+
+    io = ScriptedIO(["1", "1", "1"])
+    result = combat_system.SimpleBattle(char, enemy, io=io).start_battle()
+
+    assert result['winner'] == 'player'
+    assert char['strength'] == base
+    assert len(char.effects) == 0
+
+def test_auto_round_ticks_like_start_battle():
+    """Test auto-battle rounds tick turn and action effects"""
+    char = character_manager.create_character("Auto", "Warrior")
+    base = char['strength']
+    enemy = combat_system.create_enemy("dragon")
+    get_active_effects(char).add(Effect(Stat.STRENGTH, 5, 2), source="rage")
+    get_active_effects(char).add(Effect(Stat.MAGIC, 5, 1, Clock.ACTIONS), source="focus")
+    battle = combat_system.SimpleBattle(char, enemy, io=ScriptedIO(keep_output=False))
+
+    battle.auto_round()
+    assert char['strength'] == base + 5
+    assert len(char.effects) == 1
+    battle.auto_round()
+    assert char['strength'] == base
+    assert len(char.effects) == 0
+
+def test_server_explore_ends_turn_effects(tmp_path):
+    """Test a turn buff from USE wears off when the server's battle ends"""
+    import asyncio
+    items = {'rage': {'name': 'Rage Tonic', 'type': 'consumable', 'effect': 'strength:5:999', 'cost': 1}}
+
+    async def run():
+        server = game_server.GameServer(game_server.GameCatalog({}, items), str(tmp_path))
+        session = game_server.ServerSession(server)
+        await session.handle("NEW Berserker warrior")
+        base = session.character['strength']
+        inventory_system.add_item_to_inventory(session.character, 'rage')
+        await session.handle("USE rage")
+        buffed = session.character['strength']
+        explore = await session.handle("EXPLORE")
+        return base, buffed, explore, session.character
+
+    base, buffed, explore, char = asyncio.run(run())
+    assert buffed == base + 5
+    assert explore[-1] == "OK"
+    assert char['strength'] == base
+    assert len(char.effects) == 0
+
+def test_simulated_battles_end_turn_effects(monkeypatch):
+    """Test simulate clears turn effects instead of leaking them between battles"""
+    cleared = []
+    original = combat_system.SimpleBattle.end_turn_effects
+    monkeypatch.setattr(combat_system.SimpleBattle, "end_turn_effects",
+                        lambda battle: cleared.append(battle) or original(battle))
+    game_cli.simulate_battles("Warrior", "goblin", 3)
+    assert len(cleared) == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,198 @@
+"""
+Test Equipment
+Tests table-driven equipment slots: slot choice, atomic swaps, save/load of
+the equipment map and the legacy weapon/armor names
+"""
+
+import pytest
+import sys
+import os
+import random
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import game_data
+import game_server
+import inventory_system
+import main
+from game_io import ScriptedIO
+from custom_exceptions import InvalidDataFormatError, InvalidItemTypeError
+
+RING = {'item_id': 'ruby_ring', 'name': 'Ruby Ring', 'type': 'accessory',
+        'effect': 'strength:2', 'cost': 50, 'description': 'x'}
+SWORD = {'item_id': 'sword', 'name': 'Sword', 'type': 'weapon',
+         'effect': 'strength:5', 'cost': 50, 'description': 'x'}
+AXE = {'item_id': 'axe', 'name': 'Axe', 'type': 'weapon',
+       'effect': 'strength:8', 'cost': 80, 'description': 'x'}
+ITEMS = {'ruby_ring': RING, 'sword': SWORD, 'axe': AXE}
+
+
+def make_character(*item_ids):
+    """Returns: Warrior carrying item_ids"""
+    char = character_manager.create_character("Gearhand", "Warrior")
+    for item_id in item_ids:
+        inventory_system.add_item_to_inventory(char, item_id)
+    return char
+
+# ============================================================================
+# SLOT TESTS
+# ============================================================================
+
+def test_rings_fill_both_ring_slots():
+    """Test accessories go to ring_1, then ring_2, stacking their bonuses"""
+    char = make_character("ruby_ring", "ruby_ring")
+    base = char['strength']
+
+    inventory_system.equip_item(char, "ruby_ring", RING)
+    inventory_system.equip_item(char, "ruby_ring", RING)
+
+    assert char['equipment'] == {'ring_1': 'ruby_ring', 'ring_2': 'ruby_ring'}
+    assert char['strength'] == base + 4
+    assert char['inventory'] == []
+
+def test_explicit_slot_must_fit():
+    """Test a requested slot is used, and one that doesn't fit is refused"""
+    char = make_character("ruby_ring", "sword")
+    inventory_system.equip_item(char, "ruby_ring", RING, slot="ring_2")
+    assert char['equipment'] == {'ring_2': 'ruby_ring'}
+
+    with pytest.raises(InvalidItemTypeError):
+        inventory_system.equip_item(char, "sword", SWORD, slot="head")
+    with pytest.raises(ValueError):
+        inventory_system.unequip_slot(char, "tail")
+
+def test_swap_with_full_inventory():
+    """Test the old item takes the new one's inventory place"""
+    char = make_character("sword", "axe")
+    inventory_system.equip_item(char, "sword", SWORD)
+    while inventory_system.get_inventory_space_remaining(char):
+        inventory_system.add_item_to_inventory(char, "pebble")
+    base = char.base('strength')
+
+    inventory_system.equip_item(char, "axe", AXE)
+
+    assert char['equipment'] == {'main_hand': 'axe'}
+    assert char['inventory'][0] == "sword"
+    assert char['strength'] == base + 8
+
+def test_legacy_names_read_the_slot_map():
+    """Test equipped_weapon/equipped_armor still work as slot aliases"""
+    char = make_character("sword")
+    inventory_system.equip_weapon(char, "sword", SWORD)
+    assert char['equipped_weapon'] == "sword"
+    assert char.get('equipped_armor') is None
+
+    inventory_system.unequip_weapon(char)
+    assert char.get('equipped_weapon') is None
+    assert "sword" in char['inventory']
+
+def test_slot_field_is_validated():
+    """Test an item's SLOT must exist and accept its type"""
+    assert game_data.validate_item_data(dict(RING, slot='neck'))
+    with pytest.raises(InvalidDataFormatError):
+        game_data.validate_item_data(dict(RING, slot='tail'))
+    with pytest.raises(InvalidDataFormatError):
+        game_data.validate_item_data(dict(RING, slot='main_hand'))
+
+def test_equipment_cannot_change_health():
+    """Test health effects are rejected on equipment, in data and when equipping"""
+    cursed = dict(SWORD, effect='strength:5,health:5')
+    with pytest.raises(InvalidDataFormatError):
+        game_data.validate_item_data(cursed)
+    assert game_data.validate_item_data(dict(SWORD, type='consumable', effect='health:5'))
+
+    char = make_character("cursed")
+    base = char['strength']
+    with pytest.raises(InvalidItemTypeError):
+        inventory_system.equip_item(char, "cursed", cursed)
+    assert char['inventory'] == ["cursed"]
+    assert char['strength'] == base
+
+    # A save that already has one equipped loads without its bonus
+    char['equipment'] = {'main_hand': 'cursed'}
+    assert inventory_system.apply_equipment_bonuses(char, {'cursed': cursed}) == ['main_hand']
+    assert char['strength'] == base
+
+def test_equip_menu_reports_unequippable_items(tmp_path):
+    """Test the interactive game shows an error instead of crashing"""
+    io = ScriptedIO(["1"])
+    session = main.GameSession(io=io, save_directory=str(tmp_path))
+    session.items = {'cursed': dict(SWORD, effect='health:5')}
+    session.character = make_character("cursed")
+
+    main.use_item_menu(session, "cursed")
+
+    assert 'cannot be equipped: equipment cannot change health' in io.output
+
+# ============================================================================
+# SAVE AND SCREEN TESTS
+# ============================================================================
+
+def test_equipment_round_trips_through_saves(tmp_path):
+    """Test saves keep slot IDs and base stats; bonuses come back on load"""
+    char = make_character("ruby_ring", "sword")
+    base = char.base('strength')
+    inventory_system.equip_item(char, "ruby_ring", RING)
+    inventory_system.equip_item(char, "sword", SWORD)
+    character_manager.save_character(char, str(tmp_path))
+
+    loaded = character_manager.load_character("Gearhand", str(tmp_path))
+    assert loaded['equipment'] == {'ring_1': 'ruby_ring', 'main_hand': 'sword'}
+    assert loaded['strength'] == base
+
+    assert inventory_system.apply_equipment_bonuses(loaded, {'sword': SWORD}) == ['ring_1']
+    assert loaded['strength'] == base + 5
+
+def test_dict_character_bonus_is_not_saved(tmp_path):
+    """Test a plain dictionary character saves base stats, so reloading doesn't double a bonus"""
+    char = make_character("sword").to_dict()
+    base = char['strength']
+    inventory_system.equip_item(char, "sword", SWORD)
+    assert char['strength'] == base + 5
+    character_manager.save_character(char, str(tmp_path))
+
+    loaded = character_manager.load_character("Gearhand", str(tmp_path))
+    assert loaded['strength'] == base
+    assert inventory_system.apply_equipment_bonuses(loaded, ITEMS) == []
+    assert loaded['strength'] == base + 5
+
+def test_stats_screen_lists_every_slot(tmp_path):
+    """Test the stats screen shows each slot, empty or not"""
+    io = ScriptedIO([""])
+    session = main.GameSession(rng=random.Random(1), io=io, save_directory=str(tmp_path))
+    session.items = ITEMS
+    session.character = make_character("ruby_ring")
+    inventory_system.equip_item(session.character, "ruby_ring", RING)
+
+    main.view_character_stats(session)
+
+    assert "  ring 1: Ruby Ring" in io.output
+    assert "  main hand: none" in io.output
+
+def test_server_equip_and_unequip(tmp_path):
+    """Test EQUIP takes an optional slot and UNEQUIP empties one"""
+    async def run():
+        server = game_server.GameServer(game_server.GameCatalog({}, ITEMS), str(tmp_path))
+        session = game_server.ServerSession(server)
+        await session.handle("NEW Ringo warrior")
+        inventory_system.add_item_to_inventory(session.character, "ruby_ring")
+        return [
+            await session.handle("EQUIP ruby_ring head"),
+            await session.handle("EQUIP ruby_ring ring_2"),
+            await session.handle("STATS"),
+            await session.handle("UNEQUIP ring_2"),
+            await session.handle("UNEQUIP ring_2"),
+        ]
+
+    bad_slot, equipped, stats, unequipped, empty = asyncio.run(run())
+    assert bad_slot[-1].startswith("ERR")
+    assert equipped[0] == "equipped Ruby Ring (+2 strength)"
+    assert "ring_2: Ruby Ring" in stats
+    assert unequipped[0] == "unequipped ruby_ring from ring_2"
+    assert empty[0] == "ring_2 is empty"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,135 @@
+"""
+Test Game CLI
+Tests the non-interactive operations subcommands and their JSON Lines output
+"""
+
+import pytest
+import sys
+import os
+import io
+import json
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import content_generator
+import game_cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_cli(capsys, *argv):
+    """Returns: (exit code, list of JSON records printed)"""
+    code = game_cli.main(list(argv))
+    out = capsys.readouterr().out
+    return code, [json.loads(line) for line in out.splitlines()]
+
+
+@pytest.fixture
+def save_dir(tmp_path):
+    """Save directory with two characters"""
+    directory = str(tmp_path / "saves")
+    for name, character_class in [("Ayla", "Mage"), ("Brom", "Warrior")]:
+        character_manager.save_character(character_manager.create_character(name, character_class), directory)
+    return directory
+
+# ============================================================================
+# DATA AND SAVE COMMANDS
+# ============================================================================
+
+def test_validate_data_reports_each_file(capsys, tmp_path):
+    """Test good files pass and a broken prerequisite fails the run"""
+    good = str(tmp_path / "quests.txt")
+    content_generator.write_quest_file(good, 50, seed=2)
+    items = str(tmp_path / "items.txt")
+    content_generator.write_item_file(items, 20, seed=2)
+    broken = str(tmp_path / "broken.txt")
+    with open(broken, 'w') as file:
+        file.write(content_generator.format_quest_block({
+            'quest_id': 'lost', 'title': 'Lost', 'description': 'x', 'reward_xp': 1,
+            'reward_gold': 1, 'required_level': 1, 'prerequisite': 'missing'}))
+
+    code, records = run_cli(capsys, "validate-data", "--quests", good, "--quests", broken, "--items", items)
+
+    assert code == 1
+    assert [(r['file'], r['ok']) for r in records] == [(good, True), (broken, False), (items, True)]
+    assert records[0]['records'] == 50
+    assert records[1]['error'] == 'QuestNotFoundError'
+
+def test_list_saves_and_show_character(capsys, save_dir):
+    """Test saves are listed and characters are printed as save data"""
+    code, records = run_cli(capsys, "list-saves", "--save-dir", save_dir)
+    assert code == 0
+    assert [(r['name'], r['status']) for r in records] == [("Ayla", "ok"), ("Brom", "ok")]
+
+    code, records = run_cli(capsys, "show-character", "Brom", "Nobody", "--save-dir", save_dir)
+    assert code == 1
+    assert records[0]['character']['class'] == "Warrior"
+    assert records[1] == {'name': "Nobody", 'ok': False, 'error': 'CharacterNotFoundError',
+                          'message': 'No save file found for Nobody'}
+
+def test_names_can_come_from_stdin(capsys, save_dir, monkeypatch):
+    """Test '-' reads one name per line"""
+    monkeypatch.setattr(sys, 'stdin', io.StringIO("Ayla\n\nBrom\n"))
+    code, records = run_cli(capsys, "show-character", "-", "--save-dir", save_dir)
+    assert code == 0
+    assert [r['name'] for r in records] == ["Ayla", "Brom"]
+
+def test_show_character_reports_in_input_order(capsys, save_dir):
+    """Test failed loads are printed where they occur, not saved for the end"""
+    code, records = run_cli(capsys, "show-character", "Nobody", "Ayla", "Ghost", "Brom", "--save-dir", save_dir)
+    assert code == 1
+    assert [(r['name'], r['ok']) for r in records] == [
+        ("Nobody", False), ("Ayla", True), ("Ghost", False), ("Brom", True)]
+
+def test_migrate_saves_adds_checksum(capsys, save_dir):
+    """Test old saves are rewritten and current ones are left alone"""
+    filename = os.path.join(save_dir, "Ayla_save.txt")
+    with open(filename) as file:
+        lines = [line for line in file if not line.startswith("CHECKSUM:")]
+    with open(filename, 'w') as file:
+        file.writelines(lines)
+
+    code, records = run_cli(capsys, "migrate-saves", "--save-dir", save_dir, "--dry-run")
+    assert code == 0
+    assert [r['status'] for r in records] == ['would_migrate', 'current']
+    assert character_manager.check_save_file(filename) == 'legacy'
+
+    code, records = run_cli(capsys, "migrate-saves", "--save-dir", save_dir)
+    assert [r['status'] for r in records] == ['migrated', 'current']
+    assert character_manager.check_save_file(filename) == 'ok'
+
+# ============================================================================
+# SIMULATION AND PROCESS TESTS
+# ============================================================================
+
+def test_simulate_is_repeatable(capsys):
+    """Test the same seed gives the same results for every pair"""
+    argv = ("simulate", "--class", "Warrior", "--enemy", "goblin", "--enemy", "dragon", "--battles", "20")
+    code, first = run_cli(capsys, *argv)
+    _, second = run_cli(capsys, *argv)
+
+    assert code == 0
+    assert first == second
+    assert [r['enemy'] for r in first] == ["goblin", "dragon"]
+    assert first[0]['wins'] + first[0]['losses'] + first[0]['draws'] == 20
+
+def test_simulate_unknown_enemy_fails(capsys):
+    """Test an unknown enemy is reported and fails the run"""
+    code, records = run_cli(capsys, "simulate", "--class", "Rogue", "--enemy", "slime", "--battles", "1")
+    assert code == 1
+    assert records[0]['error'] == 'InvalidTargetError'
+
+def test_main_py_dispatches_commands(tmp_path):
+    """Test `python main.py <command>` runs the command, not the game"""
+    proc = subprocess.run(
+        [sys.executable, "main.py", "list-saves", "--save-dir", str(tmp_path)],
+        capture_output=True, text=True, cwd=ROOT, timeout=60,
+    )
+    assert proc.returncode == 0
+    assert proc.stdout == ""
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
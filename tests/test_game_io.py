@@ -0,0 +1,94 @@
+"""
+Test Game I/O
+Tests the I/O adapters and that menus and battles run through them
+"""
+
+import pytest
+import sys
+import os
+import io
+import random
+import socket
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+import combat_system
+import character_manager
+from game_io import ConsoleIO, ScriptedIO, SocketIO
+
+# ============================================================================
+# ADAPTER TESTS
+# ============================================================================
+
+def test_output_is_buffered_per_screen():
+    """Test lines are sent as one block when input is requested"""
+    scripted = ScriptedIO(["yes"])
+    scripted.write("line one")
+    scripted.write("line two")
+    assert scripted.screens == []
+
+    assert scripted.read("? ") == "yes"
+    assert scripted.screens == ["line one\nline two\n"]
+    assert scripted.prompts == ["? "]
+
+def test_scripted_io_raises_eof_when_exhausted():
+    """Test running out of answers ends the game like a closed terminal"""
+    with pytest.raises(EOFError):
+        ScriptedIO().read("> ")
+
+def test_console_io_streams():
+    """Test console adapter against in-memory streams"""
+    stdout = io.StringIO()
+    console = ConsoleIO(stdin=io.StringIO("2\n"), stdout=stdout)
+    console.write("menu")
+
+    assert console.read("> ") == "2"
+    assert stdout.getvalue() == "menu\n> "
+    with pytest.raises(EOFError):
+        console.read("> ")
+
+def test_socket_io_round_trip():
+    """Test socket adapter sends a screen and reads one line per answer"""
+    server_side, client_side = socket.socketpair()
+    try:
+        adapter = SocketIO(server_side)
+        client_side.sendall(b"3\r\n")
+        adapter.write("hello")
+
+        assert adapter.read("> ") == "3"
+        adapter.close()
+        assert client_side.recv(1024) == b"hello\n> "
+    finally:
+        server_side.close()
+        client_side.close()
+
+# ============================================================================
+# MENU AND BATTLE TESTS
+# ============================================================================
+
+def test_battle_reads_and_writes_through_adapter():
+    """Test a battle runs without a terminal"""
+    scripted = ScriptedIO(["1"] * 50)
+    character = character_manager.create_character("Dax", "Warrior")
+    battle = combat_system.SimpleBattle(character, combat_system.create_enemy("goblin"), io=scripted)
+
+    result = battle.start_battle()
+
+    assert result['winner'] == 'player'
+    assert "=== BATTLE START ===" in scripted.output
+    assert scripted.prompts[0] == "> "
+
+def test_game_loop_runs_on_scripted_io(tmp_path):
+    """Test a new game played through to quit"""
+    scripted = ScriptedIO(["Ema", "cleric", "1", "", "6"])
+    session = main.GameSession(rng=random.Random(3), io=scripted, save_directory=str(tmp_path))
+    main.load_game_data(session)
+
+    main.new_game(session)
+
+    assert "class: Cleric" in scripted.output
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Ema"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
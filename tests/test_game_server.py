@@ -0,0 +1,159 @@
+"""
+Test Game Server
+Tests the line protocol and concurrent sessions of the asyncio server
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_server
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+async def send(reader, writer, line):
+    """Send one command and collect the response up to OK/ERR"""
+    writer.write((line + "\n").encode())
+    await writer.drain()
+    lines = []
+    while True:
+        reply = (await reader.readline()).decode().rstrip("\n")
+        lines.append(reply)
+        if reply == "OK" or reply.startswith("ERR"):
+            return lines
+
+# ============================================================================
+# SERVER TESTS
+# ============================================================================
+
+def test_many_sessions_share_one_catalog(tmp_path):
+    """Test several clients playing at once with their own characters"""
+    async def run():
+        server = game_server.GameServer(game_server.GameCatalog.load(), str(tmp_path))
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+
+        async def play(name):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            await reader.readline()  # banner
+            assert (await send(reader, writer, f"NEW {name} warrior"))[-1] == "OK"
+            assert (await send(reader, writer, "ACCEPT first_steps"))[-1] == "OK"
+            assert (await send(reader, writer, "BUY health_potion"))[-1] == "OK"
+            assert (await send(reader, writer, "EXPLORE"))[-1] == "OK"
+            stats = await send(reader, writer, "STATS")
+            await send(reader, writer, "QUIT")
+            writer.close()
+            return stats
+
+        results = await asyncio.gather(*(play(f"Player{i}") for i in range(5)))
+        listener.close()
+        await listener.wait_closed()
+        return server, results
+
+    server, results = asyncio.run(run())
+
+    for i, stats in enumerate(results):
+        assert f"name: Player{i}" in stats
+    assert server.active_names == set()
+    assert len(os.listdir(tmp_path)) == 5
+
+def test_protocol_errors():
+    """Test that bad commands get ERR replies instead of closing the session"""
+    async def run():
+        server = game_server.GameServer(game_server.GameCatalog({}, {}))
+        session = game_server.ServerSession(server)
+        return [
+            await session.handle("DANCE"),
+            await session.handle("STATS"),
+            await session.handle("NEW onlyname"),
+            await session.handle("NEW Hero Bard"),
+        ]
+
+    unknown, no_character, bad_args, bad_class = asyncio.run(run())
+    assert unknown[0].startswith("ERR unknown command")
+    assert no_character[0].startswith("ERR no character")
+    assert bad_args[0].startswith("ERR wrong arguments")
+    assert bad_class[0].startswith("ERR Invalid class")
+
+@pytest.mark.parametrize("name", ["../escaped", "a/b", "..", "bad.name", "white\\space"])
+def test_unsafe_names_are_rejected(tmp_path, name):
+    """Test names that could leave the save directory never reach the disk"""
+    save_dir = tmp_path / "saves"
+    save_dir.mkdir()
+
+    async def run():
+        session = game_server.ServerSession(game_server.GameServer(game_server.GameCatalog({}, {}), str(save_dir)))
+        return await session.handle(f"NEW {name} warrior"), await session.handle(f"LOAD {name}"), session
+
+    new, load, session = asyncio.run(run())
+    assert new[0].startswith("ERR names may only use")
+    assert load[0].startswith("ERR names may only use")
+    assert session.character is None
+    assert sorted(os.listdir(tmp_path)) == ["saves"]
+    assert os.listdir(save_dir) == []
+
+def test_new_refuses_existing_save(tmp_path):
+    """Test NEW can't overwrite another player's save"""
+    async def run():
+        server = game_server.GameServer(game_server.GameCatalog({}, {}), str(tmp_path))
+        first, second = game_server.ServerSession(server), game_server.ServerSession(server)
+        await first.handle("NEW Hero warrior")
+        await first.handle("QUIT")
+        refused = await second.handle("NEW Hero mage")
+        loaded = await second.handle("LOAD Hero")
+        return refused, loaded, second.character
+
+    refused, loaded, character = asyncio.run(run())
+    assert refused[0] == "ERR Hero already exists (use LOAD)"
+    assert loaded == ["loaded Hero", "OK"]
+    assert character['class'] == "Warrior"
+
+def test_save_errors_become_err_lines(tmp_path):
+    """Test an unwritable save directory gives ERR instead of dropping the session"""
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+
+    async def run():
+        server = game_server.GameServer(game_server.GameCatalog({}, {}), str(blocker))
+        session = game_server.ServerSession(server)
+        new = await session.handle("NEW Hero warrior")
+        await session.release()  # nothing loaded, so nothing to save
+        return new, session, server
+
+    new, session, server = asyncio.run(run())
+    assert new[0].startswith("ERR could not access save file")
+    assert session.character is None
+    assert server.active_names == set()
+
+def test_disconnect_releases_character_when_save_fails(tmp_path):
+    """Test a failed save on disconnect still frees the name and closes cleanly"""
+    async def run():
+        server = game_server.GameServer(game_server.GameCatalog({}, {}), str(tmp_path))
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await reader.readline()
+        created = await send(reader, writer, "NEW Hero warrior")
+        (tmp_path / "blocker").write_text("")
+        server.save_directory = str(tmp_path / "blocker" / "saves")
+        writer.close()
+        for _ in range(100):
+            if not server.sessions:
+                break
+            await asyncio.sleep(0.01)
+        listener.close()
+        await listener.wait_closed()
+        return created, server
+
+    created, server = asyncio.run(run())
+    assert created[-1] == "OK"
+    assert server.sessions == set()
+    assert server.active_names == set()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,57 @@
+"""
+Test Game Session
+Tests that main.py menus run against a GameSession instead of globals
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+import character_manager
+from game_io import ScriptedIO
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def scripted_session(answers, save_directory):
+    """Build a session that reads answers from a list and records output"""
+    io = ScriptedIO(answers)
+    session = main.GameSession(rng=random.Random(1), io=io, save_directory=save_directory)
+    main.load_game_data(session)
+    return session, io
+
+# ============================================================================
+# GAME SESSION TESTS
+# ============================================================================
+
+def test_two_sessions_are_independent(tmp_path):
+    """Test two games played in one interpreter don't share state"""
+    save_dir = str(tmp_path)
+    first, first_out = scripted_session(["Ayla", "mage", "1", "", "6"], save_dir)
+    second, second_out = scripted_session(["Bram", "warrior", "6"], save_dir)
+
+    main.new_game(first)
+    main.new_game(second)
+
+    assert first.character['name'] == "Ayla"
+    assert second.character['name'] == "Bram"
+    assert "class: Mage" in first_out.output
+    assert not first.running and not second.running
+    assert sorted(character_manager.list_saved_characters(save_dir)) == ["Ayla", "Bram"]
+
+def test_menus_use_session_catalog(tmp_path):
+    """Test quest menus read the session's catalogs"""
+    session, output = scripted_session(["2", "", "7"], str(tmp_path))
+    session.character = character_manager.create_character("Cato", "Rogue")
+
+    main.quest_menu(session)
+
+    assert "First Steps (level 1)" in output.output
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,91 @@
+"""
+Test Item Catalog
+Tests the secondary indexes load_items builds and the queries over them
+"""
+
+import pytest
+import sys
+import os
+import pickle
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import content_generator
+import game_data
+from effects import Stat
+
+
+@pytest.fixture(scope="module")
+def catalog(tmp_path_factory):
+    """Generated catalog of 2000 items loaded from a file"""
+    filename = str(tmp_path_factory.mktemp("items") / "items.txt")
+    content_generator.write_item_file(filename, 2000, seed=4)
+    return game_data.load_items(filename)
+
+
+def brute_force(items, item_type=None, stat=None, min_cost=None, max_cost=None):
+    """Returns: Set of item IDs matching the filters, by scanning every item"""
+    return {
+        item_id for item_id, item in items.items()
+        if (item_type is None or item['type'] == item_type)
+        and (stat is None or any(effect.stat == stat for effect in item['effects']))
+        and (min_cost is None or item['cost'] >= min_cost)
+        and (max_cost is None or item['cost'] <= max_cost)
+    }
+
+# ============================================================================
+# INDEX TESTS
+# ============================================================================
+
+def test_load_items_returns_indexed_dictionary(catalog):
+    """Test the catalog is still a dictionary and carries its index"""
+    assert isinstance(catalog, dict)
+    assert isinstance(catalog.index, game_data.ItemIndex)
+    assert game_data.item_index(catalog) is catalog.index
+    assert sum(len(ids) for ids in catalog.index.types.values()) == len(catalog)
+
+def test_single_indexes(catalog):
+    """Test type, stat and cost lookups match a full scan"""
+    index = catalog.index
+    assert set(index.of_type('consumable')) == brute_force(catalog, item_type='consumable')
+    assert set(index.affecting('strength')) == brute_force(catalog, stat=Stat.STRENGTH)
+    assert index.affecting(Stat.STRENGTH) == index.affecting('strength')
+
+    cheap = index.cost_range(max_cost=100)
+    assert set(cheap) == brute_force(catalog, max_cost=100)
+    assert [catalog[item_id]['cost'] for item_id in cheap] == sorted(catalog[item_id]['cost'] for item_id in cheap)
+
+@pytest.mark.parametrize("filters", [
+    {'item_type': 'weapon', 'stat': 'strength'},
+    {'item_type': 'consumable', 'max_cost': 100},
+    {'stat': 'magic', 'min_cost': 50, 'max_cost': 200},
+    {'item_type': 'armor', 'stat': 'max_health', 'min_cost': 100},
+    {'item_type': 'relic'},
+    {'min_cost': 10**9},
+    {},
+])
+def test_query_matches_full_scan(catalog, filters):
+    """Test combined filters give exactly the brute-force answer"""
+    result = catalog.index.query(**filters)
+    assert len(result) == len(set(result))
+    assert set(result) == brute_force(catalog, **filters)
+
+def test_plain_dictionaries_are_indexed_on_demand():
+    """Test hand-built catalogs (no EFFECT text needed) can be queried too"""
+    items = {
+        'potion': {'type': 'consumable', 'effect': 'health:20', 'cost': 25},
+        'stone': {'type': 'consumable', 'cost': 1},
+    }
+    index = game_data.item_index(items)
+    assert index.query(item_type='consumable', max_cost=10) == ['stone']
+    assert index.affecting('health') == ('potion',)
+
+def test_catalog_pickles_with_its_index(catalog):
+    """Test catalogs survive being sent to worker processes"""
+    copy = pickle.loads(pickle.dumps(catalog))
+    assert copy == catalog
+    assert copy.index.query(item_type='weapon') == catalog.index.query(item_type='weapon')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
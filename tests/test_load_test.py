@@ -0,0 +1,47 @@
+"""
+Test Load Test
+Tests the scripted load generator against the real menus
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import load_test
+import character_manager
+
+# ============================================================================
+# LOAD TEST TESTS
+# ============================================================================
+
+def test_players_finish_full_sessions(tmp_path):
+    """Test every player creates a character and each action is timed"""
+    report = load_test.run_load_test(players=6, workers=3, seed=2, save_directory=str(tmp_path))
+
+    assert report['players'] == 6
+    assert report['actions']['new_game']['count'] == 6
+    assert report['actions']['shop']['count'] == 6
+    assert report['sessions_per_second'] > 0
+    assert len(character_manager.list_saved_characters(str(tmp_path))) == 6
+    assert report['save_bytes'] > 0
+
+def test_same_seed_replays_same_games(tmp_path):
+    """Test seeded runs produce the same actions and outcomes"""
+    first = load_test.run_load_test(players=5, workers=5, seed=7, save_directory=str(tmp_path / "a"))
+    second = load_test.run_load_test(players=5, workers=1, seed=7, save_directory=str(tmp_path / "b"))
+
+    assert first['deaths'] == second['deaths']
+    assert {a: s['count'] for a, s in first['actions'].items()} == \
+           {a: s['count'] for a, s in second['actions'].items()}
+
+def test_percentile_nearest_rank():
+    """Test percentile helper"""
+    values = list(range(1, 101))
+    assert load_test.percentile(values, 50) == 50
+    assert load_test.percentile(values, 99) == 99
+    assert load_test.percentile([], 50) == 0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
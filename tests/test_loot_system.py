@@ -0,0 +1,142 @@
+"""
+Test Loot System
+Tests alias-method sampling, loot table bands and putting drops in the
+inventory
+"""
+
+import pytest
+import sys
+import os
+import json
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+import game_cli
+import inventory_system
+import loot_system
+from loot_system import AliasTable, LootBand, LootRule
+from custom_exceptions import InvalidTargetError
+
+ITEMS = {
+    'potion': {'name': 'Potion', 'type': 'consumable', 'cost': 20},
+    'big_potion': {'name': 'Big Potion', 'type': 'consumable', 'cost': 60},
+    'sword': {'name': 'Sword', 'type': 'weapon', 'cost': 100},
+}
+
+TABLES = {
+    'goblin': [
+        LootBand(1, 1, 50, [LootRule(50, 'consumable', max_cost=30)]),
+        LootBand(4, 2, 0, [LootRule(30, 'consumable'), LootRule(10, 'weapon')]),
+    ],
+}
+
+# ============================================================================
+# ALIAS METHOD TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("weights", [[1], [1, 1], [5, 1, 0, 4], [0.1, 0.7, 0.2], [1, 2, 3, 4, 5, 6, 7]])
+def test_alias_table_probabilities_are_exact(weights):
+    """Test the columns add up to exactly weight / total for every outcome"""
+    table = AliasTable(weights)
+    n = len(table)
+    chance = [0.0] * n
+    for i in range(n):
+        chance[i] += table.prob[i] / n
+        chance[table.alias[i]] += (1 - table.prob[i]) / n
+    total = sum(weights)
+    assert chance == pytest.approx([weight / total for weight in weights])
+
+def test_sampling_follows_the_weights():
+    """Test single and batch samples land in proportion to the weights"""
+    table = AliasTable([6, 3, 1])
+    batch = table.sample_many(100_000, random.Random(1))
+    single = [table.sample(random.Random(seed)) for seed in range(2000)]
+
+    for samples in (batch, single):
+        shares = [samples.count(i) / len(samples) for i in range(3)]
+        assert shares == pytest.approx([0.6, 0.3, 0.1], abs=0.03)
+    assert 2 not in AliasTable([1, 1, 0]).sample_many(1000, random.Random(2))
+
+@pytest.mark.parametrize("weights", [[], [0, 0], [1, -1]])
+def test_alias_table_rejects_bad_weights(weights):
+    """Test empty, all-zero and negative weights raise ValueError"""
+    with pytest.raises(ValueError):
+        AliasTable(weights)
+
+# ============================================================================
+# LOOT TABLE TESTS
+# ============================================================================
+
+def test_rules_resolve_through_the_catalog():
+    """Test a rule's weight is shared by the catalog items it matches"""
+    tables = loot_system.LootTables(ITEMS, TABLES)
+    low = tables.table_for('goblin', 3)
+    assert low.chances == {None: 0.5, 'potion': 0.5}
+
+    high = tables.table_for('Goblin', 9)
+    assert high.rolls == 2
+    assert high.chances == pytest.approx({'potion': 0.375, 'big_potion': 0.375, 'sword': 0.25})
+    assert tables.table_for('orc', 1) is None
+
+def test_roll_uses_enemy_type_and_level():
+    """Test enemies from create_enemy pick their band's table"""
+    tables = loot_system.LootTables(ITEMS, TABLES)
+    rng = random.Random(3)
+    assert all(len(tables.roll(combat_system.create_enemy('goblin', 5), rng)) == 2 for _ in range(50))
+    assert tables.roll(combat_system.create_enemy('orc', 5), rng) == []
+
+def test_simulate_counts_drops():
+    """Test batch simulation matches the table's chances"""
+    tables = loot_system.LootTables(ITEMS, TABLES)
+    drops = tables.simulate('goblin', 1, 20_000, random.Random(4))
+    assert set(drops) == {'potion'}
+    assert drops['potion'] / 20_000 == pytest.approx(0.5, abs=0.02)
+    with pytest.raises(InvalidTargetError):
+        tables.simulate('slime', 1, 10)
+
+def test_default_tables_build_for_the_game_catalog():
+    """Test every default band has drops in the shipped item catalog"""
+    import game_data
+    tables = loot_system.LootTables(game_data.load_items())
+    for enemy_type, bands in tables.bands.items():
+        for min_level, table in bands:
+            assert len(table.outcomes) > 1, (enemy_type, min_level)
+
+# ============================================================================
+# AWARDING TESTS
+# ============================================================================
+
+def test_award_loot_stops_when_full():
+    """Test drops go in until the inventory is full and the rest are left"""
+    char = character_manager.create_character("Looter", "Rogue")
+    while inventory_system.get_inventory_space_remaining(char) > 1:
+        inventory_system.add_item_to_inventory(char, 'pebble')
+
+    added, left_behind = loot_system.award_loot(char, ['potion', 'sword', 'potion'])
+
+    assert added == ['potion']
+    assert left_behind == ['sword', 'potion']
+    assert char['inventory'][-1] == 'potion'
+    assert inventory_system.get_inventory_space_remaining(char) == 0
+
+def test_cli_loot(capsys):
+    """Test the loot subcommand prints drop counts per item"""
+    code = game_cli.main(["loot", "--enemy", "goblin", "--kills", "1000", "--seed", "1"])
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert code == 0
+    assert {r['item'] for r in records} == {'health_potion', 'iron_sword'}
+    assert sum(r['drops'] for r in records) < 1000
+
+def test_cli_loot_missing_items_file(capsys, tmp_path):
+    """Test a missing items file gives an error record, not a traceback"""
+    code = game_cli.main(["loot", "--items", str(tmp_path / "nothing.txt")])
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert code == 1
+    assert records == [{'ok': False, 'error': 'MissingDataFileError', 'message': records[0]['message']}]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,192 @@
+"""
+Test Metrics
+Tests the metrics registry, its exports and the game's reporting into it
+"""
+
+import pytest
+import sys
+import os
+import json
+import socket
+import threading
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics
+import character_manager
+import inventory_system
+import combat_system
+import game_server
+from game_io import ScriptedIO
+from custom_exceptions import InventoryFullError
+
+# ============================================================================
+# REGISTRY TESTS
+# ============================================================================
+
+def test_counter_sums_thread_shards():
+    """Test increments from many threads all count"""
+    registry = metrics.MetricsRegistry()
+    counter = registry.counter('hits_total', 'Hits')
+
+    def work():
+        for _ in range(1000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.value() == 8000
+    assert registry.counter('hits_total', 'Hits') is counter
+
+def test_histogram_prometheus_text():
+    """Test cumulative buckets, sum and count in the text format"""
+    registry = metrics.MetricsRegistry()
+    histogram = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value)
+    labeled = registry.counter('results_total', 'Results', label='outcome')
+    labeled.inc(label='win')
+    labeled.inc(2, label='loss')
+
+    text = registry.to_prometheus()
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+    assert 'latency_seconds_count 4' in text
+    assert 'results_total{outcome="loss"} 2' in text
+
+    snapshot = registry.snapshot()['metrics']
+    assert snapshot['results_total']['values'] == {'loss': 2, 'win': 1}
+    assert snapshot['latency_seconds']['sum'] == pytest.approx(4.05)
+
+def test_type_conflict_rejected():
+    """Test one name can't be both a counter and a histogram"""
+    registry = metrics.MetricsRegistry()
+    registry.counter('thing', 'Thing')
+    with pytest.raises(ValueError):
+        registry.histogram('thing', 'Thing')
+
+# ============================================================================
+# EXPORT TESTS
+# ============================================================================
+
+def test_write_snapshot_files(tmp_path):
+    """Test JSON and Prometheus files"""
+    json_path = str(tmp_path / "metrics.json")
+    prom_path = str(tmp_path / "metrics.prom")
+    metrics.write_snapshot(json_path)
+    metrics.write_snapshot(prom_path)
+
+    with open(json_path) as file:
+        assert 'quest_battles_total' in json.load(file)['metrics']
+    with open(prom_path) as file:
+        assert '# TYPE quest_save_seconds histogram' in file.read()
+
+def test_send_snapshot_to_socket():
+    """Test sending a snapshot to a listening TCP socket"""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    received = []
+
+    def accept():
+        conn, _ = listener.accept()
+        with conn:
+            chunks = []
+            while True:
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            received.append(b"".join(chunks).decode())
+
+    thread = threading.Thread(target=accept)
+    thread.start()
+    metrics.send_snapshot(listener.getsockname(), fmt='json')
+    thread.join(5)
+    listener.close()
+
+    assert 'quest_exceptions_total' in json.loads(received[0])['metrics']
+
+# ============================================================================
+# GAME REPORTING TESTS
+# ============================================================================
+
+def test_game_modules_report(tmp_path):
+    """Test saves, loads, battles, rejections and exceptions are counted"""
+    saves = metrics.SAVE_SECONDS.snapshot()['count']
+    loads = metrics.CHARACTER_LOAD_SECONDS.snapshot()['count']
+    wins = metrics.BATTLES.value('player')
+    full = metrics.INVENTORY_FULL.value()
+    errors = metrics.EXCEPTIONS.value('InventoryFullError')
+
+    character = character_manager.create_character("Metra", "Warrior")
+    character_manager.save_character(character, str(tmp_path))
+    character_manager.load_character("Metra", str(tmp_path))
+
+    character['inventory'] = ["x"] * inventory_system.MAX_INVENTORY_SIZE
+    with pytest.raises(InventoryFullError):
+        inventory_system.add_item_to_inventory(character, "y")
+
+    character['inventory'] = []
+    battle = combat_system.SimpleBattle(character, combat_system.create_enemy("goblin"),
+                                        io=ScriptedIO(["1"] * 50, keep_output=False))
+    battle.start_battle()
+
+    assert metrics.SAVE_SECONDS.snapshot()['count'] == saves + 1
+    assert metrics.CHARACTER_LOAD_SECONDS.snapshot()['count'] == loads + 1
+    assert metrics.BATTLES.value('player') == wins + 1
+    assert metrics.INVENTORY_FULL.value() == full + 1
+    # Raised but handled by the caller: only reported errors are counted
+    assert metrics.EXCEPTIONS.value('InventoryFullError') == errors
+
+def test_reported_errors_are_counted_once(tmp_path):
+    """Test a wrapped and re-raised error counts once, where it's reported"""
+    with open(tmp_path / "Broken_save.txt", "w") as file:
+        file.write("NAME: Broken\nCLASS: Warrior\nLEVEL: not-a-number\n")
+    before = metrics.EXCEPTIONS.values()
+
+    server = game_server.GameServer(game_server.GameCatalog({}, {}), str(tmp_path))
+    response = asyncio.run(game_server.ServerSession(server).handle("LOAD Broken"))
+
+    assert response[0].startswith("ERR")
+    after = metrics.EXCEPTIONS.values()
+    changed = {label: after[label] - before.get(label, 0) for label in after if after[label] != before.get(label, 0)}
+    assert changed == {'InvalidSaveDataError': 1}
+
+def test_shards_of_exited_threads_are_merged():
+    """Test short-lived threads don't each leave a shard behind"""
+    registry = metrics.MetricsRegistry()
+    counter = registry.counter('batches_total', 'Batches')
+
+    for _ in range(20):
+        thread = threading.Thread(target=counter.inc)
+        thread.start()
+        thread.join()
+    counter.inc()
+
+    shards = counter._values[None]
+    assert len(shards.shards) <= 2
+    assert counter.value() == 21
+    counter.clear()
+    assert counter.value() == 0
+
+def test_server_metrics_command(tmp_path):
+    """Test the METRICS protocol command"""
+    server = game_server.GameServer(game_server.GameCatalog({}, {}), str(tmp_path))
+    session = game_server.ServerSession(server)
+
+    response = asyncio.run(session.handle("METRICS"))
+    assert response[-1] == "OK"
+    assert "# TYPE quest_battles_total counter" in response
+
+    assert asyncio.run(session.handle("METRICS xml"))[-1].startswith("ERR")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+"""
+Test Profiling
+Tests opt-in per-function timing of the game modules
+"""
+
+import pytest
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import profiling
+import character_manager
+import inventory_system
+import combat_system
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def profiler():
+    """Enable profiling for one test and always restore the originals"""
+    profiling.reset()
+    profiling.enable()
+    yield profiling
+    profiling.disable()
+    profiling.reset()
+
+# ============================================================================
+# PROFILING TESTS
+# ============================================================================
+
+def test_disabled_by_default_and_restored():
+    """Test originals are untouched until enabled and restored after"""
+    original = character_manager.create_character
+    assert not profiling.is_enabled()
+
+    profiling.enable()
+    try:
+        assert character_manager.create_character is not original
+        assert inventory_system.record_changes is not original
+    finally:
+        profiling.disable()
+
+    assert character_manager.create_character is original
+    assert not profiling.is_enabled()
+
+def test_records_calls_total_and_max(profiler):
+    """Test module functions, imported names and methods are counted"""
+    character = character_manager.create_character("Prof", "Warrior")
+    character_manager.add_gold(character, 5)
+    character_manager.add_gold(character, 5)
+    inventory_system.add_item_to_inventory(character, "health_potion")
+
+    rows = {row['name']: row for row in profiler.get_stats()}
+    assert rows['character_manager.create_character']['calls'] == 1
+    assert rows['character_manager.add_gold']['calls'] == 2
+    assert rows['character_manager.record_changes']['calls'] >= 1
+    assert rows['character_manager.add_gold']['max'] <= rows['character_manager.add_gold']['total']
+
+    battle = combat_system.SimpleBattle(character, combat_system.create_enemy("goblin"))
+    battle.calculate_damage(character, battle.enemy)
+    assert profiler.get_stats(sort_by='name')[0]['name'] <= profiler.get_stats(sort_by='name')[-1]['name']
+    assert 'combat_system.SimpleBattle.calculate_damage' in {row['name'] for row in profiler.get_stats()}
+
+def test_dump_stats_json_and_table(profiler, tmp_path, capsys):
+    """Test JSON file output and the printed table"""
+    character_manager.create_character("Dump", "Mage")
+
+    path = str(tmp_path / "stats.json")
+    profiler.dump_stats(path, sort_by='calls')
+    with open(path) as file:
+        data = json.load(file)
+    assert data['functions'][0]['calls'] >= data['functions'][-1]['calls']
+
+    profiler.dump_stats(limit=1)
+    out = capsys.readouterr().out
+    assert out.startswith("function")
+    assert len(out.strip().splitlines()) == 2
+
+    with pytest.raises(ValueError):
+        profiler.get_stats(sort_by='speed')
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,74 @@
+"""
+Test Save Integrity
+Tests save checksums and the scan_saves corruption report
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from custom_exceptions import SaveFileCorruptedError
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def flip_gold(save_dir, name):
+    """Change the GOLD line of a save without updating its checksum"""
+    filename = os.path.join(save_dir, f"{name}_save.txt")
+    with open(filename) as f:
+        text = f.read()
+    with open(filename, "w") as f:
+        f.write(text.replace("GOLD: 100", "GOLD: 900"))
+
+# ============================================================================
+# CHECKSUM TESTS
+# ============================================================================
+
+def test_save_has_checksum_and_loads(tmp_path):
+    """Test that saves end with a checksum and still load"""
+    save_dir = str(tmp_path)
+    character_manager.save_character(character_manager.create_character("SumTest", "Cleric"), save_dir)
+
+    with open(os.path.join(save_dir, "SumTest_save.txt")) as f:
+        assert f.read().splitlines()[-1].startswith("CHECKSUM: ")
+    assert character_manager.load_character("SumTest", save_dir)['gold'] == 100
+
+def test_flipped_digit_is_detected(tmp_path):
+    """Test that a silently edited value fails the checksum"""
+    save_dir = str(tmp_path)
+    character_manager.save_character(character_manager.create_character("FlipTest", "Rogue"), save_dir)
+    flip_gold(save_dir, "FlipTest")
+
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.load_character("FlipTest", save_dir)
+
+def test_old_saves_without_checksum_load(tmp_path):
+    """Test that saves written before checksums still load"""
+    save_dir = str(tmp_path)
+    text = character_manager.format_save_data(character_manager.create_character("OldSave", "Mage"))
+    with open(os.path.join(save_dir, "OldSave_save.txt"), "w") as f:
+        f.write(text.rsplit("CHECKSUM:", 1)[0])
+
+    assert character_manager.load_character("OldSave", save_dir)['class'] == "Mage"
+
+def test_scan_saves_reports_problems(tmp_path):
+    """Test that scan_saves sorts saves into ok / legacy / corrupted"""
+    save_dir = str(tmp_path)
+    chars = [character_manager.create_character(f"Scan{i}", "Warrior") for i in range(4)]
+    character_manager.save_characters(chars, save_dir)
+    flip_gold(save_dir, "Scan2")
+    with open(os.path.join(save_dir, "Legacy_save.txt"), "w") as f:
+        f.write("NAME: Legacy\n")
+
+    report = character_manager.scan_saves(save_dir)
+
+    assert sorted(report['ok']) == ["Scan0", "Scan1", "Scan3"]
+    assert report['legacy'] == ["Legacy"]
+    assert list(report['corrupted']) == ["Scan2"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,200 @@
+"""
+Test Save Journal
+Tests journaled saves: delta records, replay on load and compaction
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+import inventory_system
+import main
+import quest_handler
+from game_io import ScriptedIO
+from custom_exceptions import SaveFileCorruptedError
+
+# ============================================================================
+# SAVE JOURNAL TESTS
+# ============================================================================
+
+def test_mutations_are_journaled_and_replayed(tmp_path):
+    """Test that changes made while journaling survive a load"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("JournalTest", "Warrior")
+    character_manager.enable_journal(char, save_dir, compact_every=1000)
+
+    character_manager.add_gold(char, 40)
+    character_manager.gain_experience(char, 150)
+    inventory_system.add_item_to_inventory(char, "health_potion")
+    quest_handler.accept_quest(char, "q1", {'q1': {'required_level': 1, 'prerequisite': 'NONE'}})
+
+    # The save file itself was not rewritten
+    with open(os.path.join(save_dir, "JournalTest_save.txt")) as f:
+        assert "GOLD: 100" in f.read()
+
+    loaded = character_manager.load_character("JournalTest", save_dir)
+    assert loaded['gold'] == 140
+    assert loaded['level'] == 2
+    assert loaded['experience'] == 50
+    assert loaded['inventory'] == ["health_potion"]
+    assert loaded['active_quests'] == ["q1"]
+
+    char.journal.close()
+
+def test_journal_compacts_into_save(tmp_path):
+    """Test that the journal is folded into the save file after N records"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("CompactTest", "Mage")
+    journal = character_manager.enable_journal(char, save_dir, compact_every=5)
+
+    for _ in range(12):
+        character_manager.add_gold(char, 1)
+
+    journal.close()
+    assert character_manager.load_character("CompactTest", save_dir)['gold'] == 112
+
+    character_manager.disable_journal(char)
+    assert character_manager.read_journal_lines("CompactTest", save_dir) == []
+    with open(os.path.join(save_dir, "CompactTest_save.txt")) as f:
+        assert "GOLD: 112" in f.read()
+
+def test_full_save_clears_stale_journal(tmp_path):
+    """Test that a normal save isn't overridden by an old journal"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("StaleTest", "Rogue")
+    character_manager.enable_journal(char, save_dir)
+    character_manager.add_gold(char, 5)
+    char.journal.close()
+    char.journal = None
+
+    char['gold'] = 999
+    character_manager.save_character(char, save_dir)
+    assert character_manager.load_character("StaleTest", save_dir)['gold'] == 999
+
+def test_battle_health_is_journaled(tmp_path):
+    """Test damage and heals from combat survive a reload"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("Bruised", "Cleric")
+    character_manager.enable_journal(char, save_dir, compact_every=1000)
+    battle = combat_system.SimpleBattle(char, combat_system.create_enemy("orc"))
+
+    battle.apply_damage(char, 50)
+    assert character_manager.load_character("Bruised", save_dir)['health'] == char['max_health'] - 50
+
+    combat_system.cleric_heal(char)
+    assert character_manager.load_character("Bruised", save_dir)['health'] == char['max_health'] - 20
+    character_manager.disable_journal(char)
+
+def test_dead_character_quest_xp_is_journaled(tmp_path):
+    """Test XP banked by a dead character's completed quest survives a load"""
+    save_dir = str(tmp_path)
+    quests = {'q1': {'required_level': 1, 'prerequisite': 'NONE', 'reward_xp': 30, 'reward_gold': 5}}
+    char = character_manager.create_character("Ghost", "Cleric")
+    quest_handler.accept_quest(char, "q1", quests)
+    character_manager.enable_journal(char, save_dir, compact_every=1000)
+    char['health'] = 0
+    character_manager.record_changes(char, 'health')
+
+    quest_handler.complete_quest(char, "q1", quests)
+
+    loaded = character_manager.load_character("Ghost", save_dir)
+    assert loaded['experience'] == 30
+    assert loaded['gold'] == 105
+    char.journal.close()
+
+def test_empty_transaction_writes_no_record(tmp_path):
+    """Test a transaction that changes nothing leaves the journal alone"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("Idle", "Rogue")
+    journal = character_manager.enable_journal(char, save_dir, compact_every=1000)
+
+    with inventory_system.transaction(char):
+        pass
+
+    assert character_manager.count_journal_records("Idle", save_dir) == 0
+    journal.close()
+
+def test_game_over_closes_journal(tmp_path, monkeypatch):
+    """Test leaving the game loop without quitting folds and closes the journal"""
+    save_dir = str(tmp_path)
+    session = main.GameSession(io=ScriptedIO([]), save_directory=save_dir)
+    session.character = character_manager.create_character("Fallen", "Warrior")
+    journal = character_manager.enable_journal(session.character, save_dir)
+    session.character['health'] = 0
+    character_manager.record_changes(session.character, 'health')
+
+    def game_over(session):
+        session.running = False
+        return 0
+    monkeypatch.setattr(main, "game_menu", game_over)
+    main.game_loop(session)
+
+    assert session.character.journal is None
+    assert journal._file.closed
+    assert character_manager.read_journal_lines("Fallen", save_dir) == []
+    assert character_manager.load_character("Fallen", save_dir)['health'] == 0
+# ============================================================================
+# JOURNAL INTEGRITY TESTS
+# ============================================================================
+
+def journaled_gold(save_dir, name, amounts):
+    """Returns: Path of the journal of a saved character after adding each amount of gold"""
+    char = character_manager.create_character(name, "Warrior")
+    journal = character_manager.enable_journal(char, save_dir, compact_every=1000)
+    for amount in amounts:
+        character_manager.add_gold(char, amount)
+    journal.close()
+    return journal.filename
+
+def test_damaged_journal_record_is_detected(tmp_path):
+    """Test a changed digit in a journal record fails on load and in scan_saves"""
+    save_dir = str(tmp_path)
+    filename = journaled_gold(save_dir, "Flipped", [5, 7])
+    with open(filename) as f:
+        text = f.read()
+    with open(filename, "w") as f:
+        f.write(text.replace("GOLD: 105", "GOLD: 905"))
+
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.load_character("Flipped", save_dir)
+    report = character_manager.scan_saves(save_dir)
+    assert report['corrupted'] == {'Flipped': 'Journal record checksum does not match its contents'}
+
+def test_torn_journal_record_is_dropped(tmp_path):
+    """Test a record cut off mid-write is ignored on load and cleared on reopen"""
+    save_dir = str(tmp_path)
+    filename = journaled_gold(save_dir, "Torn", [5])
+    with open(filename, "a") as f:
+        f.write("GOLD: 99")
+
+    assert character_manager.load_character("Torn", save_dir)['gold'] == 105
+    assert character_manager.scan_saves(save_dir)['ok'] == ["Torn"]
+    assert character_manager.count_journal_records("Torn", save_dir) == 1
+
+    char = character_manager.load_character("Torn", save_dir)
+    journal = character_manager.enable_journal(char, save_dir, compact_every=1000)
+    character_manager.add_gold(char, 1)
+    journal.close()
+    assert character_manager.load_character("Torn", save_dir)['gold'] == 106
+
+def test_legacy_save_with_journal_is_refused(tmp_path):
+    """Test a save without a checksum can't be trusted once it has a journal"""
+    save_dir = str(tmp_path)
+    journaled_gold(save_dir, "Cut", [5])
+    save_file = os.path.join(save_dir, "Cut_save.txt")
+    with open(save_file) as f:
+        text = f.read()
+    with open(save_file, "w") as f:
+        f.write(text.rsplit("CHECKSUM:", 1)[0])
+
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.load_character("Cut", save_dir)
+    assert list(character_manager.scan_saves(save_dir)['corrupted']) == ["Cut"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,178 @@
+"""
+Test Search Index
+Tests full-text search over quests and items: ranking, prefixes, saving
+the index and loading its postings lazily
+"""
+
+import pytest
+import sys
+import os
+import json
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import content_generator
+import game_cli
+import game_data
+import game_server
+import search_index
+from search_index import SearchResult
+
+QUESTS = {
+    'dragon_hunt': {'title': 'Dragon Hunt', 'description': 'Hunt the dragon of the red mountain'},
+    'goblin_camp': {'title': 'Goblin Camp', 'description': 'Clear the goblin camp near the road'},
+    'dragonfly': {'title': 'Dragonfly Wings', 'description': 'Collect wings for the alchemist'},
+}
+ITEMS = {
+    'dragon_scale': {'name': 'Dragon Scale', 'description': 'Armor made from a dragon, a real dragon'},
+    'goblin_ear': {'name': 'Goblin Ear', 'description': 'Proof of a goblin hunt'},
+}
+
+
+@pytest.fixture
+def data_files(tmp_path):
+    """Generated quest and item files; returns (quest file, item file)"""
+    quest_file = str(tmp_path / "quests.txt")
+    item_file = str(tmp_path / "items.txt")
+    content_generator.write_quest_file(quest_file, 300, seed=3)
+    content_generator.write_item_file(item_file, 300, seed=3)
+    return quest_file, item_file
+
+# ============================================================================
+# QUERY TESTS
+# ============================================================================
+
+def test_ranks_by_term_frequency():
+    """Test records with more occurrences rank first, ties in record order"""
+    index = search_index.build_index(QUESTS, ITEMS)
+    assert index.search("dragon") == [
+        SearchResult('item', 'dragon_scale', 3),
+        SearchResult('quest', 'dragon_hunt', 2),
+    ]
+    assert index.search("goblin") == [
+        SearchResult('quest', 'goblin_camp', 2),
+        SearchResult('item', 'goblin_ear', 2),
+    ]
+
+def test_every_word_must_match():
+    """Test multi-word queries only return records containing all words"""
+    index = search_index.build_index(QUESTS, ITEMS)
+    assert index.search("goblin hunt") == [SearchResult('item', 'goblin_ear', 3)]
+    assert index.search("goblin wizard") == []
+    assert index.search("THE Dragon, of") == index.search("dragon")
+    assert index.search("the of") == []
+
+def test_prefix_and_kind_filter():
+    """Test word* matches every word starting with it; kind limits the records"""
+    index = search_index.build_index(QUESTS, ITEMS)
+    keys = {result.key for result in index.search("drag*")}
+    assert keys == {'dragon_hunt', 'dragonfly', 'dragon_scale'}
+    assert [r.key for r in index.search("drag*", kind='item')] == ['dragon_scale']
+    assert index.search("zzz*") == []
+    assert len(index.search("drag*", limit=2)) == 2
+
+def test_matches_a_full_scan(data_files):
+    """Test results on generated data agree with scanning every record"""
+    quest_file, item_file = data_files
+    index = search_index.load_search_index(quest_file, item_file, os.path.join(os.path.dirname(quest_file), "idx.bin"))
+    items = game_data.load_items(item_file)
+
+    for query in ["strength weapon", "magic", "generated 12*"]:
+        words = query.split()
+        expected = set()
+        for item_id, item in items.items():
+            tokens = search_index.tokenize(item['name'] + ' ' + item['description'])
+            if all(any(t == w or (w.endswith('*') and t.startswith(w[:-1])) for t in tokens) for w in words):
+                expected.add(item_id)
+        found = {r.key for r in index.search(query, limit=10_000, kind='item')}
+        assert found == expected
+
+# ============================================================================
+# PERSISTENCE TESTS
+# ============================================================================
+
+def test_saved_index_loads_postings_lazily(tmp_path):
+    """Test loading reads only the vocabulary and searches read postings"""
+    filename = str(tmp_path / "index.bin")
+    built = search_index.build_index(QUESTS, ITEMS)
+    built.save(filename)
+
+    loaded = search_index.SearchIndex.load(filename)
+    assert loaded.terms == built.terms
+    assert loaded._postings == {}
+
+    assert loaded.search("goblin hunt") == built.search("goblin hunt")
+    assert set(loaded._postings) == {'goblin', 'hunt'}
+    assert loaded.search("drag*") == built.search("drag*")
+    with pytest.raises(ValueError):
+        loaded.add('quest', 'x', 'text')
+
+def test_index_file_is_little_endian_and_checked(tmp_path):
+    """Test the file reads the same on any machine and a cut-off file is refused"""
+    filename = str(tmp_path / "index.bin")
+    search_index.build_index(QUESTS, ITEMS).save(filename)
+    with open(filename, 'rb') as file:
+        data = file.read()
+    assert data[4:8] == search_index.INDEX_VERSION.to_bytes(4, 'little')
+
+    loaded = search_index.SearchIndex.load(filename)
+    assert list(loaded.records) == list(search_index.build_index(QUESTS, ITEMS).records)
+    assert loaded.search("goblin*", kind='quest') == [SearchResult('quest', 'goblin_camp', 2)]
+    loaded.close()
+
+    with open(filename, 'wb') as file:
+        file.write(data[:len(data) // 2])
+    with pytest.raises(search_index.CorruptedDataError):
+        search_index.SearchIndex.load(filename)
+
+def test_index_is_reused_until_data_changes(data_files, tmp_path):
+    """Test the saved index is used while the data files are unchanged"""
+    quest_file, item_file = data_files
+    filename = str(tmp_path / "index.bin")
+
+    first = search_index.load_search_index(quest_file, item_file, filename)
+    second = search_index.load_search_index(quest_file, item_file, filename)
+    assert second._table is not None  # loaded from the file, not rebuilt
+
+    with open(quest_file, 'a') as file:
+        file.write(content_generator.format_quest_block({
+            'quest_id': 'lighthouse', 'title': 'Lighthouse', 'description': 'Relight the lighthouse',
+            'reward_xp': 1, 'reward_gold': 1, 'required_level': 1, 'prerequisite': 'NONE'}))
+    third = search_index.load_search_index(quest_file, item_file, filename)
+    assert len(third) == len(first) + 1
+    assert third.search("lighthouse") == [SearchResult('quest', 'lighthouse', 2)]
+
+def test_corrupt_index_is_rebuilt(data_files, tmp_path):
+    """Test an unreadable index file is replaced"""
+    quest_file, item_file = data_files
+    filename = str(tmp_path / "index.bin")
+    with open(filename, 'wb') as file:
+        file.write(b'junk')
+    assert len(search_index.load_search_index(quest_file, item_file, filename)) == 600
+    assert search_index.SearchIndex.load(filename).records[0] == ('quest', 'quest_0')
+
+# ============================================================================
+# COMMAND TESTS
+# ============================================================================
+
+def test_cli_search(capsys, data_files, tmp_path):
+    """Test the search subcommand prints one record per hit"""
+    quest_file, item_file = data_files
+    code = game_cli.main(["search", "quest", "7", "--quests", quest_file, "--items", item_file,
+                          "--index", str(tmp_path / "index.bin"), "--kind", "quest", "--limit", "1"])
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert code == 0
+    assert records == [{'id': 'quest_7', 'kind': 'quest', 'score': 4}]
+
+def test_server_search():
+    """Test SEARCH builds the index from the server catalog"""
+    async def run():
+        server = game_server.GameServer(game_server.GameCatalog(QUESTS, ITEMS))
+        return await game_server.ServerSession(server).handle("SEARCH goblin hunt")
+
+    assert asyncio.run(run()) == ["item goblin_ear (score 3)", "OK"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,220 @@
+"""
+Test Shop System
+Tests shop stock, restocking, demand pricing, the quote cache, paging
+and gold/inventory transactions
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+import main
+import shop_system
+from game_io import ScriptedIO
+from custom_exceptions import (ItemNotFoundError, OutOfStockError, InsufficientResourcesError,
+                               InventoryFullError)
+
+ITEMS = {
+    'potion': {'item_id': 'potion', 'name': 'Potion', 'type': 'consumable', 'effect': 'health:20', 'cost': 20},
+    'sword': {'item_id': 'sword', 'name': 'Sword', 'type': 'weapon', 'effect': 'strength:5', 'cost': 100},
+}
+
+
+class FakeClock:
+    """Clock the tests move by hand"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_shop(stock=None):
+    """Returns: (Shop, its FakeClock, a rich character)"""
+    clock = FakeClock()
+    shop = shop_system.Shop(ITEMS, stock=stock, restock_seconds=10, clock=clock)
+    char = character_manager.create_character("Buyer", "Rogue")
+    char['gold'] = 10_000
+    return shop, clock, char
+
+# ============================================================================
+# PRICING TESTS
+# ============================================================================
+
+def test_demand_price_curve():
+    """Test price is COST at full stock and rises as stock runs out"""
+    assert shop_system.demand_price(100, 4, 4) == 100
+    assert shop_system.demand_price(100, 2, 4) == 125
+    assert shop_system.demand_price(100, 0, 4) == 150
+    assert shop_system.demand_price(100, 9, 4) == 100
+    assert shop_system.demand_price(100, 0, 0) == 100
+
+def test_buying_raises_price_and_selling_lowers_it():
+    """Test each sale changes the stock and the next quote"""
+    shop, _, char = make_shop({'sword': 2})
+    assert shop.quote('sword') == shop_system.Quote('sword', 'Sword', 100, 50, 2)
+
+    assert shop.buy(char, 'sword') == 100
+    assert shop.quote('sword') == shop_system.Quote('sword', 'Sword', 125, 62, 1)
+    assert char['gold'] == 9_900
+
+    assert shop.sell(char, 'sword') == 62
+    assert shop.quote('sword').stock == 2
+
+def test_items_the_shop_does_not_carry():
+    """Test they can't be bought but can be sold for half their cost"""
+    shop, _, char = make_shop({'sword': 1})
+    with pytest.raises(ItemNotFoundError):
+        shop.buy(char, 'potion')
+
+    inventory_system.add_item_to_inventory(char, 'potion')
+    assert shop.sell(char, 'potion') == 10
+    assert 'potion' not in shop.stock
+
+# ============================================================================
+# STOCK TESTS
+# ============================================================================
+
+def test_sold_out_then_restocked_over_time():
+    """Test a sold out item comes back one unit per restock interval"""
+    shop, clock, char = make_shop({'sword': 2})
+    shop.buy(char, 'sword')
+    shop.buy(char, 'sword')
+    with pytest.raises(OutOfStockError):
+        shop.buy(char, 'sword')
+
+    clock.now = 9
+    assert shop.quote('sword').stock == 0
+    clock.now = 10
+    assert shop.quote('sword').stock == 1
+    clock.now = 45
+    assert shop.quote('sword') == shop_system.Quote('sword', 'Sword', 100, 50, 2)
+    assert shop._restock_at == {}
+
+def test_selling_stops_at_full_stock():
+    """Test items sold to a fully stocked shop don't push stock past the cap"""
+    shop, _, char = make_shop({'sword': 2})
+    for _ in range(3):
+        inventory_system.add_item_to_inventory(char, 'sword')
+        assert shop.sell(char, 'sword') == 50
+    assert shop.quote('sword') == shop_system.Quote('sword', 'Sword', 100, 50, 2)
+
+    shop.buy(char, 'sword')
+    assert shop.quote('sword').stock == 1
+
+def test_quotes_are_cached_until_stock_changes():
+    """Test the same Quote object is returned until the item's stock changes"""
+    shop, _, char = make_shop()
+    first = shop.quote('sword')
+    assert shop.quote('sword') is first
+
+    potion = shop.quote('potion')
+    shop.buy(char, 'sword')
+    assert shop.quote('sword') is not first
+    assert shop.quote('potion') is potion
+
+def test_pages_only_quote_their_items():
+    """Test a page quotes just its slice of a large catalog"""
+    items = {f'item{i:03d}': {'name': f'Item {i}', 'type': 'consumable', 'cost': i} for i in range(100)}
+    shop = shop_system.Shop(items)
+
+    number, quotes = shop.page(3, per_page=10)
+    assert number == 3
+    assert [q.item_id for q in quotes] == [f'item{i:03d}' for i in range(20, 30)]
+    assert len(shop._quotes) == 10
+    assert shop.page_count(per_page=10) == 10
+    assert shop.page(99, per_page=10)[0] == 10
+
+# ============================================================================
+# TRANSACTION TESTS
+# ============================================================================
+
+def test_transaction_applies_everything_at_once():
+    """Test staged changes only show up when the block ends"""
+    char = character_manager.create_character("Trader", "Rogue")
+    inventory_system.add_item_to_inventory(char, 'potion')
+    gold, inventory = char['gold'], list(char['inventory'])
+
+    with inventory_system.transaction(char) as txn:
+        txn.remove('potion')
+        txn.earn(10)
+        txn.spend(100)
+        txn.add('sword')
+        assert char['gold'] == gold and char['inventory'] == inventory
+
+    assert char['gold'] == gold - 90
+    assert char['inventory'] == inventory[:-1] + ['sword']
+
+@pytest.mark.parametrize("stage, error", [
+    (lambda txn: txn.remove('potion') or txn.remove('potion'), ItemNotFoundError),
+    (lambda txn: txn.spend(1_000_000), InsufficientResourcesError),
+    (lambda txn: [txn.add('pebble') for _ in range(inventory_system.MAX_INVENTORY_SIZE)], InventoryFullError),
+])
+def test_failed_transaction_changes_nothing(stage, error):
+    """Test a failed check rolls back every staged change"""
+    char = character_manager.create_character("Trader", "Rogue")
+    inventory_system.add_item_to_inventory(char, 'potion')
+    gold, inventory = char['gold'], list(char['inventory'])
+
+    with pytest.raises(error):
+        with inventory_system.transaction(char) as txn:
+            txn.earn(5)
+            stage(txn)
+
+    assert (char['gold'], char['inventory']) == (gold, inventory)
+
+def test_error_inside_block_discards_changes():
+    """Test an exception raised in the block applies nothing"""
+    char = character_manager.create_character("Trader", "Rogue")
+    gold = char['gold']
+    with pytest.raises(RuntimeError):
+        with inventory_system.transaction(char) as txn:
+            txn.earn(50)
+            raise RuntimeError("boom")
+    assert char['gold'] == gold
+
+def test_checkout_is_all_or_nothing():
+    """Test a cart is priced unit by unit and fails as a whole"""
+    shop, _, char = make_shop({'sword': 2, 'potion': 5})
+
+    assert shop.checkout(char, ['sword', 'sword']) == 100 + 125
+    assert shop.quote('sword').stock == 0
+
+    gold, inventory = char['gold'], list(char['inventory'])
+    with pytest.raises(OutOfStockError):
+        shop.checkout(char, ['potion', 'sword'])
+    assert (char['gold'], char['inventory']) == (gold, inventory)
+    assert shop.quote('potion').stock == 5
+
+    char['gold'] = 30
+    with pytest.raises(InsufficientResourcesError):
+        shop.checkout(char, ['potion', 'potion'])
+    assert shop.quote('potion').stock == 5
+
+# ============================================================================
+# MENU TESTS
+# ============================================================================
+
+def test_shop_menu_pages_and_buys(tmp_path):
+    """Test the buy menu moves between pages and buys from the shown page"""
+    items = {f'item{i:02d}': {'name': f'Item {i}', 'type': 'consumable', 'cost': 5} for i in range(12)}
+    io = ScriptedIO(['1', 'n', '2', '3'])
+    session = main.GameSession(items=items, rng=random.Random(1), io=io, save_directory=str(tmp_path))
+    session.character = character_manager.create_character("Shopper", "Rogue")
+
+    main.shop(session)
+
+    assert "available items (page 2/2)" in io.output
+    assert "purchased Item 9 for 5 gold!" in io.output
+    assert session.character['inventory'][-1] == 'item09'
+    assert session.shop.quote('item09').stock == shop_system.DEFAULT_STOCK['consumable'] - 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
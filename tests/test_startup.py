@@ -0,0 +1,81 @@
+"""
+Test Startup
+Tests lazy subsystem imports, lazy catalog loading and the import budget tool
+"""
+
+import pytest
+import sys
+import os
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+import import_budget
+from game_io import ScriptedIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ============================================================================
+# LAZY IMPORT TESTS
+# ============================================================================
+
+def test_import_main_defers_subsystems():
+    """Test importing main doesn't run the game modules or heavy stdlib imports"""
+    code = (
+        "import sys, types, main\n"
+        "lazy = [n for n in ('character_manager', 'game_data', 'combat_system',\n"
+        "        'inventory_system', 'quest_handler') if type(sys.modules[n]) is not types.ModuleType]\n"
+        "heavy = [n for n in ('concurrent.futures', 'socket', 'inspect') if n in sys.modules]\n"
+        "print(len(lazy), heavy)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "5 []"
+
+def test_lazy_modules_can_be_loaded_up_front():
+    """Test load_lazy_modules leaves no lazy modules for threads to race on"""
+    code = (
+        "import sys, types, main\n"
+        "main.load_lazy_modules()\n"
+        "print([m.__name__ for m in main.LAZY_MODULES if type(m) is not types.ModuleType])\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
+
+def test_catalogs_load_on_first_access():
+    """Test a session reads data files only when quests/items are used"""
+    session = main.GameSession(io=ScriptedIO())
+    assert session._quests is None and session._items is None
+
+    assert "first_steps" in session.quests
+    assert "health_potion" in session.items
+
+def test_given_catalogs_are_not_reloaded():
+    """Test catalogs passed in are used as is"""
+    session = main.GameSession(quests={}, items={"x": {}}, io=ScriptedIO())
+    assert session.quests == {}
+    assert session.items == {"x": {}}
+
+# ============================================================================
+# IMPORT BUDGET TESTS
+# ============================================================================
+
+def test_parse_importtime():
+    """Test -X importtime lines are parsed"""
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       150 |        150 |     _random\n"
+        "import time:      7151 |      20489 | main\n"
+    )
+    assert import_budget.parse_importtime(stderr) == [("_random", 150, 150), ("main", 7151, 20489)]
+
+def test_measure_import_reports_main():
+    """Test measuring a real import"""
+    total, rows = import_budget.measure_import("main", runs=1, cwd=ROOT)
+    assert total > 0
+    assert any(name == "main" for name, _, _ in rows)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
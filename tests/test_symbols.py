@@ -0,0 +1,94 @@
+"""
+Test Symbols
+Tests that catalogs, saves and characters share one string per item and
+quest ID
+"""
+
+import pytest
+import sys
+import os
+import pickle
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import content_generator
+import game_data
+import inventory_system
+import quest_handler
+import symbols
+
+
+def fresh(text):
+    """Returns: An equal string that is a different object from text"""
+    return ''.join(list(text))
+
+# ============================================================================
+# INTERNING TESTS
+# ============================================================================
+
+def test_ids_get_one_string():
+    """Test equal IDs built separately intern to the same object"""
+    first, second = symbols.intern_all(['sword', fresh('sword')])
+    assert first is second
+    assert symbols.intern(fresh('potion')) is symbols.intern('potion')
+
+# ============================================================================
+# SHARING TESTS
+# ============================================================================
+
+def test_catalogs_and_characters_share_ids(tmp_path):
+    """Test catalog keys, inventories and loaded saves hold the same objects"""
+    filename = str(tmp_path / "items.txt")
+    content_generator.write_item_file(filename, 50, seed=5)
+    items = game_data.load_items(filename)
+    item_id = next(iter(items))
+    assert symbols.intern(fresh(item_id)) is item_id
+    assert items[item_id]['item_id'] is item_id
+
+    char = character_manager.create_character("Hoarder", "Warrior")
+    for _ in range(3):
+        inventory_system.add_item_to_inventory(char, fresh(item_id))
+    assert all(entry is item_id for entry in char['inventory'])
+
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("Hoarder", str(tmp_path))
+    assert loaded['inventory'] == [item_id] * 3
+    assert all(entry is item_id for entry in loaded['inventory'])
+
+    copy = pickle.loads(pickle.dumps(items))
+    assert all(key is original for key, original in zip(copy, items))
+
+def test_save_files_keep_readable_ids(tmp_path):
+    """Test saves still contain the ID strings, not numbers"""
+    char = character_manager.create_character("Reader", "Mage")
+    inventory_system.add_item_to_inventory(char, 'health_potion')
+    char['completed_quests'] = ['first_steps']
+    character_manager.save_character(char, str(tmp_path))
+
+    with open(tmp_path / "Reader_save.txt") as file:
+        text = file.read()
+    assert "INVENTORY: health_potion" in text
+    assert "COMPLETED_QUESTS: first_steps" in text
+
+def test_lookups_work_with_any_copy_of_an_id():
+    """Test has_item and quest checks match by value, interned or not"""
+    quests = {'rescue': {'quest_id': 'rescue', 'required_level': 1, 'prerequisite': 'NONE',
+                         'reward_xp': 1, 'reward_gold': 1}}
+    char = character_manager.create_character("Checker", "Cleric")
+    quest_handler.accept_quest(char, fresh('rescue'), quests)
+    assert char['active_quests'][0] is symbols.intern(fresh('rescue'))
+    assert quest_handler.is_quest_active(char, fresh('rescue'))
+
+    quest_handler.complete_quest(char, 'rescue', quests)
+    assert quest_handler.is_quest_completed(char, fresh('rescue'))
+    assert not quest_handler.is_quest_completed(char, 'never_seen_quest_id')
+
+    char['inventory'] = [fresh('plain_string_item')]   # set directly, never interned
+    assert inventory_system.has_item(char, 'plain_string_item')
+    assert inventory_system.count_item(char, fresh('plain_string_item')) == 1
+    assert not inventory_system.has_item(char, 'never_seen_item_id')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])